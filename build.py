@@ -34,6 +34,75 @@ def get_user_site_packages():
     return ''
 
 
+def prepare_package_data(root_dir: Path, out_dir: Path):
+    """
+    准备打包用的词库和配置
+
+    词库复制后整理为单文件并构建好全部派生数据和接龙图缓存，配置中开启只读模式、关闭备份，
+    发布后的程序以不可变方式打开词库，不再迁移或写入。
+
+    Args:
+        root_dir: 项目根目录
+        out_dir: 输出目录
+
+    Returns:
+        (词库路径或None, 配置文件路径)
+    """
+    sys.path.insert(0, str(root_dir))
+    from src.config.config_manager import ConfigManager
+    from src.data.chain_graph import ChainGraph
+    from src.data.database import IdiomDatabase
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    db_path = None
+    source_db = root_dir / "resources" / "idioms.db"
+    if source_db.exists():
+        db_path = out_dir / "idioms.db"
+        db_path.unlink(missing_ok=True)
+        # 用备份接口复制，包含源库WAL中尚未写回的内容
+        import sqlite3
+        source = sqlite3.connect(str(source_db))
+        target = sqlite3.connect(str(db_path))
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        database = IdiomDatabase(str(db_path))
+        try:
+            database.freeze()
+            ChainGraph.load_or_build(database)
+        finally:
+            database.close()
+
+    config_path = out_dir / "config.yaml"
+    if (root_dir / "config.yaml").exists():
+        shutil.copy(root_dir / "config.yaml", config_path)
+    else:
+        config_path.unlink(missing_ok=True)
+    config = ConfigManager(str(config_path))
+    if db_path is not None:
+        # 只有发布整理好的词库时才能只读打开；没有词库时程序需要自行创建
+        config.set('database.read_only', True)
+        config.set('database.backup_enabled', False)
+    return db_path, config_path
+
+
+def packaged_files(db_path: Path):
+    """
+    整理后的词库及其派生文件（接龙图缓存）
+
+    Args:
+        db_path: prepare_package_data 返回的词库路径
+
+    Returns:
+        存在的文件路径列表
+    """
+    return [path for path in (db_path, db_path.with_suffix(".chaingraph"))
+            if path.exists()]
+
+
 def build_app():
     """构建应用"""
     print("=" * 60)
@@ -78,13 +147,19 @@ def build_app():
     src_dir = resources_app_dir / "src"
     shutil.copytree(root_dir / "src", src_dir)
 
-    # 复制资源
+    # 复制资源（词库使用整理后的只读版本）
+    packaged_db, packaged_config = prepare_package_data(root_dir, build_dir / "package")
     resources_res_dir = resources_app_dir / "resources"
-    shutil.copytree(root_dir / "resources", resources_res_dir, dirs_exist_ok=True)
+    shutil.copytree(root_dir / "resources", resources_res_dir, dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns("idioms.db", "idioms.db-*",
+                                                  "idioms.chaingraph", "backups"))
+    if packaged_db is not None:
+        for path in packaged_files(packaged_db):
+            shutil.copy(path, resources_res_dir)
 
     # 复制主文件
     shutil.copy(root_dir / "main.py", resources_app_dir)
-    shutil.copy(root_dir / "config.yaml", resources_app_dir)
+    shutil.copy(packaged_config, resources_app_dir / "config.yaml")
 
     # 创建Info.plist
     print("3. 创建Info.plist...")
@@ -2,16 +2,35 @@
 #
 # PyInstaller spec file for 成语接龙游戏
 
+import sys
+from pathlib import Path
+
+sys.path.insert(0, SPECPATH)
+from build import packaged_files, prepare_package_data
+
 block_cipher = None
 
+# 发布的词库整理为只读单文件，有词库时配置默认以只读模式打开（不迁移、不备份）
+root_dir = Path(SPECPATH)
+packaged_db, packaged_config = prepare_package_data(root_dir, root_dir / 'build' / 'package')
+
+resource_datas = [
+    (str(path), str(path.parent.relative_to(root_dir)))
+    for path in (root_dir / 'resources').rglob('*')
+    if path.is_file() and not path.name.startswith('idioms.db')
+    and path.name != 'idioms.chaingraph'
+    and 'backups' not in path.parts
+]
+if packaged_db is not None:
+    resource_datas += [(str(path), 'resources') for path in packaged_files(packaged_db)]
+
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[
-        ('resources', 'resources'),
+    datas=resource_datas + [
         ('src/gui/styles', 'src/gui/styles'),
-        ('config.yaml', '.'),
+        (str(packaged_config), '.'),
     ],
     hiddenimports=[
         'PyQt6',
@@ -62,7 +62,41 @@ def main():
     # 初始化数据库
     db_path = config_manager.get('database.path', 'resources/idioms.db')
     logger.info(f"数据库路径: {db_path}")
-    database = IdiomDatabase(db_path)
+    bloom_enabled = config_manager.get('database.bloom_filter.enabled', False)
+    read_only = config_manager.get('database.read_only', False)
+    in_memory = config_manager.get('database.in_memory.enabled', False)
+    write_through = (in_memory and not read_only and
+                     config_manager.get('database.in_memory.write_through', True))
+    database = IdiomDatabase(
+        db_path,
+        use_chain_index=config_manager.get('database.chain_index', True),
+        bloom_fp_rate=(config_manager.get('database.bloom_filter.fp_rate', 0.01)
+                       if bloom_enabled else None),
+        bloom_capacity=config_manager.get('database.bloom_filter.capacity', 0) or None,
+        performance=config_manager.get('database.performance', None),
+        read_only=read_only,
+        in_memory=in_memory,
+        write_through=write_through
+    )
+
+    bloom_stats = database.get_bloom_filter_stats()
+    if bloom_stats:
+        logger.info(f"布隆过滤器: {bloom_stats['memory_bytes']} 字节，"
+                    f"{bloom_stats['num_hashes']} 个哈希，"
+                    f"预计误判率 {bloom_stats['expected_fp_rate']:.4%}")
+
+    # 后台在线备份
+    # 只读词库和不写回的内存副本不会改变磁盘文件，无需备份
+    if (config_manager.get('database.backup_enabled', True) and not read_only and
+            (write_through or not in_memory) and db_path != ':memory:'):
+        interval = config_manager.get('database.backup.interval', 0)
+        database.start_backup(
+            interval=interval or None,
+            backup_dir=config_manager.get('database.backup.dir', '') or None,
+            keep=config_manager.get('database.backup.keep', 3),
+            pages_per_step=config_manager.get('database.backup.pages_per_step', 128),
+            step_sleep=config_manager.get('database.backup.step_sleep', 0.005)
+        )
 
     # 检查数据库是否为空
     if database.get_total_count() == 0:
@@ -56,7 +56,9 @@ class ConfigManager:
                 'difficulty': 'normal',
                 'time_limit': 60,
                 'allow_homophone': False,
-                'max_hints': 3
+                'max_hints': 3,
+                'ai_strategy': 'llm',
+                'search_time': 1.0
             },
             'ui': {
                 'theme': 'default',
@@ -66,7 +68,32 @@ class ConfigManager:
             },
             'database': {
                 'path': 'resources/idioms.db',
-                'backup_enabled': True
+                'read_only': False,
+                'backup_enabled': True,
+                'backup': {
+                    'dir': '',
+                    'keep': 3,
+                    'interval': 0,
+                    'pages_per_step': 128,
+                    'step_sleep': 0.005
+                },
+                'chain_index': True,
+                'in_memory': {
+                    'enabled': False,
+                    'write_through': True
+                },
+                'performance': {
+                    'preset': 'desktop'
+                },
+                'query_cache': {
+                    'size': 1024,
+                    'ttl': 0
+                },
+                'bloom_filter': {
+                    'enabled': False,
+                    'fp_rate': 0.01,
+                    'capacity': 0
+                }
             },
             'logging': {
                 'level': 'INFO',
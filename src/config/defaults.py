@@ -15,7 +15,9 @@ DEFAULT_GAME_CONFIG = {
     'difficulty': 'normal',  # easy, normal, hard
     'time_limit': 60,
     'allow_homophone': False,
-    'max_hints': 3
+    'max_hints': 3,
+    'ai_strategy': 'llm',  # llm（大模型出招，困难难度的备选走法用搜索）, search（本地博弈树搜索）
+    'search_time': 1.0  # 搜索AI每步的时间预算（秒）
 }
 
 # UI配置默认值
@@ -29,7 +31,35 @@ DEFAULT_UI_CONFIG = {
 # 数据库配置默认值
 DEFAULT_DATABASE_CONFIG = {
     'path': 'resources/idioms.db',
-    'backup_enabled': True
+    'read_only': False,  # 以只读不可变模式打开词库（打包发布时为True，不迁移也不备份）
+    'backup_enabled': True,
+    'backup': {
+        'dir': '',  # 备份目录，留空表示数据库同目录下的 backups
+        'keep': 3,  # 保留的备份数量
+        'interval': 0,  # 重复备份间隔（秒），0表示只在启动时备份一次
+        'pages_per_step': 128,  # 每步复制的页数
+        'step_sleep': 0.005  # 每步之间的休眠（秒）
+    },
+    'chain_index': True,  # 启动时加载内存首字接龙索引
+    'in_memory': {
+        'enabled': False,  # 启动时把词库复制到内存数据库，查询不访问磁盘
+        'write_through': True  # 新增成语同步写回词库文件（只读模式下忽略）
+    },
+    'performance': {
+        # SQLite性能预设：desktop、server、low-memory；
+        # 可再逐项覆盖 mmap_size、cache_size、journal_mode、synchronous、
+        # temp_store、page_size（page_size只对新建的数据库生效）
+        'preset': 'desktop'
+    },
+    'query_cache': {
+        'size': 1024,  # 成语仓库查询缓存容量，0表示不缓存
+        'ttl': 0  # 缓存条目存活时间（秒），0表示不过期
+    },
+    'bloom_filter': {
+        'enabled': False,  # 在数据库查询前用布隆过滤器排除不存在的成语
+        'fp_rate': 0.01,  # 目标误判率
+        'capacity': 0  # 预留容量（成语数），0表示当前成语数的两倍
+    }
 }
 
 # 日志配置默认值
@@ -0,0 +1,339 @@
+"""
+接龙博弈树搜索
+在内存中以 (待接的字或读音, 已用成语集合) 为局面做 negamax/alpha-beta 搜索，
+使用 Zobrist 哈希置换表、迭代加深和严格的单步时间预算
+"""
+
+import sys
+import time
+import random
+import logging
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.data.models import SearchResult
+from src.utils.pinyin import PinyinUtils
+
+
+logger = logging.getLogger(__name__)
+
+# 胜负评分：走子方无子可走时为 -(WIN_SCORE - ply)，越早分出胜负绝对值越大
+WIN_SCORE = 1_000_000
+MAX_PLY = 1000
+
+# 每层搜索占两层Python调用栈（_negamax、_child_score），深度上限留足余量
+_RECURSION_PER_PLY = 2
+_RECURSION_RESERVE = 200
+
+# 置换表条目类型
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# 每搜索这么多节点检查一次时间
+_TIME_CHECK_MASK = 1023
+
+
+class _Timeout(Exception):
+    """搜索超时（内部使用）"""
+
+
+def _is_win_score(score: int) -> bool:
+    return abs(score) >= WIN_SCORE - MAX_PLY
+
+
+class ChainSearch:
+    """接龙博弈树搜索类"""
+
+    def __init__(self, idioms: Iterable[Tuple[str, str, str]],
+                 table_size: int = 1 << 18, seed: int = 20240601):
+        """
+        创建搜索器
+
+        Args:
+            idioms: 按优先顺序排列的 (成语, 接入键, 接出键)；接入键为首字（或首字读音），
+                    接出键为对方要接的字（或读音）
+            table_size: 置换表槽位数（向上取2的幂）；按哈希定槽，空槽、同一局面、
+                        上一步搜索留下的条目或深度不高于新结果的条目会被覆盖
+            seed: Zobrist 随机数种子
+        """
+        rng = random.Random(seed)
+        self.words: List[str] = []
+        self.ids: Dict[str, int] = {}
+        keys: Dict[str, int] = {}
+        first: List[int] = []
+        follow: List[str] = []
+
+        for word, first_key, next_key in idioms:
+            if word in self.ids:
+                continue
+            self.ids[word] = len(self.words)
+            self.words.append(word)
+            first.append(keys.setdefault(first_key, len(keys)))
+            follow.append(next_key)
+
+        self.keys = keys
+        self.bucket_of = array('i', first)
+        # 接出键没有任何成语可接时为 -1（对方立即落败）
+        self.next_bucket = array('i', (keys.get(key, -1) for key in follow))
+        sizes = [0] * len(keys)
+        for bucket in first:
+            sizes[bucket] += 1
+        self.bucket_sizes = array('i', sizes)
+
+        # 静态走法顺序：对方可接的成语越少越靠前（先试陷阱），同数时保持原顺序
+        buckets: List[List[int]] = [[] for _ in keys]
+        for idiom, bucket in enumerate(first):
+            buckets[bucket].append(idiom)
+        for moves in buckets:
+            moves.sort(key=self._reply_count)
+        self.buckets = buckets
+
+        self.idiom_hashes = [rng.getrandbits(64) for _ in self.words]
+        self.bucket_hashes = [rng.getrandbits(64) for _ in keys]
+        self.table_size = 1 << max(table_size - 1, 1).bit_length()
+        self._slot_mask = self.table_size - 1
+        # 槽位 -> (局面哈希, 深度, 评分, 类型, 最佳走法, 搜索代数)
+        self.table: List[Optional[Tuple[int, int, int, int, int, int]]] = \
+            [None] * self.table_size
+        self._generation = 0
+
+        self._deadline = 0.0
+        self._nodes = 0
+        self._used = bytearray()
+        self._remaining = array('i')
+        self._hash = 0
+
+    def _reply_count(self, idiom: int) -> int:
+        bucket = self.next_bucket[idiom]
+        return self.bucket_sizes[bucket] if bucket >= 0 else -1
+
+    @classmethod
+    def from_database(cls, database, allow_homophone: bool = False,
+                      **kwargs) -> 'ChainSearch':
+        """
+        从数据库加载全部成语创建搜索器
+
+        Args:
+            database: IdiomDatabase 实例
+            allow_homophone: 是否按读音（无声调拼音）接龙
+            **kwargs: 传递给构造函数的参数
+
+        Returns:
+            搜索器
+        """
+        if allow_homophone:
+            # 同音接龙的接入键来自无声调拼音列，先确保已补齐
+            database.derived.ensure('plain_pinyin')
+        rows = database.conn.execute(
+            "SELECT word, first_char, last_char, first_pinyin_plain FROM idioms "
+            "ORDER BY frequency DESC, difficulty ASC, word ASC"
+        ).fetchall()
+        if not allow_homophone:
+            return cls(((word, first, last) for word, first, last, _ in rows), **kwargs)
+
+        sounds: Dict[str, str] = {}
+
+        def sound_of(char: str) -> str:
+            if char not in sounds:
+                sounds[char] = PinyinUtils.get_first_char_pinyin_without_tone(char) or char
+            return sounds[char]
+
+        # 个别行仍缺无声调拼音时按首字现算读音，接入键必须都是读音
+        return cls(((word, plain or sound_of(first), sound_of(last))
+                    for word, first, last, plain in rows), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def key_for(self, char: str, allow_homophone: bool = False) -> str:
+        """
+        待接的字对应的接入键
+
+        Args:
+            char: 上一个成语的尾字
+            allow_homophone: 是否按读音接龙（须与创建搜索器时一致）
+
+        Returns:
+            接入键
+        """
+        if allow_homophone:
+            return PinyinUtils.get_first_char_pinyin_without_tone(char) or char
+        return char
+
+    # ------------------------------------------------------------------ 搜索
+
+    def search(self, key: str, used: Iterable[str] = (), time_budget: float = 1.0,
+               max_depth: Optional[int] = None) -> SearchResult:
+        """
+        迭代加深搜索当前局面的最佳成语，到时间预算时返回已完成的最深一层的结果
+
+        Args:
+            key: 待接的接入键（见 key_for）
+            used: 已使用的成语（不在词库中的会被忽略）
+            time_budget: 时间预算（秒）
+            max_depth: 最大搜索深度（半回合数），None表示不限
+
+        Returns:
+            搜索结果
+        """
+        start = time.perf_counter()
+        self._deadline = start + time_budget
+        self._nodes = 0
+        self._generation += 1
+
+        base_used = bytearray(len(self.words))
+        base_remaining = array('i', self.bucket_sizes)
+        base_hash = 0
+        for word in set(used):
+            idiom = self.ids.get(word)
+            if idiom is not None:
+                base_used[idiom] = 1
+                base_remaining[self.bucket_of[idiom]] -= 1
+                base_hash ^= self.idiom_hashes[idiom]
+
+        bucket = self.keys.get(key)
+        moves = [idiom for idiom in self.buckets[bucket]
+                 if not base_used[idiom]] if bucket is not None else []
+        if not moves:
+            return SearchResult(None, -WIN_SCORE, 0, 1, time.perf_counter() - start, True)
+
+        best_move, best_score, depth_done = moves[0], 0, 0
+        limit = self.depth_limit()
+        if max_depth is not None:
+            limit = min(limit, max_depth)
+        depth = 1
+        while depth <= limit:
+            # 超时会中断在任意深度，每层都从初始局面重新开始（不需要逐层回退）
+            self._used = bytearray(base_used)
+            self._remaining = array('i', base_remaining)
+            self._hash = base_hash
+            try:
+                move, score = self._search_root(bucket, moves, depth)
+            except (_Timeout, RecursionError):
+                # 调用方栈已经很深时仍可能超出递归上限，按超时处理
+                break
+            best_move, best_score, depth_done = move, score, depth
+            # 最佳走法放到最前，下一层先搜
+            moves.remove(move)
+            moves.insert(0, move)
+            if _is_win_score(score):
+                # 已证明胜负（搜完的分支终局必然是胜负分）
+                break
+            depth += 1
+
+        duration = time.perf_counter() - start
+        result = SearchResult(self.words[best_move], best_score, depth_done, self._nodes,
+                              duration, _is_win_score(best_score))
+        logger.info(f"搜索AI: {result.word}，评分 {result.score}，深度 {result.depth}，"
+                    f"{result.nodes} 个节点，{result.nodes_per_second:.0f} 节点/秒")
+        return result
+
+    @staticmethod
+    def depth_limit() -> int:
+        """
+        不会超出Python递归上限的最大搜索深度
+
+        Returns:
+            最大深度（半回合数）
+        """
+        depth = (sys.getrecursionlimit() - _RECURSION_RESERVE) // _RECURSION_PER_PLY
+        return max(1, min(MAX_PLY, depth))
+
+    def _play(self, idiom: int) -> None:
+        self._used[idiom] = 1
+        self._remaining[self.bucket_of[idiom]] -= 1
+        self._hash ^= self.idiom_hashes[idiom]
+
+    def _unplay(self, idiom: int) -> None:
+        self._used[idiom] = 0
+        self._remaining[self.bucket_of[idiom]] += 1
+        self._hash ^= self.idiom_hashes[idiom]
+
+    def _search_root(self, bucket: int, moves: List[int], depth: int) -> Tuple[int, int]:
+        alpha, beta = -WIN_SCORE, WIN_SCORE
+        best_move = moves[0]
+        for idiom in moves:
+            self._play(idiom)
+            score = self._child_score(idiom, depth - 1, -beta, -alpha, 1)
+            self._unplay(idiom)
+            if score > alpha:
+                alpha, best_move = score, idiom
+        return best_move, alpha
+
+    def _child_score(self, idiom: int, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """走出 idiom 后对本方的评分（alpha、beta 为对方视角的窗口）"""
+        bucket = self.next_bucket[idiom]
+        if bucket < 0:
+            return WIN_SCORE - ply
+        return -self._negamax(bucket, depth, alpha, beta, ply)
+
+    def _negamax(self, bucket: int, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self._nodes += 1
+        if not self._nodes & _TIME_CHECK_MASK and time.perf_counter() > self._deadline:
+            raise _Timeout()
+
+        remaining = self._remaining[bucket]
+        if remaining == 0:
+            return -(WIN_SCORE - ply)
+        if depth <= 0:
+            # 搜索边界：以走子方剩余可接的成语数作为评分
+            return remaining
+
+        key = self._hash ^ self.bucket_hashes[bucket]
+        slot = key & self._slot_mask
+        entry = self.table[slot]
+        tt_move = -1
+        if entry is not None and entry[0] == key:
+            _, entry_depth, value, flag, tt_move, _ = entry
+            if entry_depth >= depth:
+                # 胜负分按距根的步数换算
+                if value >= WIN_SCORE - MAX_PLY:
+                    value -= ply
+                elif value <= -(WIN_SCORE - MAX_PLY):
+                    value += ply
+                if flag == EXACT:
+                    return value
+                if flag == LOWER and value >= beta:
+                    return value
+                if flag == UPPER and value <= alpha:
+                    return value
+
+        original_alpha = alpha
+        best_score, best_move = -WIN_SCORE, -1
+        used = self._used
+        # 置换表记录的最佳走法先搜
+        if tt_move >= 0 and not used[tt_move]:
+            self._play(tt_move)
+            best_score = self._child_score(tt_move, depth - 1, -beta, -alpha, ply + 1)
+            self._unplay(tt_move)
+            best_move = tt_move
+            alpha = max(alpha, best_score)
+
+        if alpha < beta:
+            for idiom in self.buckets[bucket]:
+                if used[idiom] or idiom == tt_move:
+                    continue
+                self._play(idiom)
+                score = self._child_score(idiom, depth - 1, -beta, -alpha, ply + 1)
+                self._unplay(idiom)
+                if score > best_score:
+                    best_score, best_move = score, idiom
+                    if score > alpha:
+                        alpha = score
+                        if alpha >= beta:
+                            break
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        stored = best_score
+        if stored >= WIN_SCORE - MAX_PLY:
+            stored += ply
+        elif stored <= -(WIN_SCORE - MAX_PLY):
+            stored -= ply
+        # 替换策略：深度优先，上一步搜索留下的条目总可覆盖
+        if entry is None or entry[0] == key or entry[1] <= depth or \
+                entry[5] != self._generation:
+            self.table[slot] = (key, depth, stored, flag, best_move, self._generation)
+        return best_score
@@ -6,9 +6,12 @@
 import time
 import logging
 from typing import Optional, Callable
-from src.data.models import GameState, GameConfig, GameResult, ValidationResult
+from src.data.models import (
+    GameState, GameConfig, GameResult, ValidationResult, SearchResult
+)
 from src.data.database import IdiomDatabase
 from src.data.idiom_repository import IdiomRepository
+from src.core.chain_search import ChainSearch
 from src.core.idiom_validator import IdiomValidator
 from src.core.llm_idiom_validator import LLMIdiomValidator
 from src.ai.lmstudio_client import LMStudioClient
@@ -23,7 +26,8 @@ class GameManager:
     """游戏管理器类"""
 
     def __init__(self, config: GameConfig, database: IdiomDatabase,
-                 ai_client: LMStudioClient, use_llm_validator: bool = True):
+                 ai_client: LMStudioClient, use_llm_validator: bool = True,
+                 repository: Optional[IdiomRepository] = None):
         """
         初始化游戏管理器
 
@@ -32,9 +36,10 @@ class GameManager:
             database: 成语数据库
             ai_client: AI客户端
             use_llm_validator: 是否使用LLM验证器
+            repository: 共享的成语仓库（跨局复用查询缓存），None表示新建
         """
         self.config = config
-        self.repository = IdiomRepository(database)
+        self.repository = repository or IdiomRepository(database)
         self.ai_client = ai_client
         self.use_llm_validator = use_llm_validator
 
@@ -46,10 +51,15 @@ class GameManager:
             self.validator = IdiomValidator(self.repository)
             logger.info("使用数据库验证器")
 
-        self.game_state = GameState()
+        self.game_state = GameState(self.repository.get_idiom_ids())
         self.start_time: Optional[float] = None
         self.end_time: Optional[float] = None
 
+        # 本地搜索AI，首次使用时从词库加载
+        self._search: Optional[ChainSearch] = None
+        self._search_version = None
+        self.last_search: Optional[SearchResult] = None
+
         # 回调函数
         self.on_state_change: Optional[Callable] = None
         self.on_ai_thinking: Optional[Callable] = None
@@ -73,7 +83,7 @@ class GameManager:
                 logger.warning(f"指定的起始成语不存在: {starting_idiom}")
                 starting_idiom = None
         else:
-            random_idiom = self.repository.find_random()
+            random_idiom = self.repository.find_random_start()
             starting_idiom = random_idiom.word if random_idiom else None
 
         if starting_idiom:
@@ -151,6 +161,13 @@ class GameManager:
         if self.on_ai_thinking:
             self.on_ai_thinking()
 
+        if self.config.ai_strategy == 'search':
+            ai_idiom = self._search_idiom(starting_char)
+            if not ai_idiom:
+                self.end_game('player', 'AI无法接龙')
+                return ""
+            return self._play_ai_idiom(ai_idiom)
+
         # 生成提示词
         prompt = PromptTemplates.generate_idiom_prompt(
             starting_char,
@@ -183,19 +200,7 @@ class GameManager:
                     self.end_game('player', 'AI无法接龙')
                     return ""
 
-            # 添加到已使用列表
-            self.game_state.add_idiom(ai_idiom)
-
-            # 切换到玩家回合
-            self.game_state.switch_turn()
-
-            if self.on_state_change:
-                self.on_state_change()
-
-            if self.on_ai_response:
-                self.on_ai_response(ai_idiom)
-
-            return ai_idiom
+            return self._play_ai_idiom(ai_idiom)
 
         except Exception as e:
             logger.error(f"AI调用失败: {str(e)}")
@@ -203,6 +208,54 @@ class GameManager:
             self.end_game('player', 'AI连接失败')
             return ""
 
+    def _play_ai_idiom(self, ai_idiom: str) -> str:
+        """记录AI的成语并切换到玩家回合"""
+        # 添加到已使用列表
+        self.game_state.add_idiom(ai_idiom)
+
+        # 切换到玩家回合
+        self.game_state.switch_turn()
+
+        if self.on_state_change:
+            self.on_state_change()
+
+        if self.on_ai_response:
+            self.on_ai_response(ai_idiom)
+
+        return ai_idiom
+
+    def _get_search(self) -> ChainSearch:
+        """获取搜索AI（词库有写入、派生数据构建完成或接龙规则改变后重新加载）"""
+        database = self.repository.database
+        version = (database.data_version, self.config.allow_homophone,
+                   database.derived.is_ready('plain_pinyin'))
+        if self._search is None or version != self._search_version:
+            self._search = ChainSearch.from_database(database, self.config.allow_homophone)
+            self._search_version = version
+        return self._search
+
+    def _search_idiom(self, starting_char: str) -> Optional[str]:
+        """
+        用本地博弈树搜索选择成语，在时间预算内返回找到的最佳成语
+
+        简单难度只看一步，普通难度看两步，困难难度不限深度。
+
+        Args:
+            starting_char: 起始字
+
+        Returns:
+            成语或None（无法接龙）
+        """
+        search = self._get_search()
+        max_depth = {'easy': 1, 'normal': 2}.get(self.config.difficulty)
+        self.last_search = search.search(
+            search.key_for(starting_char, self.config.allow_homophone),
+            self.game_state.used_idioms,
+            time_budget=self.config.search_time,
+            max_depth=max_depth
+        )
+        return self.last_search.word
+
     def _fallback_idiom(self, starting_char: str) -> Optional[str]:
         """
         备选成语（当AI失败时使用）
@@ -213,25 +266,28 @@ class GameManager:
         Returns:
             备选成语或None
         """
-        idioms = self.repository.get_possible_following_idioms(
+        # 简单：选择最常用的，只需取第一个
+        limit = 1 if self.config.difficulty == 'easy' else None
+        words = self.repository.find_unused_follower_words(
             starting_char,
-            self.game_state.used_idioms
+            self.game_state.used_idioms,
+            limit=limit,
+            allow_homophone=self.config.allow_homophone
         )
 
-        if not idioms:
+        if not words:
             return None
 
         # 根据难度选择成语
         if self.config.difficulty == 'easy':
-            # 简单：选择最常用的
-            return idioms[0].word if idioms else None
+            return words[0]
         elif self.config.difficulty == 'normal':
             # 普通：随机选择
             import random
-            return random.choice(idioms).word if idioms else None
+            return random.choice(words) if words else None
         else:
-            # 困难：选择较少用的
-            return idioms[-1].word if idioms else None
+            # 困难：博弈树搜索，向前看让对方无法接龙的走法
+            return self._search_idiom(starting_char) or words[-1]
 
     def use_hint(self) -> Optional[str]:
         """
@@ -256,7 +312,8 @@ class GameManager:
         hints = self.repository.get_hints(
             starting_char,
             count=1,
-            exclude=self.game_state.used_idioms
+            exclude=self.game_state.used_idioms,
+            allow_homophone=self.config.allow_homophone
         )
 
         if hints:
@@ -281,21 +338,16 @@ class GameManager:
         if self.use_llm_validator:
             return None
 
-        # 检查玩家是否无法接龙
-        if self.game_state.is_player_turn:
-            if not self.repository.has_possible_following(
-                self.game_state.last_idiom[-1],
-                self.game_state.used_idioms
-            ):
-                return 'ai'
-
-        # 检查AI是否无法接龙
-        else:
-            if not self.repository.has_possible_following(
-                self.game_state.last_idiom[-1],
-                self.game_state.used_idioms
-            ):
-                return 'player'
+        # 数据库验证器只接受词库内的成语，按首字的已用计数可直接参与比较
+        last_char = self.game_state.last_idiom[-1]
+        if not self.repository.has_possible_following(
+            last_char,
+            self.game_state.used_idioms,
+            self.config.allow_homophone,
+            used_count=self.game_state.used_first_chars[last_char]
+        ):
+            # 当前回合方无法接龙，对方获胜
+            return 'ai' if self.game_state.is_player_turn else 'player'
 
         return None
 
@@ -368,6 +420,7 @@ class GameManager:
         self.game_state.reset()
         self.start_time = None
         self.end_time = None
+        self.last_search = None
         logger.info("游戏已重置")
 
         if self.on_state_change:
@@ -145,13 +145,15 @@ class IdiomValidator:
         else:
             return from_idiom[-1] == to_idiom[0]
 
-    def is_dead_end(self, idiom: str, used_idioms: Set[str] = None) -> bool:
+    def is_dead_end(self, idiom: str, used_idioms: Set[str] = None,
+                    allow_homophone: bool = False) -> bool:
         """
         检查成语是否是死胡同（没有可接龙的成语）
 
         Args:
             idiom: 成语
             used_idioms: 已使用的成语集合
+            allow_homophone: 是否允许同音字
 
         Returns:
             是否是死胡同
@@ -163,4 +165,6 @@ class IdiomValidator:
         if used_idioms is None:
             used_idioms = set()
 
-        return not self.repository.has_possible_following(last_char, used_idioms)
+        return not self.repository.has_possible_following(
+            last_char, used_idioms, allow_homophone
+        )
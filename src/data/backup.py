@@ -0,0 +1,219 @@
+"""
+数据库在线备份
+基于 sqlite3 备份接口按页分步复制，步间休眠让出锁，在后台线程中执行
+"""
+
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Union
+from src.data.models import BackupResult
+from src.utils.exceptions import DatabaseException
+
+
+logger = logging.getLogger(__name__)
+
+BACKUP_SUFFIX = '.bak'
+
+
+class BackupManager:
+    """数据库在线备份管理类"""
+
+    def __init__(self, db_path: Union[str, Path],
+                 backup_dir: Optional[Union[str, Path]] = None,
+                 keep: int = 3, pages_per_step: int = 128,
+                 step_sleep: float = 0.005):
+        """
+        初始化备份管理器
+
+        Args:
+            db_path: 数据库文件路径
+            backup_dir: 备份目录，None表示数据库同目录下的 backups
+            keep: 保留的备份数量
+            pages_per_step: 每步复制的页数，不大于0表示一步复制全部
+            step_sleep: 每步之间的休眠时间（秒）
+        """
+        if str(db_path) == ":memory:":
+            raise DatabaseException("内存数据库不支持备份")
+        if keep < 1:
+            raise ValueError(f"保留数量必须大于0: {keep}")
+
+        self.db_path = Path(db_path)
+        self.backup_dir = (Path(backup_dir) if backup_dir
+                           else self.db_path.parent / 'backups')
+        self.keep = keep
+        self.pages_per_step = int(pages_per_step) if pages_per_step > 0 else -1
+        self.step_sleep = step_sleep
+        self.last_result: Optional[BackupResult] = None
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _backup_name(self) -> Path:
+        """生成带时间戳的备份文件路径"""
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        return self.backup_dir / f"{self.db_path.stem}-{stamp}{BACKUP_SUFFIX}"
+
+    def list_backups(self) -> List[Path]:
+        """
+        列出已有备份
+
+        Returns:
+            按时间从旧到新排列的备份文件路径
+        """
+        if not self.backup_dir.exists():
+            return []
+        return sorted(self.backup_dir.glob(f"{self.db_path.stem}-*{BACKUP_SUFFIX}"))
+
+    def _rotate(self) -> None:
+        """只保留最新的 keep 个备份"""
+        backups = self.list_backups()
+        for path in backups[:-self.keep]:
+            try:
+                path.unlink()
+                logger.debug(f"删除旧备份: {path}")
+            except OSError as e:
+                logger.warning(f"删除旧备份失败: {str(e)}")
+
+    @staticmethod
+    def _integrity_check(path: Path) -> bool:
+        """对备份文件执行 PRAGMA integrity_check"""
+        conn = sqlite3.connect(str(path))
+        try:
+            rows = conn.execute("PRAGMA integrity_check").fetchall()
+        finally:
+            conn.close()
+        return len(rows) == 1 and rows[0][0] == 'ok'
+
+    def backup_now(self) -> BackupResult:
+        """
+        立即执行一次备份（在调用线程中运行）
+
+        Returns:
+            备份结果
+
+        Raises:
+            DatabaseException: 备份失败或校验未通过
+        """
+        with self._lock:
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            target = self._backup_name()
+            tmp_path = target.with_suffix(target.suffix + '.tmp')
+
+            steps = 0
+            max_lock = 0.0
+            step_start = time.perf_counter()
+
+            def progress(status, remaining, total):
+                # 每步只在 step 调用期间持有源库读锁，步间休眠让出
+                nonlocal steps, max_lock, step_start
+                steps += 1
+                max_lock = max(max_lock, time.perf_counter() - step_start)
+                if self._stop.is_set() and threading.current_thread() is self._thread:
+                    raise DatabaseException("备份已取消")
+                if remaining and self.step_sleep:
+                    time.sleep(self.step_sleep)
+                step_start = time.perf_counter()
+
+            start = time.perf_counter()
+            try:
+                source = sqlite3.connect(str(self.db_path), isolation_level=None)
+                dest = sqlite3.connect(str(tmp_path))
+                try:
+                    # 先在源库上打开读事务：WAL模式下备份固定在该快照上，
+                    # 其他连接的写入既不被阻塞，也不会导致备份从头重来
+                    source.execute("BEGIN")
+                    source.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+                    source.backup(dest, pages=self.pages_per_step, progress=progress)
+                    source.execute("COMMIT")
+                    pages = dest.execute("PRAGMA page_count").fetchone()[0]
+                finally:
+                    dest.close()
+                    source.close()
+            except (sqlite3.Error, DatabaseException) as e:
+                tmp_path.unlink(missing_ok=True)
+                logger.error(f"数据库备份失败: {str(e)}")
+                raise DatabaseException(f"数据库备份失败: {str(e)}")
+
+            if not self._integrity_check(tmp_path):
+                tmp_path.unlink(missing_ok=True)
+                logger.error("数据库备份完整性校验失败")
+                raise DatabaseException("数据库备份完整性校验失败")
+
+            tmp_path.replace(target)
+            self._rotate()
+
+            result = BackupResult(
+                path=str(target),
+                pages=pages,
+                steps=steps,
+                duration=time.perf_counter() - start,
+                max_lock_time=max_lock
+            )
+            self.last_result = result
+            logger.info(f"数据库备份完成: {target}（{pages} 页，{steps} 步，"
+                        f"耗时 {result.duration:.3f} 秒，"
+                        f"最长持锁 {result.max_lock_time * 1000:.1f} ms）")
+            return result
+
+    def _run(self, interval: Optional[float]) -> None:
+        """后台线程主循环"""
+        while not self._stop.is_set():
+            try:
+                self.backup_now()
+            except DatabaseException:
+                pass  # 已记录日志，下个周期重试
+            if interval is None or self._stop.wait(interval):
+                break
+
+    def start(self, interval: Optional[float] = None) -> threading.Thread:
+        """
+        在后台线程中执行备份
+
+        Args:
+            interval: 重复备份的间隔（秒），None表示只备份一次
+
+        Returns:
+            后台线程
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,),
+            name='idiom-db-backup', daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待后台备份线程结束
+
+        Args:
+            timeout: 等待超时（秒），None表示一直等待
+
+        Returns:
+            线程是否已结束
+        """
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        停止后台备份，进行中的备份会在当前步结束后取消
+
+        Args:
+            timeout: 等待超时（秒），None表示一直等待
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,110 @@
+"""
+布隆过滤器
+用于在访问数据库前快速排除一定不存在的成语
+"""
+
+import math
+from typing import Dict, Iterable, List
+
+
+class BloomFilter:
+    """布隆过滤器类"""
+
+    def __init__(self, capacity: int, fp_rate: float = 0.01):
+        """
+        初始化布隆过滤器
+
+        Args:
+            capacity: 预计容纳的元素数量
+            fp_rate: 目标误判率（0-1之间）
+        """
+        if not 0 < fp_rate < 1:
+            raise ValueError(f"误判率必须在0和1之间: {fp_rate}")
+
+        self.capacity = max(int(capacity), 1)
+        self.fp_rate = fp_rate
+        # 最优位数 m = -n·ln(p)/ln²2，最优哈希数 k = m/n·ln2
+        self.num_bits = max(
+            int(math.ceil(-self.capacity * math.log(fp_rate) / math.log(2) ** 2)), 8
+        )
+        self.num_hashes = max(
+            int(round(self.num_bits / self.capacity * math.log(2))), 1
+        )
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> List[int]:
+        """
+        双重哈希生成k个位位置
+
+        过滤器只在进程内使用，直接复用内置字符串哈希（已缓存在字符串对象上），
+        高低32位拆成两个哈希值。
+        """
+        h = hash(item) & 0xFFFFFFFFFFFFFFFF
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def add(self, item: str) -> None:
+        """
+        添加元素
+
+        Args:
+            item: 元素
+        """
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def update(self, items: Iterable[str]) -> None:
+        """
+        批量添加元素
+
+        Args:
+            items: 元素集合
+        """
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        """False表示一定不存在，True表示可能存在"""
+        h = hash(item) & 0xFFFFFFFFFFFFFFFF
+        pos, step, m = h & 0xFFFFFFFF, (h >> 32) | 1, self.num_bits
+        bits = self._bits
+        # 与 _positions 相同的位置序列，逐个检查以便尽早返回
+        for _ in range(self.num_hashes):
+            pos %= m
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+            pos += step
+        return True
+
+    @property
+    def memory_bytes(self) -> int:
+        """位数组占用的字节数"""
+        return len(self._bits)
+
+    @property
+    def expected_fp_rate(self) -> float:
+        """按当前元素数估算的实际误判率"""
+        if self.count == 0:
+            return 0.0
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def stats(self) -> Dict[str, float]:
+        """
+        获取过滤器参数与状态
+
+        Returns:
+            统计字典
+        """
+        return {
+            'capacity': self.capacity,
+            'count': self.count,
+            'num_bits': self.num_bits,
+            'num_hashes': self.num_hashes,
+            'memory_bytes': self.memory_bytes,
+            'target_fp_rate': self.fp_rate,
+            'expected_fp_rate': self.expected_fp_rate,
+        }
@@ -0,0 +1,567 @@
+"""
+字级接龙图
+以汉字为节点、成语为边（首字 → 尾字），用压缩邻接数组（CSR）存储；
+提供可达性、强连通分量、死路字和k步接龙数查询，结果缓存在数据库同目录下
+
+缓存文件布局（小端序）：
+    头部    魔数、版本、k、成语数、最大行id、节点数、边数、载荷CRC32
+    载荷    节点码点、邻接偏移、邻接目标、边权（成语数）、分量编号、k步接龙数
+"""
+
+import zlib
+import struct
+import logging
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+from src.utils.binary import array_from_bytes, array_to_bytes
+from src.utils.exceptions import DatabaseException
+
+
+logger = logging.getLogger(__name__)
+
+GRAPH_MAGIC = b'CYCG'
+GRAPH_VERSION = 1
+DEFAULT_STEPS = 3
+
+# 魔数, 版本, k, 成语数, 最大行id, 节点数, 边数, 载荷CRC32
+_HEADER = struct.Struct('<4sHHQQIII')
+
+# 数据库指纹：(成语数, 最大行id)。行id自增且不复用，增删成语都会改变指纹
+Fingerprint = Tuple[int, int]
+
+
+def graph_path_for(db_path: Union[str, Path]) -> Path:
+    """
+    获取数据库对应的接龙图缓存路径（与数据库同目录）
+
+    Args:
+        db_path: 数据库文件路径
+
+    Returns:
+        缓存文件路径
+    """
+    return Path(db_path).with_suffix('.chaingraph')
+
+
+def database_fingerprint(database) -> Fingerprint:
+    """
+    读取数据库指纹，用于判断缓存是否过期
+
+    Args:
+        database: IdiomDatabase 实例
+
+    Returns:
+        (成语数, 最大行id)
+    """
+    row = database.conn.execute(
+        "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM idioms"
+    ).fetchone()
+    return row[0], row[1]
+
+
+class ChainGraph:
+    """字级接龙图类"""
+
+    def __init__(self, codes: array, offsets: array, targets: array, weights: array,
+                 components: Optional[array] = None, steps: Optional[List[array]] = None,
+                 fingerprint: Fingerprint = (0, 0)):
+        """
+        由压缩邻接数组创建图（一般通过 from_edges、from_database 或 load 创建）
+
+        Args:
+            codes: 节点的字符码点（升序）
+            offsets: 每个节点的出边起始下标，末尾为边数
+            targets: 出边目标节点
+            weights: 出边权重（该首尾字组合的成语数）
+            components: 节点所属的强连通分量编号，None表示现场计算
+            steps: steps[j-1][v] 为从节点v出发接j步的接龙方式数，None表示现场计算
+            fingerprint: 构建时的数据库指纹
+        """
+        self.codes = codes
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.fingerprint = fingerprint
+        self._index: Dict[str, int] = {chr(code): i for i, code in enumerate(codes)}
+
+        if components is None:
+            components = self._strongly_connected()
+        self.components = components
+        self.component_count = max(components) + 1 if len(components) else 0
+        self._component_sizes = array('I', bytes(4 * self.component_count))
+        for component in components:
+            self._component_sizes[component] += 1
+
+        self.steps = steps if steps is not None else self._count_steps(DEFAULT_STEPS)
+        # 分量级可达位集，首次查询可达性时计算
+        self._reach: Optional[List[int]] = None
+
+    # ------------------------------------------------------------------ 构建
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[str, str]], steps: int = DEFAULT_STEPS,
+                   fingerprint: Fingerprint = (0, 0)) -> 'ChainGraph':
+        """
+        由成语的 (首字, 尾字) 构建图
+
+        Args:
+            edges: 每个成语的 (首字, 尾字)
+            steps: 预计算的最大接龙步数
+            fingerprint: 数据库指纹
+
+        Returns:
+            接龙图
+        """
+        counts: Dict[Tuple[str, str], int] = {}
+        for first, last in edges:
+            counts[(first, last)] = counts.get((first, last), 0) + 1
+        return cls.from_counts(((first, last, count)
+                                for (first, last), count in counts.items()),
+                               steps, fingerprint)
+
+    @classmethod
+    def from_counts(cls, counts: Iterable[Tuple[str, str, int]],
+                    steps: int = DEFAULT_STEPS,
+                    fingerprint: Fingerprint = (0, 0)) -> 'ChainGraph':
+        """
+        由 (首字, 尾字, 成语数) 构建图，每个首尾字组合只出现一次
+
+        Args:
+            counts: 首尾字组合及其成语数
+            steps: 预计算的最大接龙步数
+            fingerprint: 数据库指纹
+
+        Returns:
+            接龙图
+        """
+        counts = list(counts)
+        chars = sorted({char for first, last, _ in counts for char in (first, last)})
+        index = {char: i for i, char in enumerate(chars)}
+        buckets: List[List[Tuple[int, int]]] = [[] for _ in chars]
+        for first, last, count in counts:
+            buckets[index[first]].append((index[last], count))
+
+        offsets = array('I', [0])
+        targets = array('I')
+        weights = array('I')
+        for bucket in buckets:
+            bucket.sort()
+            targets.extend(target for target, _ in bucket)
+            weights.extend(count for _, count in bucket)
+            offsets.append(len(targets))
+
+        graph = cls(array('I', map(ord, chars)), offsets, targets, weights,
+                    steps=[], fingerprint=fingerprint)
+        graph.steps = graph._count_steps(steps)
+        return graph
+
+    @classmethod
+    def from_database(cls, database, steps: int = DEFAULT_STEPS) -> 'ChainGraph':
+        """
+        从数据库构建图（首尾字组合在SQLite中聚合）
+
+        Args:
+            database: IdiomDatabase 实例
+            steps: 预计算的最大接龙步数
+
+        Returns:
+            接龙图
+        """
+        fingerprint = database_fingerprint(database)
+        rows = database.conn.execute(
+            "SELECT first_char, last_char, COUNT(*) FROM idioms "
+            "GROUP BY first_char, last_char"
+        ).fetchall()
+        return cls.from_counts(rows, steps, fingerprint)
+
+    def _strongly_connected(self) -> array:
+        """
+        迭代式Tarjan算法计算强连通分量
+
+        分量编号按完成顺序分配，即逆拓扑序：编号小的分量不会有边指向编号大的分量。
+        """
+        n = len(self.codes)
+        offsets, targets = self.offsets, self.targets
+        unvisited = -1
+        order = [unvisited] * n
+        low = [0] * n
+        on_stack = [False] * n
+        components = array('I', bytes(4 * n))
+        stack: List[int] = []
+        counter = 0
+        component = 0
+
+        for root in range(n):
+            if order[root] != unvisited:
+                continue
+            work = [(root, offsets[root])]
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            while work:
+                node, edge = work[-1]
+                if edge < offsets[node + 1]:
+                    work[-1] = (node, edge + 1)
+                    target = targets[edge]
+                    if order[target] == unvisited:
+                        order[target] = low[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack[target] = True
+                        work.append((target, offsets[target]))
+                    elif on_stack[target]:
+                        low[node] = min(low[node], order[target])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == order[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        components[member] = component
+                        if member == node:
+                            break
+                    component += 1
+        return components
+
+    def _count_steps(self, steps: int) -> List[array]:
+        """按 w_j(v) = Σ 边权 × w_{j-1}(目标) 计算 1..steps 步的接龙方式数"""
+        n = len(self.codes)
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        result = []
+        previous = [1] * n
+        for _ in range(steps):
+            current = array('q', bytes(8 * n))
+            for node in range(n):
+                total = 0
+                for edge in range(offsets[node], offsets[node + 1]):
+                    total += weights[edge] * previous[targets[edge]]
+                current[node] = total
+            result.append(current)
+            previous = current
+        return result
+
+    # ------------------------------------------------------------------ 查询
+
+    def __contains__(self, char: str) -> bool:
+        return char in self._index
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def edge_count(self) -> int:
+        """边数（不同的首尾字组合数）"""
+        return len(self.targets)
+
+    @property
+    def idiom_count(self) -> int:
+        """成语数（边权之和）"""
+        return sum(self.weights)
+
+    @property
+    def max_steps(self) -> int:
+        """预计算的最大接龙步数"""
+        return len(self.steps)
+
+    def out_count(self, char: str) -> int:
+        """
+        以指定字开头的成语数
+
+        Args:
+            char: 汉字
+
+        Returns:
+            成语数
+        """
+        node = self._index.get(char)
+        if node is None:
+            return 0
+        return sum(self.weights[self.offsets[node]:self.offsets[node + 1]])
+
+    def successors(self, char: str) -> List[Tuple[str, int]]:
+        """
+        指定字的下一步尾字及对应的成语数
+
+        Args:
+            char: 汉字
+
+        Returns:
+            [(尾字, 成语数)]，按尾字码点升序
+        """
+        node = self._index.get(char)
+        if node is None:
+            return []
+        start, stop = self.offsets[node], self.offsets[node + 1]
+        return [(chr(self.codes[self.targets[edge]]), self.weights[edge])
+                for edge in range(start, stop)]
+
+    def is_sink(self, char: str) -> bool:
+        """
+        是否为死路字（没有以它开头的成语）
+
+        Args:
+            char: 汉字
+
+        Returns:
+            是否为死路字
+        """
+        node = self._index.get(char)
+        return node is None or self.offsets[node] == self.offsets[node + 1]
+
+    def sinks(self) -> List[str]:
+        """
+        图中所有死路字（作为尾字出现、但没有以它开头的成语）
+
+        Returns:
+            死路字列表
+        """
+        return [chr(code) for node, code in enumerate(self.codes)
+                if self.offsets[node] == self.offsets[node + 1]]
+
+    def step_count(self, char: str, steps: int) -> int:
+        """
+        从指定字出发接 steps 步的接龙方式数（不考虑成语重复使用）
+
+        Args:
+            char: 汉字
+            steps: 步数，1表示以该字开头的成语数
+
+        Returns:
+            接龙方式数
+        """
+        if not 1 <= steps <= self.max_steps:
+            raise ValueError(f"步数必须在1到{self.max_steps}之间: {steps}")
+        node = self._index.get(char)
+        return self.steps[steps - 1][node] if node is not None else 0
+
+    def component_id(self, char: str) -> Optional[int]:
+        """
+        指定字所属的强连通分量编号
+
+        Args:
+            char: 汉字
+
+        Returns:
+            分量编号，不在图中时返回None
+        """
+        node = self._index.get(char)
+        return self.components[node] if node is not None else None
+
+    def component_size(self, char: str) -> int:
+        """
+        指定字所在强连通分量的大小（互相可以接回来的字数）
+
+        Args:
+            char: 汉字
+
+        Returns:
+            分量大小，不在图中时返回0
+        """
+        component = self.component_id(char)
+        return self._component_sizes[component] if component is not None else 0
+
+    def largest_component(self) -> List[str]:
+        """
+        最大强连通分量中的字
+
+        Returns:
+            字列表
+        """
+        if not self.component_count:
+            return []
+        largest = max(range(self.component_count), key=self._component_sizes.__getitem__)
+        return [chr(code) for node, code in enumerate(self.codes)
+                if self.components[node] == largest]
+
+    def _component_reach(self) -> List[int]:
+        """
+        计算每个分量可达的分量位集（含自身当且仅当分量内有环）
+
+        分量编号为逆拓扑序，按编号递增计算时后继分量已经算好。
+        """
+        if self._reach is not None:
+            return self._reach
+
+        count = self.component_count
+        successors: List[Set[int]] = [set() for _ in range(count)]
+        cyclic = [size > 1 for size in self._component_sizes]
+        for node in range(len(self.codes)):
+            source = self.components[node]
+            for edge in range(self.offsets[node], self.offsets[node + 1]):
+                target = self.components[self.targets[edge]]
+                if target == source:
+                    cyclic[source] = True
+                else:
+                    successors[source].add(target)
+
+        reach = [0] * count
+        for component in range(count):
+            bits = (1 << component) if cyclic[component] else 0
+            for target in successors[component]:
+                bits |= (1 << target) | reach[target]
+            reach[component] = bits
+        self._reach = reach
+        return reach
+
+    def can_reach(self, source: str, target: str) -> bool:
+        """
+        从 source 字出发能否经过至少一个成语接到 target 字
+
+        Args:
+            source: 起始字
+            target: 目标字
+
+        Returns:
+            是否可达
+        """
+        a = self.component_id(source)
+        b = self.component_id(target)
+        if a is None or b is None:
+            return False
+        return bool(self._component_reach()[a] >> b & 1)
+
+    def reachable(self, char: str) -> Set[str]:
+        """
+        从指定字出发经过至少一个成语可以接到的所有字
+
+        Args:
+            char: 起始字
+
+        Returns:
+            字集合
+        """
+        component = self.component_id(char)
+        if component is None:
+            return set()
+        bits = self._component_reach()[component]
+        return {chr(code) for node, code in enumerate(self.codes)
+                if bits >> self.components[node] & 1}
+
+    def reachable_count(self, char: str) -> int:
+        """
+        从指定字出发可以接到的字数
+
+        Args:
+            char: 起始字
+
+        Returns:
+            字数
+        """
+        component = self.component_id(char)
+        if component is None:
+            return 0
+        bits = self._component_reach()[component]
+        return sum(size for index, size in enumerate(self._component_sizes)
+                   if bits >> index & 1)
+
+    # ------------------------------------------------------------------ 缓存
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        保存到缓存文件（先写临时文件再替换）
+
+        Args:
+            path: 缓存文件路径
+        """
+        payload = b''.join(array_to_bytes(part) for part in (
+            self.codes, self.offsets, self.targets, self.weights,
+            self.components, *self.steps
+        ))
+        header = _HEADER.pack(GRAPH_MAGIC, GRAPH_VERSION, self.max_steps,
+                              self.fingerprint[0], self.fingerprint[1],
+                              len(self.codes), len(self.targets), zlib.crc32(payload))
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            f.write(payload)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'ChainGraph':
+        """
+        从缓存文件加载
+
+        Args:
+            path: 缓存文件路径
+
+        Returns:
+            接龙图
+
+        Raises:
+            DatabaseException: 文件不存在、格式或版本不符、校验失败
+        """
+        try:
+            data = Path(path).read_bytes()
+        except OSError as e:
+            raise DatabaseException(f"读取接龙图缓存失败: {str(e)}")
+        if len(data) < _HEADER.size:
+            raise DatabaseException("接龙图缓存文件已损坏")
+
+        magic, version, steps, count, max_id, nodes, edges, crc = \
+            _HEADER.unpack_from(data)
+        if magic != GRAPH_MAGIC or version != GRAPH_VERSION:
+            raise DatabaseException(f"接龙图缓存格式不兼容: {path}")
+        payload = memoryview(data)[_HEADER.size:]
+        if zlib.crc32(payload) != crc:
+            raise DatabaseException("接龙图缓存校验失败")
+
+        layout = [('I', nodes), ('I', nodes + 1), ('I', edges), ('I', edges),
+                  ('I', nodes)] + [('q', nodes)] * steps
+        parts = []
+        offset = 0
+        for typecode, length in layout:
+            size = array(typecode).itemsize * length
+            parts.append(array_from_bytes(typecode, payload[offset:offset + size]))
+            offset += size
+        if offset != len(payload):
+            raise DatabaseException("接龙图缓存文件已损坏")
+
+        codes, offsets, targets, weights, components = parts[:5]
+        return cls(codes, offsets, targets, weights, components, parts[5:],
+                   fingerprint=(count, max_id))
+
+    @classmethod
+    def load_or_build(cls, database, path: Optional[Union[str, Path]] = None,
+                      steps: int = DEFAULT_STEPS) -> 'ChainGraph':
+        """
+        加载与数据库一致的缓存，不存在或已过期时重新构建并写入缓存
+
+        Args:
+            database: IdiomDatabase 实例
+            path: 缓存文件路径，None表示数据库同目录（内存数据库不缓存）
+            steps: 预计算的最大接龙步数
+
+        Returns:
+            接龙图
+        """
+        if path is None and str(database.db_path) != ":memory:":
+            path = graph_path_for(database.db_path)
+
+        fingerprint = database_fingerprint(database)
+        if path is not None and Path(path).exists():
+            try:
+                graph = cls.load(path)
+                if graph.fingerprint == fingerprint and graph.max_steps >= steps:
+                    logger.debug(f"使用接龙图缓存: {path}")
+                    return graph
+                logger.info("接龙图缓存已过期，重新构建")
+            except DatabaseException as e:
+                logger.warning(f"接龙图缓存不可用，重新构建: {str(e)}")
+
+        graph = cls.from_database(database, steps)
+        logger.info(f"接龙图构建完成: {len(graph)} 个字，{graph.edge_count} 条边，"
+                    f"{graph.component_count} 个强连通分量")
+        if path is not None:
+            try:
+                graph.save(path)
+            except OSError as e:
+                # 只读介质等情况下只使用内存中的图
+                logger.warning(f"保存接龙图缓存失败: {str(e)}")
+        return graph
@@ -0,0 +1,108 @@
+"""
+首字接龙索引
+将成语按首字分桶常驻内存，接龙查询无需访问SQL
+"""
+
+from bisect import bisect_right
+from typing import Dict, Iterable, Optional, Tuple
+from src.data.models import Idiom
+from src.data.lexicon import DetailsLoader, IdiomView, LexiconStore
+
+
+# 索引加载行：(id, 成语, 拼音, 首字, 尾字, 首字拼音, 尾字拼音, 难度, 频率)
+IndexRow = Tuple[int, str, str, str, str, str, str, int, float]
+
+
+def chain_sort_key(idiom) -> Tuple[float, int, str]:
+    """
+    接龙排序键：与 follower_sql 的 ORDER BY frequency DESC, difficulty ASC, word ASC 一致
+
+    Args:
+        idiom: 成语对象或视图
+
+    Returns:
+        排序键
+    """
+    return (-idiom.frequency, idiom.difficulty, idiom.word)
+
+
+class ChainIndex:
+    """首字接龙索引类"""
+
+    def __init__(self, details_loader: Optional[DetailsLoader] = None):
+        """
+        初始化空索引
+
+        Args:
+            details_loader: 解释/例句的按需加载函数
+        """
+        self.store = LexiconStore(details_loader)
+        self._buckets: Dict[str, Tuple[IdiomView, ...]] = {}
+
+    def load(self, rows: Iterable[IndexRow]) -> None:
+        """
+        重新加载索引
+
+        Args:
+            rows: 全部成语行（顺序不限，桶内按 chain_sort_key 排列）
+        """
+        store = LexiconStore(self.store.details_loader)
+        buckets: Dict[str, list] = {}
+        for row in rows:
+            view = store.append(*row)
+            buckets.setdefault(view.first_char, []).append(view)
+
+        self.store = store
+        self._buckets = {
+            char: tuple(sorted(bucket, key=chain_sort_key))
+            for char, bucket in buckets.items()
+        }
+
+    def add(self, row_id: int, idiom: Idiom) -> None:
+        """
+        插入单个成语，保持桶内排序
+
+        Args:
+            row_id: 成语在数据库中的行id
+            idiom: 新增的成语
+        """
+        view = self.store.append(
+            row_id, idiom.word, idiom.pinyin,
+            idiom.first_char, idiom.last_char,
+            idiom.first_pinyin, idiom.last_pinyin,
+            idiom.difficulty, idiom.frequency
+        )
+        bucket = self._buckets.get(view.first_char, ())
+        keys = [chain_sort_key(item) for item in bucket]
+        pos = bisect_right(keys, chain_sort_key(view))
+        self._buckets[view.first_char] = bucket[:pos] + (view,) + bucket[pos:]
+
+    def get(self, char: str) -> Tuple[IdiomView, ...]:
+        """
+        获取以指定字开头的成语
+
+        Args:
+            char: 首字
+
+        Returns:
+            已排序的成语视图元组
+        """
+        return self._buckets.get(char, ())
+
+    def count(self, char: str) -> int:
+        """
+        获取以指定字开头的成语数量
+
+        Args:
+            char: 首字
+
+        Returns:
+            成语数量
+        """
+        return len(self._buckets.get(char, ()))
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.store
+
+    def __len__(self) -> int:
+        return len(self.store)
@@ -0,0 +1,203 @@
+"""
+数据库连接管理
+每个线程使用独立的SQLite连接（WAL模式），写操作串行化；
+只读模式以 immutable URI 打开，跳过文件锁和变更检测
+"""
+
+import time
+import weakref
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import quote
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from src.data.performance import PerformanceProfile
+from src.utils.exceptions import DatabaseException
+
+
+logger = logging.getLogger(__name__)
+
+MEMORY_PATH = ":memory:"
+
+
+class _ThreadConnection:
+    """线程局部的连接持有者：线程退出时随线程局部数据释放，触发连接回收"""
+
+    __slots__ = ('conn', '__weakref__')
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+class ConnectionManager:
+    """线程连接管理器类"""
+
+    def __init__(self, db_path: str, busy_timeout: float = 5.0,
+                 profile: Optional[PerformanceProfile] = None,
+                 read_only: bool = False):
+        """
+        初始化连接管理器
+
+        Args:
+            db_path: 数据库文件路径，":memory:" 表示内存数据库
+            busy_timeout: 跨进程写锁等待超时（秒）
+            profile: 每个连接打开时应用的性能配置，None表示 desktop 预设
+            read_only: 是否以只读且不可变（mode=ro&immutable=1）方式打开，
+                       要求运行期间没有任何进程修改该文件
+        """
+        if read_only and db_path == MEMORY_PATH:
+            raise DatabaseException("内存数据库不支持只读模式")
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self.read_only = read_only
+        # 写事务提交前调用的钩子（如内存副本同步回磁盘），参数为当前连接
+        self.before_commit: Optional[Callable[[sqlite3.Connection], None]] = None
+        self.profile = profile if profile is not None else PerformanceProfile.from_config(None)
+        # 第一个连接实际生效的性能配置
+        self.settings: Optional[Dict[str, Any]] = None
+        self._local = threading.local()
+        self._write_lock = threading.RLock()
+        self._registry_lock = threading.Lock()
+        self._shared_lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        # 内存数据库无法跨连接共享，所有线程共用同一个连接
+        self._shared: Optional[sqlite3.Connection] = None
+
+        self._stats = {
+            'connections_opened': 0,
+            'connections_closed': 0,
+            'write_acquisitions': 0,
+            'write_contentions': 0,
+            'write_wait_total': 0.0,
+            'write_wait_max': 0.0,
+        }
+
+    @property
+    def is_memory(self) -> bool:
+        """是否为内存数据库"""
+        return self.db_path == MEMORY_PATH
+
+    def _uri(self) -> str:
+        """只读模式的连接URI"""
+        path = quote(Path(self.db_path).resolve().as_posix())
+        return f"file:{path}?mode=ro&immutable=1"
+
+    def _open(self) -> sqlite3.Connection:
+        """打开新连接并应用性能配置（默认WAL模式）"""
+        try:
+            conn = sqlite3.connect(
+                self._uri() if self.read_only else self.db_path,
+                timeout=self.busy_timeout,
+                check_same_thread=False,  # 仅用于在关闭时跨线程回收连接
+                uri=self.read_only
+            )
+            conn.row_factory = sqlite3.Row
+            settings = self.profile.apply(conn, self.is_memory, self.read_only)
+        except sqlite3.Error as e:
+            raise DatabaseException(f"连接数据库失败: {str(e)}")
+
+        with self._registry_lock:
+            self._connections.append(conn)
+            self._stats['connections_opened'] += 1
+            if self.settings is None:
+                self.settings = settings
+        logger.debug(f"为线程 {threading.current_thread().name} 打开数据库连接")
+        return conn
+
+    def get(self) -> sqlite3.Connection:
+        """
+        获取当前线程的连接
+
+        Returns:
+            SQLite连接
+        """
+        if self.is_memory:
+            with self._shared_lock:
+                if self._shared is None:
+                    self._shared = self._open()
+            return self._shared
+
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            conn = self._open()
+            holder = _ThreadConnection(conn)
+            # 线程结束后其线程局部数据被释放，持有者回收时关闭连接
+            weakref.finalize(holder, self._release, conn)
+            self._local.holder = holder
+        return holder.conn
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        """关闭已退出线程的连接（已由 close_all 关闭的跳过）"""
+        with self._registry_lock:
+            try:
+                self._connections.remove(conn)
+            except ValueError:
+                return
+            self._stats['connections_closed'] += 1
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"关闭数据库连接失败: {str(e)}")
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """
+        获取写连接：持有进程内写锁，正常退出时提交，异常时回滚
+
+        Yields:
+            当前线程的连接
+
+        Raises:
+            DatabaseException: 只读模式下不能写入
+        """
+        if self.read_only:
+            raise DatabaseException(f"数据库以只读模式打开，不能写入: {self.db_path}")
+        start = time.perf_counter()
+        contended = not self._write_lock.acquire(blocking=False)
+        if contended:
+            self._write_lock.acquire()
+        waited = time.perf_counter() - start
+
+        with self._registry_lock:
+            self._stats['write_acquisitions'] += 1
+            if contended:
+                self._stats['write_contentions'] += 1
+                self._stats['write_wait_total'] += waited
+                self._stats['write_wait_max'] = max(
+                    self._stats['write_wait_max'], waited
+                )
+
+        try:
+            conn = self.get()
+            with conn:
+                yield conn
+                if self.before_commit is not None:
+                    self.before_commit(conn)
+        finally:
+            self._write_lock.release()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        获取连接与写锁竞争统计
+
+        Returns:
+            统计字典
+        """
+        with self._registry_lock:
+            stats = dict(self._stats)
+            stats['open_connections'] = len(self._connections)
+        return stats
+
+    def close_all(self) -> None:
+        """关闭所有线程的连接"""
+        with self._registry_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"关闭数据库连接失败: {str(e)}")
+        self._shared = None
+        self._local = threading.local()
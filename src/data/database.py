@@ -3,96 +3,524 @@
 使用SQLite存储成语数据
 """
 
+import json
+import base64
+import random
+import hashlib
 import sqlite3
 import logging
+from array import array
+from itertools import islice
 from pathlib import Path
-from typing import Optional, List
-from src.data.models import Idiom
+from typing import Optional, List, Iterable, Iterator, Tuple, Dict, Set
+from src.data.models import Idiom, IdiomPage, ImportResult, MemoryLoadResult
+from src.data.chain_index import ChainIndex
+from src.data.idiom_ids import IdiomIds
+from src.data.bloom_filter import BloomFilter
+from src.data.connection import ConnectionManager
+from src.data.performance import PerformanceProfile, format_settings
+from src.data.backup import BackupManager
+from src.data.memory_copy import (
+    attach_write_through, flush_write_through, load_into_memory, prepare_disk
+)
+from src.data.migrations import DerivedTables, SCHEMA_VERSION, get_schema_version, migrate
 from src.utils.exceptions import DatabaseException
 
 
 logger = logging.getLogger(__name__)
 
+# 批量导入记录：(成语, 解释, 例句, 难度, 频率)
+IdiomRecord = Tuple[str, Optional[str], Optional[str], int, float]
+
+
+# 插入成语行，参数由 idiom_row 生成
+INSERT_IDIOM_SQL = """
+    INSERT OR IGNORE INTO idioms
+    (word, pinyin, first_char, last_char, first_pinyin,
+     last_pinyin, first_pinyin_plain, last_pinyin_plain,
+     explanation, example, difficulty, frequency, content_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def follower_sql(column: str, words_only: bool = False, limited: bool = False,
+                 after: bool = False) -> str:
+    """
+    生成按接龙顺序（频率降序、难度升序、词语升序）查询成语的SQL
+
+    排序与覆盖索引 idx_chain_<column> 的列顺序一致，查询按索引顺序读取而不排序；
+    words_only 时只取词语及排序列，由索引直接返回。
+
+    Args:
+        column: 匹配列，first_char 或 first_pinyin_plain
+        words_only: 是否只查询词语
+        limited: 是否带 LIMIT 参数
+        after: 是否只取排在游标之后的成语（键集分页）
+
+    Returns:
+        SQL语句，参数依次为 键、（游标的频率、频率、难度、难度、词语）、（数量）
+    """
+    if column not in ('first_char', 'first_pinyin_plain'):
+        raise ValueError(f"不支持的接龙列: {column}")
+    columns = "word, frequency, difficulty" if words_only else """word, pinyin, first_char, last_char,
+               first_pinyin, last_pinyin, explanation, example,
+               difficulty, frequency"""
+    # 频率的范围条件让索引直接定位到游标处，其余条件只过滤同频率的并列项
+    keyset = """
+          AND frequency <= ?
+          AND (frequency < ? OR difficulty > ? OR (difficulty = ? AND word > ?))""" if after else ""
+    sql = f"""
+        SELECT {columns}
+        FROM idioms WHERE {column} = ?{keyset}
+        ORDER BY frequency DESC, difficulty ASC, word ASC
+    """
+    return sql + " LIMIT ?" if limited else sql
+
+
+def encode_page_cursor(frequency: float, difficulty: int, word: str) -> str:
+    """
+    将分页位置编码为不透明的游标字符串
+
+    Args:
+        frequency: 本页最后一个成语的频率
+        difficulty: 本页最后一个成语的难度
+        word: 本页最后一个成语
+
+    Returns:
+        URL安全的游标字符串
+    """
+    payload = json.dumps([frequency, difficulty, word], ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_page_cursor(cursor: str) -> Tuple[float, int, str]:
+    """
+    解析分页游标
+
+    Args:
+        cursor: encode_page_cursor 生成的游标
+
+    Returns:
+        (频率, 难度, 成语)
+
+    Raises:
+        DatabaseException: 游标无效
+    """
+    try:
+        frequency, difficulty, word = json.loads(base64.urlsafe_b64decode(cursor))
+        return float(frequency), int(difficulty), str(word)
+    except (ValueError, TypeError) as e:
+        raise DatabaseException(f"无效的分页游标: {cursor}") from e
+
+
+def plain_pinyin(char: str) -> str:
+    """
+    获取单字的无声调拼音，用于同音接龙
+
+    Args:
+        char: 单个汉字
+
+    Returns:
+        无声调拼音
+    """
+    from src.utils.pinyin import PinyinUtils
+
+    return PinyinUtils.get_first_char_pinyin_without_tone(char)
+
+
+def record_hash(explanation: Optional[str], example: Optional[str],
+                difficulty: int, frequency: float) -> str:
+    """
+    计算成语可变内容的哈希，用于增量导入时判断记录是否变化
+
+    Args:
+        explanation: 解释
+        example: 例句
+        difficulty: 难度等级
+        frequency: 使用频率
+
+    Returns:
+        16位十六进制哈希
+    """
+    content = '\x1f'.join((explanation or '', example or '',
+                           str(int(difficulty)), repr(float(frequency))))
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def file_checksum(file_path: Path) -> str:
+    """
+    计算文件的SHA-256校验和
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        十六进制校验和
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_idiom(word: str, explanation: Optional[str] = None,
+                example: Optional[str] = None, difficulty: int = 1,
+                frequency: float = 0.0) -> Idiom:
+    """
+    根据成语文本生成完整的成语对象（计算拼音及首尾字）
+
+    Args:
+        word: 成语
+        explanation: 解释
+        example: 例句
+        difficulty: 难度等级
+        frequency: 使用频率
+
+    Returns:
+        成语对象
+    """
+    from src.utils.pinyin import PinyinUtils
+
+    first_char = word[0]
+    last_char = word[-1]
+    return Idiom(
+        word=word,
+        pinyin=PinyinUtils.get_pinyin(word, style='tone'),
+        first_char=first_char,
+        last_char=last_char,
+        first_pinyin=PinyinUtils.get_first_char_pinyin(first_char),
+        last_pinyin=PinyinUtils.get_first_char_pinyin(last_char),
+        explanation=explanation,
+        example=example,
+        difficulty=difficulty,
+        frequency=frequency
+    )
+
+
+def idiom_row(idiom: Idiom) -> tuple:
+    """
+    生成成语表插入行（参数顺序与 INSERT_IDIOM_SQL 一致）
+
+    Args:
+        idiom: 成语对象
+
+    Returns:
+        插入参数元组
+    """
+    return (
+        idiom.word, idiom.pinyin,
+        idiom.first_char, idiom.last_char,
+        idiom.first_pinyin, idiom.last_pinyin,
+        plain_pinyin(idiom.first_char), plain_pinyin(idiom.last_char),
+        idiom.explanation, idiom.example,
+        idiom.difficulty, idiom.frequency,
+        record_hash(idiom.explanation, idiom.example,
+                    idiom.difficulty, idiom.frequency)
+    )
+
 
 class IdiomDatabase:
     """成语数据库类"""
 
-    def __init__(self, db_path: str = "resources/idioms.db"):
+    def __init__(self, db_path: str = "resources/idioms.db",
+                 use_chain_index: bool = False,
+                 bloom_fp_rate: Optional[float] = None,
+                 bloom_capacity: Optional[int] = None,
+                 performance=None, read_only: bool = False,
+                 in_memory: bool = False, write_through: bool = False):
         """
         初始化数据库
 
         Args:
             db_path: 数据库文件路径
+            use_chain_index: 是否启用内存首字接龙索引
+            bloom_fp_rate: 布隆过滤器目标误判率，None表示不启用
+            bloom_capacity: 布隆过滤器预留容量（成语数），None表示当前成语数的两倍
+            performance: 性能配置：PerformanceProfile、预设名或配置字典
+                         （见 PerformanceProfile.from_config），None表示 desktop 预设
+            read_only: 只读模式：以不可变URI打开已有的词库文件，不执行迁移，
+                       写入接口抛出 DatabaseException（用于打包发布的词库）
+            in_memory: 启动时把词库文件复制到内存数据库，之后的查询只访问内存
+            write_through: 内存模式下把写入同步回词库文件，否则写入只保留在内存中
         """
+        if write_through and (read_only or not in_memory):
+            raise DatabaseException("write_through 只能用于可写的内存模式")
         self.db_path = Path(db_path)
-        self.conn: Optional[sqlite3.Connection] = None
+        self.performance = performance
+        self.read_only = read_only
+        self.in_memory = in_memory and str(db_path) != ":memory:"
+        self.write_through = write_through
+        # 内存模式的加载结果（复制耗时、大小）
+        self.memory_load: Optional[MemoryLoadResult] = None
+        self._connections: Optional[ConnectionManager] = None
+        self.chain_index: Optional[ChainIndex] = None
+        self.bloom_filter: Optional[BloomFilter] = None
+        # 配置的布隆过滤器预留容量，重建时沿用
+        self._bloom_capacity: Optional[int] = None
+        self._bloom_rejected = 0
+        self._bloom_passed = 0
+        # 派生数据（无声调拼音、接龙数量、全文索引），迁移后创建
+        self.derived: Optional[DerivedTables] = None
+        # 成语稠密编号表及已编号的最大行id；None表示未加载
+        self._idiom_ids: Optional[IdiomIds] = None
+        self._idiom_ids_rowid = 0
+        self._idiom_ids_version = None
+        # 随机抽样用的id数组：难度 -> ids，键None对应全部成语；None表示未加载
+        self._random_ids: Optional[Dict[Optional[int], array]] = None
+        self.backup_manager: Optional[BackupManager] = None
+        # 数据版本：每次写入成功后递增，上层缓存据此判断是否失效
+        self.data_version = 0
         self._connect()
         self._create_tables()
+        if self.write_through:
+            self._attach_write_through()
+        if use_chain_index:
+            self.enable_chain_index()
+        if bloom_fp_rate:
+            self.enable_bloom_filter(bloom_fp_rate, bloom_capacity)
 
     def _connect(self) -> None:
         """连接数据库"""
         try:
-            # 确保目录存在
-            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            if self.read_only:
+                if not self.db_path.is_file():
+                    raise DatabaseException(f"只读模式要求词库文件已存在: {self.db_path}")
+            else:
+                # 确保目录存在
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-            self.conn = sqlite3.connect(
-                str(self.db_path),
-                check_same_thread=False
-            )
-            self.conn.row_factory = sqlite3.Row
-            logger.info(f"成功连接数据库: {self.db_path}")
+            profile = (self.performance if isinstance(self.performance, PerformanceProfile)
+                       else PerformanceProfile.from_config(self.performance))
+            if self.in_memory:
+                # 内存副本本身可写（迁移和派生数据在副本上完成），只读由写入接口检查
+                self._connections = ConnectionManager(":memory:", profile=profile)
+                if self.db_path.is_file():
+                    self.memory_load = load_into_memory(
+                        self.db_path, self._connections.get(), immutable=self.read_only
+                    )
+            else:
+                self._connections = ConnectionManager(str(self.db_path), profile=profile,
+                                                      read_only=self.read_only)
+            self._connections.get()
+            mode = '（内存副本）' if self.in_memory else '（只读）' if self.read_only else ''
+            logger.info(f"成功连接数据库: {self.db_path}{mode}")
+            logger.info(f"数据库性能配置: {format_settings(self._connections.settings)}")
         except Exception as e:
             logger.error(f"连接数据库失败: {str(e)}")
             raise DatabaseException(f"连接数据库失败: {str(e)}")
 
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """当前线程的数据库连接（WAL模式下各线程读互不阻塞）"""
+        return self._connections.get()
+
+    def get_performance_settings(self) -> dict:
+        """
+        获取实际生效的性能配置（从连接读回的 PRAGMA 值）
+
+        Returns:
+            配置项 -> 值：mmap_size、cache_size、journal_mode、synchronous、
+            temp_store、page_size
+        """
+        return dict(self._connections.settings or {})
+
+    def get_connection_stats(self) -> dict:
+        """
+        获取连接健康状况与写锁竞争统计
+
+        Returns:
+            统计字典：打开的连接数、写锁获取/竞争次数、等待时间
+        """
+        return self._connections.stats()
+
+    def _check_writable(self) -> None:
+        """
+        检查数据库是否可写
+
+        Raises:
+            DatabaseException: 数据库以只读模式打开
+        """
+        if self.read_only:
+            raise DatabaseException(f"数据库以只读模式打开，不能写入: {self.db_path}")
+
     def _create_tables(self) -> None:
-        """创建数据表"""
+        """按结构版本执行迁移，并准备派生数据"""
+        if self.read_only and not self.in_memory:
+            # 只读库不执行迁移，只使用打包时已构建好的结构和派生数据
+            version = get_schema_version(self.conn)
+            if version < SCHEMA_VERSION:
+                logger.warning(f"只读词库结构版本 v{version} 低于 v{SCHEMA_VERSION}，"
+                               f"部分查询可能不可用")
+            self.derived = DerivedTables(self._connections, background=False,
+                                         read_only=True)
+            return
+
+        try:
+            with self._connections.write() as conn:
+                applied = migrate(conn)
+            if applied:
+                logger.info(f"数据库结构已升级到 v{SCHEMA_VERSION}")
+        except Exception as e:
+            logger.error(f"创建数据表失败: {str(e)}")
+            raise DatabaseException(f"创建数据表失败: {str(e)}")
+
+        # 内存数据库只有一个共享连接，不能在后台线程中构建
+        is_memory = self._connections.is_memory
+        self.derived = DerivedTables(self._connections, background=not is_memory,
+                                     on_ready=self._on_derived_ready)
+        if is_memory or self.get_total_count() == 0:
+            # 空库构建派生数据几乎没有开销，直接同步完成
+            self.derived.build_all()
+        else:
+            # 同音查询依赖无声调拼音，旧库在返回前补齐
+            self.derived.build_required()
+
+    def _on_derived_ready(self, name: str) -> None:
+        """派生数据构建完成后递增数据版本，使构建期间按基础表得到的缓存结果失效"""
+        self.data_version += 1
+
+    def _attach_write_through(self) -> None:
+        """把磁盘词库迁移到最新结构后附加到内存连接，写入经临时触发器同步"""
+        try:
+            prepare_disk(self.db_path)
+            with self._connections.write() as conn:
+                attach_write_through(conn, self.db_path)
+            self._connections.before_commit = flush_write_through
+        except sqlite3.Error as e:
+            logger.error(f"启用写入同步失败: {str(e)}")
+            raise DatabaseException(f"启用写入同步失败: {str(e)}")
+
+    @property
+    def fts_enabled(self) -> bool:
+        """全文索引（FTS5 trigram）是否已构建可用"""
+        return self.derived is not None and self.derived.is_ready('fts')
+
+    @staticmethod
+    def _row_to_idiom(row: sqlite3.Row) -> Idiom:
+        """
+        将查询结果行转换为成语对象
+
+        Args:
+            row: 查询结果行
+
+        Returns:
+            成语对象
+        """
+        return Idiom(
+            word=row['word'],
+            pinyin=row['pinyin'],
+            first_char=row['first_char'],
+            last_char=row['last_char'],
+            first_pinyin=row['first_pinyin'],
+            last_pinyin=row['last_pinyin'],
+            explanation=row['explanation'],
+            example=row['example'],
+            difficulty=row['difficulty'],
+            frequency=row['frequency']
+        )
+
+    def enable_chain_index(self) -> None:
+        """启用并加载内存首字接龙索引"""
+        self.chain_index = ChainIndex(details_loader=self._load_details)
+        self.refresh_chain_index()
+
+    def _load_details(self, row_id: int) -> Tuple[Optional[str], Optional[str]]:
+        """
+        按行id加载成语的解释和例句（供内存词库按需读取）
+
+        Args:
+            row_id: 成语行id
+
+        Returns:
+            (解释, 例句)
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT explanation, example FROM idioms WHERE id = ?", (row_id,)
+        )
+        row = cursor.fetchone()
+        return (row['explanation'], row['example']) if row else (None, None)
+
+    def refresh_chain_index(self) -> None:
+        """从数据库重新加载首字接龙索引"""
+        if self.chain_index is None:
+            return
         cursor = self.conn.cursor()
         try:
+            # 解释和例句不常驻内存，按需加载
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS idioms (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    word TEXT NOT NULL UNIQUE,
-                    pinyin TEXT NOT NULL,
-                    first_char TEXT NOT NULL,
-                    last_char TEXT NOT NULL,
-                    first_pinyin TEXT NOT NULL,
-                    last_pinyin TEXT NOT NULL,
-                    explanation TEXT,
-                    example TEXT,
-                    difficulty INTEGER DEFAULT 1,
-                    frequency REAL DEFAULT 0.0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+                SELECT id, word, pinyin, first_char, last_char,
+                       first_pinyin, last_pinyin, difficulty, frequency
+                FROM idioms ORDER BY id
             """)
+            self.chain_index.load(tuple(row) for row in cursor)
+            logger.info(f"首字接龙索引已加载: {len(self.chain_index)} 个成语")
+        except Exception as e:
+            logger.error(f"加载首字接龙索引失败: {str(e)}")
+            raise DatabaseException(f"加载首字接龙索引失败: {str(e)}")
 
-            # 创建索引
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_first_char
-                ON idioms(first_char)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_last_char
-                ON idioms(last_char)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_first_pinyin
-                ON idioms(first_pinyin)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_last_pinyin
-                ON idioms(last_pinyin)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_difficulty
-                ON idioms(difficulty)
-            """)
+    def enable_bloom_filter(self, fp_rate: float = 0.01,
+                            capacity: Optional[int] = None) -> None:
+        """
+        启用并构建布隆过滤器，不存在的成语无需查询数据库即可排除
 
-            self.conn.commit()
-            logger.info("数据表创建成功")
+        容量默认预留为当前成语数的两倍（至少1024），超出后自动重建。
+        词库还会持续增长时可预留更大容量以减少重建，内存按容量线性增长。
+
+        Args:
+            fp_rate: 目标误判率
+            capacity: 预留容量（成语数），None或不大于当前成语数时使用默认值
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("SELECT word FROM idioms")
+            words = [row['word'] for row in cursor]
         except Exception as e:
-            logger.error(f"创建数据表失败: {str(e)}")
-            raise DatabaseException(f"创建数据表失败: {str(e)}")
+            logger.error(f"构建布隆过滤器失败: {str(e)}")
+            raise DatabaseException(f"构建布隆过滤器失败: {str(e)}")
+
+        self._bloom_capacity = capacity
+        if not capacity or capacity <= len(words):
+            capacity = max(len(words) * 2, 1024)
+        bloom = BloomFilter(capacity, fp_rate)
+        bloom.update(words)
+        self.bloom_filter = bloom
+        logger.info(f"布隆过滤器已构建: {bloom.count} 个成语，"
+                    f"{bloom.memory_bytes / 1024:.1f} KB，"
+                    f"预计误判率 {bloom.expected_fp_rate:.4%}")
+
+    def _bloom_add(self, word: str) -> None:
+        """将新成语加入布隆过滤器，超出容量时重建"""
+        if self.bloom_filter is None:
+            return
+        self.bloom_filter.add(word)
+        if self.bloom_filter.count > self.bloom_filter.capacity:
+            self.enable_bloom_filter(self.bloom_filter.fp_rate, self._bloom_capacity)
+
+    def _bloom_may_contain(self, word: str) -> bool:
+        """布隆过滤器判断：False表示一定不存在"""
+        if self.bloom_filter is None:
+            return True
+        if word in self.bloom_filter:
+            self._bloom_passed += 1
+            return True
+        self._bloom_rejected += 1
+        return False
+
+    def get_bloom_filter_stats(self) -> Optional[dict]:
+        """
+        获取布隆过滤器参数与命中统计
+
+        Returns:
+            统计字典，未启用返回None
+        """
+        if self.bloom_filter is None:
+            return None
+        stats = self.bloom_filter.stats()
+        stats['rejected'] = self._bloom_rejected
+        stats['passed'] = self._bloom_passed
+        return stats
 
     def add_idiom(self, idiom: Idiom) -> bool:
         """
@@ -103,24 +531,27 @@ class IdiomDatabase:
 
         Returns:
             是否添加成功
+
+        Raises:
+            DatabaseException: 数据库以只读模式打开
         """
-        cursor = self.conn.cursor()
+        self._check_writable()
         try:
-            cursor.execute("""
-                INSERT OR IGNORE INTO idioms
-                (word, pinyin, first_char, last_char, first_pinyin, last_pinyin,
-                 explanation, example, difficulty, frequency)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                idiom.word, idiom.pinyin,
-                idiom.first_char, idiom.last_char,
-                idiom.first_pinyin, idiom.last_pinyin,
-                idiom.explanation, idiom.example,
-                idiom.difficulty, idiom.frequency
-            ))
-            self.conn.commit()
+            with self._connections.write() as conn:
+                cursor = conn.execute(INSERT_IDIOM_SQL, idiom_row(idiom))
+                added = cursor.rowcount > 0
+                if added:
+                    self.data_version += 1
+                    if self.chain_index is not None:
+                        self.chain_index.add(cursor.lastrowid, idiom)
+                    self._bloom_add(idiom.word)
+                    if self._random_ids is not None:
+                        self._random_ids[None].append(cursor.lastrowid)
+                        self._random_ids.setdefault(
+                            idiom.difficulty, array('q')
+                        ).append(cursor.lastrowid)
             logger.debug(f"添加成语: {idiom.word}")
-            return cursor.rowcount > 0
+            return added
         except Exception as e:
             logger.error(f"添加成语失败: {str(e)}")
             return False
@@ -135,6 +566,9 @@ class IdiomDatabase:
         Returns:
             成语对象，不存在则返回None
         """
+        if not self._bloom_may_contain(word):
+            return None
+
         cursor = self.conn.cursor()
         try:
             cursor.execute("""
@@ -145,18 +579,7 @@ class IdiomDatabase:
             """, (word,))
             row = cursor.fetchone()
             if row:
-                return Idiom(
-                    word=row['word'],
-                    pinyin=row['pinyin'],
-                    first_char=row['first_char'],
-                    last_char=row['last_char'],
-                    first_pinyin=row['first_pinyin'],
-                    last_pinyin=row['last_pinyin'],
-                    explanation=row['explanation'],
-                    example=row['example'],
-                    difficulty=row['difficulty'],
-                    frequency=row['frequency']
-                )
+                return self._row_to_idiom(row)
             return None
         except Exception as e:
             logger.error(f"查询成语失败: {str(e)}")
@@ -166,86 +589,305 @@ class IdiomDatabase:
         """
         根据首字获取成语列表
 
+        启用内存索引时返回只读的成语视图，属性与 Idiom 一致，
+        解释和例句在访问时才从数据库加载。
+
         Args:
             char: 首字
 
         Returns:
             成语列表
         """
+        if self.chain_index is not None:
+            return list(self.chain_index.get(char))
+
         cursor = self.conn.cursor()
         try:
-            cursor.execute("""
-                SELECT word, pinyin, first_char, last_char,
-                       first_pinyin, last_pinyin, explanation, example,
-                       difficulty, frequency
-                FROM idioms WHERE first_char = ?
-                ORDER BY frequency DESC, difficulty ASC
-            """, (char,))
+            cursor.execute(follower_sql('first_char'), (char,))
             rows = cursor.fetchall()
             return [
-                Idiom(
-                    word=row['word'],
-                    pinyin=row['pinyin'],
-                    first_char=row['first_char'],
-                    last_char=row['last_char'],
-                    first_pinyin=row['first_pinyin'],
-                    last_pinyin=row['last_pinyin'],
-                    explanation=row['explanation'],
-                    example=row['example'],
-                    difficulty=row['difficulty'],
-                    frequency=row['frequency']
-                ) for row in rows
+                self._row_to_idiom(row) for row in rows
             ]
         except Exception as e:
             logger.error(f"查询成语列表失败: {str(e)}")
             return []
 
+    def get_follower_count(self, char: str) -> int:
+        """
+        获取以指定字开头的成语数量
+
+        Args:
+            char: 首字
+
+        Returns:
+            成语数量
+        """
+        if self.chain_index is not None:
+            return self.chain_index.count(char)
+
+        cursor = self.conn.cursor()
+        try:
+            if self.derived.ensure('char_stats'):
+                cursor.execute(
+                    "SELECT follower_count FROM char_stats WHERE first_char = ?",
+                    (char,)
+                )
+                row = cursor.fetchone()
+                return row['follower_count'] if row else 0
+            # 统计表构建完成前按首字索引计数
+            cursor.execute("SELECT COUNT(*) FROM idioms WHERE first_char = ?", (char,))
+            return cursor.fetchone()[0]
+        except Exception as e:
+            logger.error(f"查询接龙数量失败: {str(e)}")
+            return 0
+
+    def get_idioms_by_starting_sound(self, sound: str) -> List[Idiom]:
+        """
+        根据首字无声调拼音获取成语列表（同音接龙）
+
+        Args:
+            sound: 无声调拼音，如 'long'
+
+        Returns:
+            成语列表
+        """
+        self.derived.ensure('plain_pinyin')
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(follower_sql('first_pinyin_plain'), (sound,))
+            rows = cursor.fetchall()
+            return [self._row_to_idiom(row) for row in rows]
+        except Exception as e:
+            logger.error(f"按读音查询成语失败: {str(e)}")
+            return []
+
+    def get_unused_followers(self, key: str, exclude: Optional[Iterable[str]] = None,
+                             limit: Optional[int] = None,
+                             by_sound: bool = False) -> List[Idiom]:
+        """
+        按接龙顺序获取未使用的成语，取够limit个即停止
+
+        索引路径逐个跳过已用成语；SQL路径只多取与该首字（读音）相同的已用成语数，
+        再在内存中过滤，工作量与结果数和已用数成正比，而不是与整个分组大小成正比。
+
+        Args:
+            key: 首字，by_sound为True时为无声调拼音
+            exclude: 已使用的成语集合
+            limit: 最多返回的数量，None表示不限制
+            by_sound: 是否按首字读音匹配（同音接龙）
+
+        Returns:
+            成语列表
+        """
+        return self._unused_followers(key, exclude, limit, by_sound, words_only=False)
+
+    def get_unused_follower_words(self, key: str,
+                                  exclude: Optional[Iterable[str]] = None,
+                                  limit: Optional[int] = None,
+                                  by_sound: bool = False) -> List[str]:
+        """
+        按接龙顺序获取未使用的成语词语（只读覆盖索引，不回表读取解释和例句）
+
+        供接龙判断和提示使用；需要展示完整信息时再按词语查询。
+
+        Args:
+            key: 首字，by_sound为True时为无声调拼音
+            exclude: 已使用的成语集合
+            limit: 最多返回的数量，None表示不限制
+            by_sound: 是否按首字读音匹配（同音接龙）
+
+        Returns:
+            成语词语列表
+        """
+        return self._unused_followers(key, exclude, limit, by_sound, words_only=True)
+
+    def _unused_followers(self, key: str, exclude: Optional[Iterable[str]],
+                          limit: Optional[int], by_sound: bool,
+                          words_only: bool) -> list:
+        """get_unused_followers 和 get_unused_follower_words 的共同实现"""
+        if limit is not None and limit <= 0:
+            return []
+        exclude = exclude if exclude is not None else ()
+
+        if not by_sound and self.chain_index is not None:
+            result = []
+            for view in self.chain_index.get(key):
+                if view.word in exclude:
+                    continue
+                result.append(view.word if words_only else view)
+                if limit is not None and len(result) >= limit:
+                    break
+            return result
+
+        if by_sound:
+            self.derived.ensure('plain_pinyin')
+            column = 'first_pinyin_plain'
+            excluded = sum(1 for word in exclude if word and plain_pinyin(word[0]) == key)
+        else:
+            column = 'first_char'
+            excluded = sum(1 for word in exclude if word[:1] == key)
+
+        params: list = [key]
+        if limit is not None:
+            params.append(limit + excluded)
+
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(follower_sql(column, words_only, limit is not None), params)
+            result = []
+            for row in cursor:
+                if row['word'] in exclude:
+                    continue
+                result.append(row['word'] if words_only else self._row_to_idiom(row))
+                if limit is not None and len(result) >= limit:
+                    break
+            return result
+        except Exception as e:
+            logger.error(f"查询未使用的接龙成语失败: {str(e)}")
+            return []
+
+    def get_followers_page(self, key: str, cursor: Optional[str] = None,
+                           page_size: int = 50, by_sound: bool = False,
+                           words_only: bool = False) -> IdiomPage:
+        """
+        按接龙顺序分页获取成语（键集分页）
+
+        游标记录上一页最后一个成语的排序键，下一页从覆盖索引中该位置之后开始读取，
+        每页的开销与页大小成正比，而与翻过的页数和分组大小无关。
+        分页期间有新成语写入时，已翻过的位置不会重复返回。
+
+        Args:
+            key: 首字，by_sound为True时为无声调拼音
+            cursor: 上一页返回的游标，None表示第一页
+            page_size: 每页数量
+            by_sound: 是否按首字读音匹配（同音接龙）
+            words_only: 是否只返回词语（不回表）
+
+        Returns:
+            分页结果
+
+        Raises:
+            DatabaseException: 游标无效
+        """
+        if page_size < 1:
+            raise ValueError(f"每页数量必须大于0: {page_size}")
+        if by_sound:
+            self.derived.ensure('plain_pinyin')
+        column = 'first_pinyin_plain' if by_sound else 'first_char'
+
+        params: list = [key]
+        if cursor is not None:
+            frequency, difficulty, word = decode_page_cursor(cursor)
+            params += [frequency, frequency, difficulty, difficulty, word]
+        # 多取一条以判断是否还有下一页
+        params.append(page_size + 1)
+
+        try:
+            rows = self.conn.execute(
+                follower_sql(column, words_only, limited=True, after=cursor is not None),
+                params
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"分页查询接龙成语失败: {str(e)}")
+            return IdiomPage()
+
+        rows, more = rows[:page_size], len(rows) > page_size
+        items = [row['word'] if words_only else self._row_to_idiom(row) for row in rows]
+        next_cursor = None
+        if more:
+            last = rows[-1]
+            next_cursor = encode_page_cursor(last['frequency'], last['difficulty'],
+                                             last['word'])
+        return IdiomPage(items=items, cursor=next_cursor)
+
+    def iter_followers(self, key: str, page_size: int = 100, by_sound: bool = False,
+                       words_only: bool = False) -> Iterator:
+        """
+        按接龙顺序逐个迭代成语，内部按页读取，内存占用只与页大小有关
+
+        Args:
+            key: 首字，by_sound为True时为无声调拼音
+            page_size: 每次读取的数量
+            by_sound: 是否按首字读音匹配（同音接龙）
+            words_only: 是否只返回词语
+
+        Yields:
+            成语对象（words_only时为词语）
+        """
+        cursor = None
+        while True:
+            page = self.get_followers_page(key, cursor, page_size, by_sound, words_only)
+            yield from page.items
+            if not page.has_more:
+                return
+            cursor = page.cursor
+
+    def _load_random_ids(self) -> Dict[Optional[int], array]:
+        """
+        加载按难度分组的成语id数组，供随机抽样使用
+
+        Returns:
+            难度 -> id数组，键None对应全部成语
+        """
+        if self._random_ids is None:
+            pools: Dict[Optional[int], array] = {None: array('q')}
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT id, difficulty FROM idioms ORDER BY id")
+            for row_id, difficulty in cursor:
+                pools[None].append(row_id)
+                pools.setdefault(difficulty, array('q')).append(row_id)
+            self._random_ids = pools
+        return self._random_ids
+
     def get_random_idiom(self, difficulty: int = None) -> Optional[Idiom]:
         """
         获取随机成语
 
+        从预加载的id数组中均匀抽取，避免 ORDER BY RANDOM() 全表排序。
+
         Args:
             difficulty: 难度等级（1-5），None表示随机
 
         Returns:
             随机成语对象
         """
-        cursor = self.conn.cursor()
         try:
-            if difficulty:
-                cursor.execute("""
-                    SELECT word, pinyin, first_char, last_char,
-                           first_pinyin, last_pinyin, explanation, example,
-                           difficulty, frequency
-                    FROM idioms WHERE difficulty = ?
-                    ORDER BY RANDOM() LIMIT 1
-                """, (difficulty,))
-            else:
-                cursor.execute("""
-                    SELECT word, pinyin, first_char, last_char,
-                           first_pinyin, last_pinyin, explanation, example,
-                           difficulty, frequency
-                    FROM idioms ORDER BY RANDOM() LIMIT 1
-                """)
+            ids = self._load_random_ids().get(difficulty or None)
+            if not ids:
+                return None
+
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                SELECT word, pinyin, first_char, last_char,
+                       first_pinyin, last_pinyin, explanation, example,
+                       difficulty, frequency
+                FROM idioms WHERE id = ?
+            """, (random.choice(ids),))
             row = cursor.fetchone()
             if row:
-                return Idiom(
-                    word=row['word'],
-                    pinyin=row['pinyin'],
-                    first_char=row['first_char'],
-                    last_char=row['last_char'],
-                    first_pinyin=row['first_pinyin'],
-                    last_pinyin=row['last_pinyin'],
-                    explanation=row['explanation'],
-                    example=row['example'],
-                    difficulty=row['difficulty'],
-                    frequency=row['frequency']
-                )
+                return self._row_to_idiom(row)
             return None
         except Exception as e:
             logger.error(f"获取随机成语失败: {str(e)}")
             return None
 
+    @staticmethod
+    def _fts_phrase(keyword: str) -> str:
+        """
+        将关键词转为FTS5短语查询，避免特殊字符被当作语法
+
+        Args:
+            keyword: 关键词
+
+        Returns:
+            FTS5查询表达式
+        """
+        return '"' + keyword.replace('"', '""') + '"'
+
+    def _can_use_fts(self, keyword: str) -> bool:
+        """trigram索引只能匹配不少于3个字的关键词；索引未建好时退化为LIKE"""
+        return len(keyword) >= 3 and self.derived.ensure('fts')
+
     def search_idioms(self, keyword: str, limit: int = 10) -> List[Idiom]:
         """
         搜索成语
@@ -259,33 +901,79 @@ class IdiomDatabase:
         """
         cursor = self.conn.cursor()
         try:
-            cursor.execute("""
-                SELECT word, pinyin, first_char, last_char,
-                       first_pinyin, last_pinyin, explanation, example,
-                       difficulty, frequency
-                FROM idioms WHERE word LIKE ?
-                ORDER BY frequency DESC
-                LIMIT ?
-            """, (f'%{keyword}%', limit))
+            if self._can_use_fts(keyword):
+                cursor.execute("""
+                    SELECT i.word, i.pinyin, i.first_char, i.last_char,
+                           i.first_pinyin, i.last_pinyin, i.explanation,
+                           i.example, i.difficulty, i.frequency
+                    FROM idioms_fts f JOIN idioms i ON i.id = f.rowid
+                    WHERE idioms_fts MATCH ?
+                    ORDER BY i.frequency DESC
+                    LIMIT ?
+                """, (f'word : {self._fts_phrase(keyword)}', limit))
+            else:
+                cursor.execute("""
+                    SELECT word, pinyin, first_char, last_char,
+                           first_pinyin, last_pinyin, explanation, example,
+                           difficulty, frequency
+                    FROM idioms WHERE word LIKE ?
+                    ORDER BY frequency DESC
+                    LIMIT ?
+                """, (f'%{keyword}%', limit))
             rows = cursor.fetchall()
             return [
-                Idiom(
-                    word=row['word'],
-                    pinyin=row['pinyin'],
-                    first_char=row['first_char'],
-                    last_char=row['last_char'],
-                    first_pinyin=row['first_pinyin'],
-                    last_pinyin=row['last_pinyin'],
-                    explanation=row['explanation'],
-                    example=row['example'],
-                    difficulty=row['difficulty'],
-                    frequency=row['frequency']
-                ) for row in rows
+                self._row_to_idiom(row) for row in rows
             ]
         except Exception as e:
             logger.error(f"搜索成语失败: {str(e)}")
             return []
 
+    def search_full_text(self, keyword: str, limit: int = 10) -> List[Idiom]:
+        """
+        在成语、解释、例句中全文搜索，按相关度排序
+
+        成语本身命中的权重最高，其次是解释、例句。
+
+        Args:
+            keyword: 关键词
+            limit: 返回数量限制
+
+        Returns:
+            匹配的成语列表
+        """
+        cursor = self.conn.cursor()
+        try:
+            if self._can_use_fts(keyword):
+                cursor.execute("""
+                    SELECT i.word, i.pinyin, i.first_char, i.last_char,
+                           i.first_pinyin, i.last_pinyin, i.explanation,
+                           i.example, i.difficulty, i.frequency
+                    FROM idioms_fts f JOIN idioms i ON i.id = f.rowid
+                    WHERE idioms_fts MATCH ?
+                    ORDER BY bm25(idioms_fts, 10.0, 2.0, 1.0), i.frequency DESC
+                    LIMIT ?
+                """, (self._fts_phrase(keyword), limit))
+            else:
+                pattern = f'%{keyword}%'
+                cursor.execute("""
+                    SELECT word, pinyin, first_char, last_char,
+                           first_pinyin, last_pinyin, explanation, example,
+                           difficulty, frequency
+                    FROM idioms
+                    WHERE word LIKE ? OR explanation LIKE ? OR example LIKE ?
+                    ORDER BY CASE
+                                 WHEN word LIKE ? THEN 0
+                                 WHEN explanation LIKE ? THEN 1
+                                 ELSE 2
+                             END, frequency DESC
+                    LIMIT ?
+                """, (pattern, pattern, pattern, pattern, pattern, limit))
+            rows = cursor.fetchall()
+            return [self._row_to_idiom(row) for row in rows]
+        except Exception as e:
+            logger.error(f"全文搜索成语失败: {str(e)}")
+            return []
+
     def is_valid_idiom(self, word: str) -> bool:
         """
         验证成语是否存在
@@ -296,6 +984,11 @@ class IdiomDatabase:
         Returns:
             是否存在
         """
+        if self.chain_index is not None:
+            return word in self.chain_index
+        if not self._bloom_may_contain(word):
+            return False
+
         cursor = self.conn.cursor()
         try:
             cursor.execute("SELECT 1 FROM idioms WHERE word = ?", (word,))
@@ -304,6 +997,92 @@ class IdiomDatabase:
             logger.error(f"验证成语失败: {str(e)}")
             return False
 
+    def exists_many(self, words: Iterable[str]) -> List[bool]:
+        """
+        批量验证成语是否存在
+
+        Args:
+            words: 成语列表
+
+        Returns:
+            与输入顺序一致的存在标志列表
+        """
+        words = list(words)
+        if self.chain_index is not None:
+            return [word in self.chain_index for word in words]
+
+        candidates = [word for word in dict.fromkeys(words)
+                      if self._bloom_may_contain(word)]
+        found = set()
+        cursor = self.conn.cursor()
+        try:
+            for chunk in self._chunks(candidates):
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(
+                    f"SELECT word FROM idioms WHERE word IN ({placeholders})",
+                    chunk
+                )
+                found.update(row['word'] for row in cursor)
+        except Exception as e:
+            logger.error(f"批量验证成语失败: {str(e)}")
+        return [word in found for word in words]
+
+    def get_many(self, words: Iterable[str]) -> List[Optional[Idiom]]:
+        """
+        批量获取成语
+
+        Args:
+            words: 成语列表
+
+        Returns:
+            与输入顺序一致的成语列表，不存在的位置为None
+        """
+        words = list(words)
+        found = {}
+        cursor = self.conn.cursor()
+        try:
+            for chunk in self._chunks(list(dict.fromkeys(words))):
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f"""
+                    SELECT word, pinyin, first_char, last_char,
+                           first_pinyin, last_pinyin, explanation, example,
+                           difficulty, frequency
+                    FROM idioms WHERE word IN ({placeholders})
+                """, chunk)
+                for row in cursor:
+                    found[row['word']] = self._row_to_idiom(row)
+        except Exception as e:
+            logger.error(f"批量查询成语失败: {str(e)}")
+        return [found.get(word) for word in words]
+
+    @staticmethod
+    def _chunks(items: list, size: int = 500) -> Iterable[list]:
+        """按SQLite参数数量上限切分 IN (...) 查询的参数"""
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
+
+    def get_idiom_ids(self) -> IdiomIds:
+        """
+        获取成语稠密编号表（首次调用时按行id顺序编号，之后只为新增的成语追加编号）
+
+        Returns:
+            编号表
+        """
+        if self._idiom_ids is None:
+            self._idiom_ids = IdiomIds()
+        elif self._idiom_ids_version == self.data_version:
+            return self._idiom_ids
+        self._idiom_ids_version = self.data_version
+        cursor = self.conn.execute(
+            "SELECT id, word FROM idioms WHERE id > ? ORDER BY id",
+            (self._idiom_ids_rowid,)
+        )
+        rows = cursor.fetchall()
+        if rows:
+            self._idiom_ids.extend(row[1] for row in rows)
+            self._idiom_ids_rowid = rows[-1][0]
+        return self._idiom_ids
+
     def get_total_count(self) -> int:
         """
         获取成语总数
@@ -320,26 +1099,240 @@ class IdiomDatabase:
             logger.error(f"获取成语总数失败: {str(e)}")
             return 0
 
-    def load_from_file(self, file_path: str) -> int:
+    def _diff_records(self, records: List[IdiomRecord], seen: Set[str]):
         """
-        从文件批量导入成语
+        将一块导入记录与库中内容哈希比对
 
         Args:
-            file_path: 文件路径，每行一个成语，格式：成语,拼音,解释,例句
+            records: 已校验的导入记录
+            seen: 本次导入中已处理过的成语（跨块共享，会被更新）
 
         Returns:
-            导入成功数量
+            (新记录列表, 更新参数列表, 未变化数, 重复数)
         """
-        from src.utils.pinyin import PinyinUtils
+        fresh = []
+        for record in records:
+            if record[0] in seen:
+                continue
+            seen.add(record[0])
+            fresh.append(record)
+        duplicates = len(records) - len(fresh)
 
-        count = 0
-        file_path = Path(file_path)
+        existing: Dict[str, Optional[str]] = {}
+        cursor = self.conn.cursor()
+        for batch in self._chunks([record[0] for record in fresh]):
+            placeholders = ','.join('?' * len(batch))
+            cursor.execute(
+                f"SELECT word, content_hash FROM idioms WHERE word IN ({placeholders})",
+                batch
+            )
+            existing.update((row['word'], row['content_hash'])
+                            for row in cursor.fetchall())
 
-        if not file_path.exists():
-            logger.error(f"文件不存在: {file_path}")
+        new_records, updates, unchanged = [], [], 0
+        for word, explanation, example, difficulty, frequency in fresh:
+            if word not in existing:
+                new_records.append((word, explanation, example, difficulty, frequency))
+                continue
+            digest = record_hash(explanation, example, difficulty, frequency)
+            if existing[word] == digest:
+                unchanged += 1
+            else:
+                updates.append((explanation, example, difficulty, frequency,
+                                digest, word))
+        return new_records, updates, unchanged, duplicates
+
+    def bulk_import(self, records: Iterable[IdiomRecord],
+                    chunk_size: int = 1000,
+                    word_length: Optional[int] = None,
+                    incremental: bool = False) -> ImportResult:
+        """
+        批量导入成语
+
+        按块计算拼音，每块用 executemany 在单个事务内写入。
+        增量模式下先按内容哈希比对：未变化的记录直接跳过（不计算拼音），
+        解释等内容有变化的记录原地更新。
+
+        Args:
+            records: 导入记录，格式：(成语, 解释, 例句, 难度, 频率)
+            chunk_size: 每个事务写入的记录数
+            word_length: 限定成语字数，None表示不限制
+            incremental: 是否增量导入（更新已存在但内容变化的成语）
+
+        Returns:
+            导入结果统计
+
+        Raises:
+            DatabaseException: 写入失败或数据库以只读模式打开
+        """
+        self._check_writable()
+        result = ImportResult()
+        records = iter(records)
+        seen: Set[str] = set()
+
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+
+            pending = []
+            for word, explanation, example, difficulty, frequency in chunk:
+                word = word.strip() if word else ""
+                if not word or (word_length and len(word) != word_length):
+                    result.skipped += 1
+                    continue
+                pending.append((word, explanation, example, difficulty, frequency))
+
+            if not pending:
+                continue
+
+            updates = []
+            if incremental:
+                pending, updates, unchanged, duplicates = self._diff_records(pending, seen)
+                result.unchanged += unchanged
+                result.duplicates += duplicates
+
+            rows = [idiom_row(build_idiom(*record)) for record in pending]
+            inserted = 0
+            try:
+                with self._connections.write() as conn:
+                    if rows:
+                        cursor = conn.executemany(INSERT_IDIOM_SQL, rows)
+                        inserted = cursor.rowcount
+                    if updates:
+                        conn.executemany("""
+                            UPDATE idioms
+                            SET explanation = ?, example = ?, difficulty = ?,
+                                frequency = ?, content_hash = ?
+                            WHERE word = ?
+                        """, updates)
+            except Exception as e:
+                logger.error(f"批量导入成语失败: {str(e)}")
+                raise DatabaseException(f"批量导入成语失败: {str(e)}")
+
+            result.inserted += inserted
+            result.duplicates += len(rows) - inserted
+            result.updated += len(updates)
+
+        self.refresh_after_import(result)
+
+        logger.info(f"批量导入完成: 新增 {result.inserted}，更新 {result.updated}，"
+                    f"未变化 {result.unchanged}，跳过 {result.skipped}，"
+                    f"重复 {result.duplicates}")
+        return result
+
+    def insert_rows(self, rows: List[tuple]) -> int:
+        """
+        在单个事务内写入已生成的成语行
+
+        供多进程导入使用：拼音在工作进程中计算，写入统一由调用线程完成。
+        全部写完后需调用 refresh_after_import 刷新内存结构。
+
+        Args:
+            rows: idiom_row 生成的插入行
+
+        Returns:
+            新增数量（已存在的成语被忽略）
+
+        Raises:
+            DatabaseException: 写入失败或数据库以只读模式打开
+        """
+        self._check_writable()
+        if not rows:
             return 0
+        try:
+            with self._connections.write() as conn:
+                inserted = conn.executemany(INSERT_IDIOM_SQL, rows).rowcount
+                if inserted:
+                    self.data_version += 1
+                return inserted
+        except Exception as e:
+            logger.error(f"批量写入成语失败: {str(e)}")
+            raise DatabaseException(f"批量写入成语失败: {str(e)}")
+
+    def refresh_after_import(self, result: ImportResult) -> None:
+        """
+        导入后刷新接龙索引、随机抽样缓存和布隆过滤器
+
+        Args:
+            result: 导入结果统计
+        """
+        if result.inserted or result.updated:
+            self.data_version += 1
+            self.refresh_chain_index()
+            self._random_ids = None
+        if result.inserted and self.bloom_filter is not None:
+            self.enable_bloom_filter(self.bloom_filter.fp_rate, self._bloom_capacity)
+
+    def import_source(self, source: str, records: Iterable[IdiomRecord],
+                      checksum: str, chunk_size: int = 1000,
+                      word_length: Optional[int] = None) -> ImportResult:
+        """
+        按来源增量导入成语
+
+        来源校验和与上次导入一致时直接跳过，否则只处理新增或变化的记录，
+        完成后记录本次校验和。
+
+        Args:
+            source: 来源标识（如文件路径）
+            records: 导入记录
+            checksum: 来源内容的校验和
+            chunk_size: 每个事务写入的记录数
+            word_length: 限定成语字数，None表示不限制
+
+        Returns:
+            导入结果统计
 
+        Raises:
+            DatabaseException: 写入失败或数据库以只读模式打开
+        """
+        self._check_writable()
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT checksum, row_count FROM import_sources WHERE source = ?",
+            (source,)
+        )
+        row = cursor.fetchone()
+        if row and row['checksum'] == checksum:
+            logger.info(f"来源未变化，跳过导入: {source}")
+            return ImportResult(unchanged=row['row_count'])
+
+        result = self.bulk_import(records, chunk_size, word_length, incremental=True)
         try:
+            with self._connections.write() as conn:
+                conn.execute("""
+                    INSERT INTO import_sources (source, checksum, row_count)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(source) DO UPDATE SET
+                        checksum = excluded.checksum,
+                        row_count = excluded.row_count,
+                        imported_at = CURRENT_TIMESTAMP
+                """, (source, checksum, result.total - result.skipped))
+        except Exception as e:
+            logger.error(f"记录导入来源失败: {str(e)}")
+            raise DatabaseException(f"记录导入来源失败: {str(e)}")
+        return result
+
+    def import_file(self, file_path: str, chunk_size: int = 1000) -> ImportResult:
+        """
+        从文件增量导入成语
+
+        Args:
+            file_path: 文件路径，每行一个成语，格式：成语,拼音,解释,例句
+            chunk_size: 每个事务写入的记录数
+
+        Returns:
+            导入结果统计
+
+        Raises:
+            DatabaseException: 文件不存在或导入失败
+        """
+        file_path = Path(file_path)
+
+        if not file_path.exists():
+            raise DatabaseException(f"文件不存在: {file_path}")
+
+        def read_records():
             with open(file_path, 'r', encoding='utf-8') as f:
                 for line in f:
                     line = line.strip()
@@ -347,44 +1340,95 @@ class IdiomDatabase:
                         continue
 
                     parts = line.split(',', 3)
-                    if len(parts) < 1:
-                        continue
+                    yield (
+                        parts[0],
+                        parts[2].strip() if len(parts) > 2 else None,
+                        parts[3].strip() if len(parts) > 3 else None,
+                        1,
+                        0.0
+                    )
 
-                    word = parts[0].strip()
-                    if len(word) != 4:
-                        continue
+        return self.import_source(
+            str(file_path.resolve()), read_records(), file_checksum(file_path),
+            chunk_size, word_length=4
+        )
 
-                    # 生成拼音
-                    pinyin = PinyinUtils.get_pinyin(word, style='tone')
-                    first_char = word[0]
-                    last_char = word[-1]
-                    first_pinyin = PinyinUtils.get_first_char_pinyin(first_char)
-                    last_pinyin = PinyinUtils.get_first_char_pinyin(last_char)
-
-                    idiom = Idiom(
-                        word=word,
-                        pinyin=pinyin,
-                        first_char=first_char,
-                        last_char=last_char,
-                        first_pinyin=first_pinyin,
-                        last_pinyin=last_pinyin,
-                        explanation=parts[2].strip() if len(parts) > 2 else None,
-                        example=parts[3].strip() if len(parts) > 3 else None,
-                        difficulty=1,
-                        frequency=0.0
-                    )
+    def load_from_file(self, file_path: str, chunk_size: int = 1000) -> int:
+        """
+        从文件批量导入成语（增量，文件未变化时直接跳过）
+
+        Args:
+            file_path: 文件路径，每行一个成语，格式：成语,拼音,解释,例句
+            chunk_size: 每个事务写入的记录数
 
-                    if self.add_idiom(idiom):
-                        count += 1
+        Returns:
+            新增成语数量
 
-            logger.info(f"成功导入 {count} 个成语")
-            return count
+        Raises:
+            DatabaseException: 数据库以只读模式打开
+        """
+        self._check_writable()
+        try:
+            result = self.import_file(file_path, chunk_size)
+            logger.info(f"成功导入 {result.inserted} 个成语，更新 {result.updated} 个")
+            return result.inserted
         except Exception as e:
             logger.error(f"导入成语失败: {str(e)}")
             return 0
 
+    def freeze(self) -> None:
+        """
+        为只读发布准备词库文件
+
+        同步构建全部派生数据，更新查询统计，把WAL内容写回主文件并切换为
+        DELETE日志模式，使词库成为可以用只读模式打开的单个文件。
+
+        Raises:
+            DatabaseException: 数据库以只读模式打开或整理失败
+        """
+        self._check_writable()
+        self.derived.wait()
+        self.derived.build_all()
+        try:
+            with self._connections.write() as conn:
+                conn.execute("ANALYZE")
+            conn = self.conn
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("PRAGMA journal_mode = DELETE")
+        except sqlite3.Error as e:
+            logger.error(f"整理词库失败: {str(e)}")
+            raise DatabaseException(f"整理词库失败: {str(e)}")
+        logger.info(f"词库已整理为只读发布格式: {self.db_path}")
+
+    def start_backup(self, interval: Optional[float] = None,
+                     **options) -> BackupManager:
+        """
+        在后台线程中启动在线备份
+
+        Args:
+            interval: 重复备份的间隔（秒），None表示只备份一次
+            **options: 传递给 BackupManager 的参数（backup_dir、keep、
+                       pages_per_step、step_sleep）
+
+        Returns:
+            备份管理器
+
+        Raises:
+            DatabaseException: 数据库以只读模式打开（不可变的词库无需备份）
+        """
+        self._check_writable()
+        if self.backup_manager is None:
+            self.backup_manager = BackupManager(self.db_path, **options)
+        self.backup_manager.start(interval)
+        return self.backup_manager
+
     def close(self) -> None:
         """关闭数据库连接"""
-        if self.conn:
-            self.conn.close()
+        if self.backup_manager is not None:
+            self.backup_manager.stop()
+            self.backup_manager = None
+        if self.derived is not None:
+            self.derived.wait()
+        if self._connections:
+            self._connections.close_all()
             logger.info("数据库连接已关闭")
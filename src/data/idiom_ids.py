@@ -0,0 +1,232 @@
+"""
+成语稠密编号与已用成语位集
+加载词库时为每个成语分配 0..n-1 的整数编号，游戏状态按编号用位集记录已用成语
+"""
+
+from collections.abc import MutableSet
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Set
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix(idiom_id: int) -> int:
+    """splitmix64：把编号散列为64位值，异或累加得到集合的增量哈希"""
+    z = (idiom_id + 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+class IdiomIds:
+    """成语稠密编号表（只增不减，编号在进程内保持稳定）"""
+
+    def __init__(self, words: Iterable[str] = ()):
+        """
+        创建编号表
+
+        Args:
+            words: 初始成语，按顺序编号
+        """
+        self.words: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self.extend(words)
+
+    def extend(self, words: Iterable[str]) -> int:
+        """
+        为新成语追加编号（已有编号的成语跳过，词库删除的成语保留编号）
+
+        Args:
+            words: 成语
+
+        Returns:
+            新增的编号数
+        """
+        ids = self._ids
+        added = 0
+        for word in words:
+            if word not in ids:
+                ids[word] = len(self.words)
+                self.words.append(word)
+                added += 1
+        return added
+
+    def id_of(self, word: str) -> Optional[int]:
+        """
+        获取成语编号
+
+        Args:
+            word: 成语
+
+        Returns:
+            编号，不在表中时返回None
+        """
+        return self._ids.get(word)
+
+    def word_of(self, idiom_id: int) -> str:
+        """
+        获取编号对应的成语
+
+        Args:
+            idiom_id: 编号
+
+        Returns:
+            成语
+        """
+        return self.words[idiom_id]
+
+    def __contains__(self, word: object) -> bool:
+        return word in self._ids
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+
+class UsedIdioms(MutableSet):
+    """
+    已用成语集合：编号表内的成语记在 bytearray 位集中，表外的成语（如大模型验证通过的）记在字符串集合中
+
+    成员判断按编号直接取位；复制只需复制位集字节（词库3万条约4KB）和出场顺序；
+    迭代按出场顺序（表内、表外成语统一排列），可与普通 set 一样做成员判断、迭代和比较。
+    """
+
+    __slots__ = ('ids', 'bits', 'order', 'extra', 'zobrist')
+
+    def __init__(self, ids: Optional[IdiomIds] = None, words: Iterable[str] = ()):
+        """
+        创建已用成语集合
+
+        Args:
+            ids: 编号表，None表示全部按字符串记录
+            words: 初始成语
+        """
+        self.ids = ids
+        self.bits = bytearray((len(ids) + 7) // 8 if ids is not None else 0)
+        # 全部成语的出场顺序
+        self.order: List[str] = []
+        self.extra: Set[str] = set()
+        # 位集内编号的增量哈希
+        self.zobrist = 0
+        for word in words:
+            self.add(word)
+
+    def _id(self, word: object) -> Optional[int]:
+        return self.ids.id_of(word) if self.ids is not None else None
+
+    def contains_id(self, idiom_id: int) -> bool:
+        """
+        按编号判断成语是否已用
+
+        Args:
+            idiom_id: 编号
+
+        Returns:
+            是否已用
+        """
+        index = idiom_id >> 3
+        return index < len(self.bits) and bool(self.bits[index] >> (idiom_id & 7) & 1)
+
+    def __contains__(self, word: object) -> bool:
+        if self.ids is not None:
+            idiom_id = self.ids.id_of(word)
+            if idiom_id is not None:
+                index = idiom_id >> 3
+                if index < len(self.bits) and self.bits[index] >> (idiom_id & 7) & 1:
+                    return True
+        # 成语可能在加入集合之后才进入编号表
+        return bool(self.extra) and word in self.extra
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.order)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def add(self, word: str) -> None:
+        if word in self:
+            return
+        self.order.append(word)
+        idiom_id = self._id(word)
+        if idiom_id is None:
+            self.extra.add(word)
+            return
+        index = idiom_id >> 3
+        if index >= len(self.bits):
+            # 编号表在集合创建后有追加
+            self.bits.extend(bytes(index + 1 - len(self.bits)))
+        self.bits[index] |= 1 << (idiom_id & 7)
+        self.zobrist ^= _mix(idiom_id)
+
+    def discard(self, word: str) -> None:
+        idiom_id = self._id(word)
+        if idiom_id is not None and self.contains_id(idiom_id):
+            self.bits[idiom_id >> 3] &= ~(1 << (idiom_id & 7)) & 0xFF
+            self.zobrist ^= _mix(idiom_id)
+        elif word in self.extra:
+            self.extra.discard(word)
+        else:
+            return
+        self.order.remove(word)
+
+    def clear(self) -> None:
+        self.bits[:] = bytes(len(self.bits))
+        self.order.clear()
+        self.extra.clear()
+        self.zobrist = 0
+
+    def copy(self) -> 'UsedIdioms':
+        """
+        复制集合（共享编号表，复制位集、出场顺序和表外成语）
+
+        Returns:
+            新集合
+        """
+        other = UsedIdioms.__new__(UsedIdioms)
+        other.ids = self.ids
+        other.bits = self.bits[:]
+        other.order = self.order[:]
+        other.extra = set(self.extra) if self.extra else set()
+        other.zobrist = self.zobrist
+        return other
+
+    def key(self) -> 'UsedKey':
+        """
+        可哈希的集合快照（与出场顺序无关），用于置换表、去重等
+
+        Returns:
+            集合快照
+        """
+        return UsedKey(self.zobrist, bytes(self.bits), frozenset(self.extra))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, UsedIdioms) and other.ids is self.ids:
+            return self.key() == other.key()
+        return super().__eq__(other)
+
+    __hash__ = None  # 可变集合不可哈希，请使用 key()
+
+    def __repr__(self) -> str:
+        return f"UsedIdioms({set(self)!r})"
+
+
+class UsedKey:
+    """已用成语集合的不可变快照：哈希取增量哈希（常数时间），相等比较逐字节精确比较"""
+
+    __slots__ = ('zobrist', 'bits', 'extra')
+
+    def __init__(self, zobrist: int, bits: bytes, extra: FrozenSet[str]):
+        self.zobrist = zobrist
+        self.bits = bits
+        self.extra = extra
+
+    def __hash__(self) -> int:
+        return hash((self.zobrist, self.extra)) if self.extra else hash(self.zobrist)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, UsedKey):
+            return NotImplemented
+        if self.zobrist != other.zobrist or self.extra != other.extra:
+            return False
+        if len(self.bits) == len(other.bits):
+            return self.bits == other.bits
+        # 编号表追加后创建的集合位集更长，多出的部分均为空字节
+        return self.bits.rstrip(b'\0') == other.bits.rstrip(b'\0')
@@ -3,22 +3,61 @@
 提供高级数据访问接口
 """
 
-from typing import List, Optional
+from typing import Callable, Dict, Hashable, Iterator, List, Optional
+from src.data.chain_graph import ChainGraph
 from src.data.database import IdiomDatabase
-from src.data.models import Idiom
+from src.data.idiom_ids import IdiomIds
+from src.data.models import Idiom, IdiomPage
+from src.data.query_cache import QueryCache
+from src.utils.pinyin import PinyinUtils
 
 
 class IdiomRepository:
     """成语数据仓库类"""
 
-    def __init__(self, database: IdiomDatabase):
+    def __init__(self, database: IdiomDatabase, cache_size: int = 1024,
+                 cache_ttl: Optional[float] = None):
         """
         初始化仓库
 
         Args:
             database: 数据库实例
+            cache_size: 查询缓存容量，0表示不缓存
+            cache_ttl: 缓存条目存活时间（秒），None表示不过期
         """
         self.database = database
+        self.cache: Optional[QueryCache] = (
+            QueryCache(cache_size, cache_ttl) if cache_size > 0 else None
+        )
+        self._cache_version = database.data_version
+        self._graph: Optional[ChainGraph] = None
+        self._graph_version = None
+
+    def _cached(self, key: Hashable, loader: Callable):
+        """
+        经缓存执行查询；数据库有写入（版本变化）时先清空缓存
+
+        缓存的成语对象不可变，列表结果以元组保存，取出时复制为新列表。
+        """
+        if self.cache is None:
+            return loader()
+        version = self.database.data_version
+        if version != self._cache_version:
+            self.cache.clear()
+            self._cache_version = version
+        return self.cache.get_or_load(key, loader)
+
+    def _cached_list(self, key: Hashable, loader: Callable) -> List[Idiom]:
+        return list(self._cached(key, lambda: tuple(loader())))
+
+    def get_cache_stats(self) -> Optional[Dict[str, float]]:
+        """
+        获取查询缓存统计（命中、未命中、淘汰等）
+
+        Returns:
+            统计字典，未启用缓存时返回None
+        """
+        return self.cache.stats() if self.cache is not None else None
 
     def find_by_word(self, word: str) -> Optional[Idiom]:
         """
@@ -30,7 +69,8 @@ class IdiomRepository:
         Returns:
             成语对象或None
         """
-        return self.database.get_idiom_by_name(word)
+        return self._cached(('word', word),
+                            lambda: self.database.get_idiom_by_name(word))
 
     def find_by_starting_char(self, char: str) -> List[Idiom]:
         """
@@ -42,7 +82,21 @@ class IdiomRepository:
         Returns:
             成语列表
         """
-        return self.database.get_idioms_by_starting_char(char)
+        return self._cached_list(('char', char),
+                                 lambda: self.database.get_idioms_by_starting_char(char))
+
+    def find_by_starting_sound(self, sound: str) -> List[Idiom]:
+        """
+        根据首字读音（无声调拼音）查找成语
+
+        Args:
+            sound: 无声调拼音
+
+        Returns:
+            成语列表
+        """
+        return self._cached_list(('sound', sound),
+                                 lambda: self.database.get_idioms_by_starting_sound(sound))
 
     def find_random(self, difficulty: int = None) -> Optional[Idiom]:
         """
@@ -56,17 +110,41 @@ class IdiomRepository:
         """
         return self.database.get_random_idiom(difficulty)
 
-    def search(self, keyword: str, limit: int = 10) -> List[Idiom]:
+    def find_random_start(self, difficulty: int = None,
+                          attempts: int = 8) -> Optional[Idiom]:
+        """
+        随机获取适合作为起始的成语：尾字不是死路字，开局就能接下去
+
+        Args:
+            difficulty: 难度筛选
+            attempts: 最多抽取的次数，都不合适时返回最后一次的结果
+
+        Returns:
+            成语对象或None
+        """
+        graph = self.get_chain_graph()
+        idiom = None
+        for _ in range(attempts):
+            idiom = self.find_random(difficulty)
+            if idiom is None or not graph.is_sink(idiom.last_char):
+                break
+        return idiom
+
+    def search(self, keyword: str, limit: int = 10,
+               full_text: bool = False) -> List[Idiom]:
         """
         搜索成语
 
         Args:
             keyword: 关键词
             limit: 数量限制
+            full_text: 是否同时搜索解释和例句（按相关度排序）
 
         Returns:
             成语列表
         """
+        if full_text:
+            return self.database.search_full_text(keyword, limit)
         return self.database.search_idioms(keyword, limit)
 
     def exists(self, word: str) -> bool:
@@ -79,7 +157,41 @@ class IdiomRepository:
         Returns:
             是否存在
         """
-        return self.database.is_valid_idiom(word)
+        return self._cached(('exists', word),
+                            lambda: self.database.is_valid_idiom(word))
+
+    def exists_many(self, words: List[str]) -> List[bool]:
+        """
+        批量检查成语是否存在
+
+        Args:
+            words: 成语列表
+
+        Returns:
+            与输入顺序一致的存在标志列表
+        """
+        return self.database.exists_many(words)
+
+    def find_many(self, words: List[str]) -> List[Optional[Idiom]]:
+        """
+        批量查找成语
+
+        Args:
+            words: 成语列表
+
+        Returns:
+            与输入顺序一致的成语列表，不存在的位置为None
+        """
+        return self.database.get_many(words)
+
+    def get_idiom_ids(self) -> IdiomIds:
+        """
+        获取成语稠密编号表（游戏状态用它以位集记录已用成语）
+
+        Returns:
+            编号表
+        """
+        return self.database.get_idiom_ids()
 
     def get_count(self) -> int:
         """
@@ -90,38 +202,163 @@ class IdiomRepository:
         """
         return self.database.get_total_count()
 
+    def get_chain_graph(self) -> ChainGraph:
+        """
+        获取字级接龙图（首次使用时从磁盘缓存加载或构建，数据库有写入后重新加载）
+
+        Returns:
+            接龙图
+        """
+        version = self.database.data_version
+        if self._graph is None or version != self._graph_version:
+            self._graph = ChainGraph.load_or_build(self.database)
+            self._graph_version = version
+        return self._graph
+
+    def _follower_key(self, last_char: str, allow_homophone: bool):
+        """接龙查询键：(首字或无声调拼音, 是否按读音匹配)"""
+        if allow_homophone:
+            sound = PinyinUtils.get_first_char_pinyin_without_tone(last_char)
+            if sound:
+                return sound, True
+        return last_char, False
+
+    def find_unused_followers(self, last_char: str, exclude: set = None,
+                              limit: Optional[int] = None,
+                              allow_homophone: bool = False) -> List[Idiom]:
+        """
+        按接龙顺序查找未使用的接龙成语，只取需要的数量
+
+        Args:
+            last_char: 上一个成语的尾字
+            exclude: 要排除的成语集合
+            limit: 最多返回的数量，None表示全部
+            allow_homophone: 是否允许同音字
+
+        Returns:
+            成语列表
+        """
+        key, by_sound = self._follower_key(last_char, allow_homophone)
+        return self.database.get_unused_followers(key, exclude, limit, by_sound)
+
+    def find_unused_follower_words(self, last_char: str, exclude: set = None,
+                                   limit: Optional[int] = None,
+                                   allow_homophone: bool = False) -> List[str]:
+        """
+        按接龙顺序查找未使用的接龙成语词语（只查词语，供接龙判断使用）
+
+        Args:
+            last_char: 上一个成语的尾字
+            exclude: 要排除的成语集合
+            limit: 最多返回的数量，None表示全部
+            allow_homophone: 是否允许同音字
+
+        Returns:
+            成语词语列表
+        """
+        key, by_sound = self._follower_key(last_char, allow_homophone)
+        return self.database.get_unused_follower_words(key, exclude, limit, by_sound)
+
+    def find_followers_page(self, last_char: str, cursor: Optional[str] = None,
+                            page_size: int = 50, allow_homophone: bool = False,
+                            words_only: bool = False) -> IdiomPage:
+        """
+        分页查找接龙成语（不经缓存）
+
+        Args:
+            last_char: 上一个成语的尾字
+            cursor: 上一页返回的游标，None表示第一页
+            page_size: 每页数量
+            allow_homophone: 是否允许同音字
+            words_only: 是否只返回词语
+
+        Returns:
+            分页结果
+        """
+        key, by_sound = self._follower_key(last_char, allow_homophone)
+        return self.database.get_followers_page(key, cursor, page_size,
+                                                by_sound, words_only)
+
+    def iter_followers(self, last_char: str, page_size: int = 100,
+                       allow_homophone: bool = False,
+                       words_only: bool = False) -> Iterator:
+        """
+        按接龙顺序逐页迭代接龙成语
+
+        Args:
+            last_char: 上一个成语的尾字
+            page_size: 每次读取的数量
+            allow_homophone: 是否允许同音字
+            words_only: 是否只返回词语
+
+        Returns:
+            成语（或词语）迭代器
+        """
+        key, by_sound = self._follower_key(last_char, allow_homophone)
+        return self.database.iter_followers(key, page_size, by_sound, words_only)
+
     def get_possible_following_idioms(self, last_char: str,
-                                       exclude: set = None) -> List[Idiom]:
+                                      exclude: set = None,
+                                      allow_homophone: bool = False) -> List[Idiom]:
         """
         获取可能的接龙成语
 
         Args:
             last_char: 上一个成语的尾字
             exclude: 要排除的成语集合
+            allow_homophone: 是否允许同音字
 
         Returns:
             可用的成语列表
         """
-        idioms = self.find_by_starting_char(last_char)
-        if exclude:
-            idioms = [idiom for idiom in idioms if idiom.word not in exclude]
-        return idioms
+        return self.find_unused_followers(last_char, exclude,
+                                          allow_homophone=allow_homophone)
+
+    def count_followers(self, last_char: str) -> int:
+        """
+        获取以指定字开头的成语数量（读取物化统计，不加载成语）
+
+        Args:
+            last_char: 上一个成语的尾字
+
+        Returns:
+            成语数量
+        """
+        return self.database.get_follower_count(last_char)
 
-    def has_possible_following(self, last_char: str, exclude: set = None) -> bool:
+    def has_possible_following(self, last_char: str, exclude: set = None,
+                               allow_homophone: bool = False,
+                               used_count: Optional[int] = None) -> bool:
         """
         检查是否有可接龙的成语
 
+        不允许同音字时只比较数量：接龙总数减去已用掉的接龙数。
+
         Args:
             last_char: 上一个成语的尾字
             exclude: 要排除的成语集合
+            allow_homophone: 是否允许同音字
+            used_count: 调用方已知的、以该字开头且已使用的成语数，
+                        None表示从exclude中统计
 
         Returns:
             是否有可接龙的成语
         """
-        return len(self.get_possible_following_idioms(last_char, exclude)) > 0
+        if allow_homophone:
+            return bool(self.find_unused_follower_words(last_char, exclude, limit=1,
+                                                        allow_homophone=True))
+
+        total = self.count_followers(last_char)
+        if not exclude or total > len(exclude):
+            return total > 0
+        if used_count is None:
+            candidates = [word for word in exclude if word[:1] == last_char]
+            used_count = sum(self.exists_many(candidates)) if candidates else 0
+        return total - used_count > 0
 
     def get_hints(self, starting_char: str, count: int = 3,
-                  exclude: set = None) -> List[str]:
+                  exclude: set = None,
+                  allow_homophone: bool = False) -> List[str]:
         """
         获取提示成语
 
@@ -129,11 +366,11 @@ class IdiomRepository:
             starting_char: 起始字
             count: 提示数量
             exclude: 要排除的成语集合
+            allow_homophone: 是否允许同音字
 
         Returns:
             提示成语列表
         """
-        idioms = self.find_by_starting_char(starting_char)
-        if exclude:
-            idioms = [idiom for idiom in idioms if idiom.word not in exclude]
-        return [idiom.word for idiom in idioms[:count]]
+        return self.find_unused_follower_words(
+            starting_char, exclude, limit=count, allow_homophone=allow_homophone
+        )
@@ -0,0 +1,256 @@
+"""
+流式成语导入
+逐行读取CSV/TSV/JSONL文件，拼音计算分块交给进程池，写入由单个线程批量完成
+"""
+
+import os
+import csv
+import json
+import time
+import logging
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import chain, islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+from src.data.database import IdiomDatabase, IdiomRecord, build_idiom, idiom_row
+from src.data.models import ImportResult
+from src.utils.exceptions import DatabaseException
+
+
+logger = logging.getLogger(__name__)
+
+# 文件后缀 -> 格式
+FORMATS = {
+    '.csv': 'csv',
+    '.tsv': 'tsv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+}
+
+
+def _to_record(values: dict) -> IdiomRecord:
+    """
+    将按字段名取值的字典转换为导入记录
+
+    字段：word、explanation、example、difficulty、frequency（除word外均可省略）
+
+    Raises:
+        ValueError: 难度或频率不是数字
+        AttributeError: 取值对象不是字典（如JSON行不是对象）
+    """
+    return (
+        values.get('word') or '',
+        values.get('explanation') or None,
+        values.get('example') or None,
+        int(values.get('difficulty') or 1),
+        float(values.get('frequency') or 0.0),
+    )
+
+
+def _skip_row(line_no: int, error: Exception, result: Optional[ImportResult]) -> None:
+    """记录一行解析失败（计入跳过数）"""
+    logger.warning(f"第 {line_no} 行解析失败，已跳过: {str(error)}")
+    if result is not None:
+        result.skipped += 1
+
+
+def _read_delimited(f, delimiter: str,
+                    result: Optional[ImportResult] = None) -> Iterator[IdiomRecord]:
+    """
+    读取分隔符文件
+
+    首行包含 word 列时按表头取值，否则按 成语,拼音,解释,例句 的位置取值
+    （与 IdiomDatabase.load_from_file 的文本格式一致）。
+    按表头取值时难度、频率无法解析的行会被跳过。
+    """
+    reader = csv.reader(f, delimiter=delimiter)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    if 'word' in header:
+        for row in reader:
+            if not row:
+                continue
+            try:
+                record = _to_record(dict(zip(header, row)))
+            except ValueError as e:
+                _skip_row(reader.line_num, e, result)
+                continue
+            yield record
+        return
+
+    for row in chain([header], reader):
+        if not row:
+            continue
+        yield (
+            row[0],
+            (row[2].strip() or None) if len(row) > 2 else None,
+            (row[3].strip() or None) if len(row) > 3 else None,
+            1,
+            0.0
+        )
+
+
+def read_records(path: Union[str, Path], fmt: Optional[str] = None,
+                 result: Optional[ImportResult] = None) -> Iterator[IdiomRecord]:
+    """
+    逐行读取成语文件（生成器，内存占用与文件大小无关）
+
+    无法解析的行记录警告后跳过，不会中断读取。
+
+    Args:
+        path: 文件路径
+        fmt: 文件格式（csv、tsv、jsonl），None表示按后缀判断
+        result: 导入结果统计，无法解析的行计入其 skipped，None表示不统计
+
+    Yields:
+        导入记录：(成语, 解释, 例句, 难度, 频率)
+
+    Raises:
+        DatabaseException: 文件不存在或格式不支持
+    """
+    path = Path(path)
+    fmt = fmt or FORMATS.get(path.suffix.lower())
+    if fmt not in FORMATS.values():
+        raise DatabaseException(f"不支持的文件格式: {path}")
+    if not path.exists():
+        raise DatabaseException(f"文件不存在: {path}")
+
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if fmt == 'jsonl':
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = _to_record(json.loads(line))
+                except (ValueError, AttributeError) as e:
+                    _skip_row(line_no, e, result)
+                    continue
+                yield record
+        else:
+            yield from _read_delimited(f, ',' if fmt == 'csv' else '\t', result)
+
+
+def derive_rows(records: List[IdiomRecord],
+                word_length: Optional[int] = None) -> Tuple[List[tuple], int]:
+    """
+    计算一块记录的拼音与首尾字，生成插入行（在工作进程中执行）
+
+    Args:
+        records: 导入记录
+        word_length: 限定成语字数，None表示不限制
+
+    Returns:
+        (插入行列表, 无效而跳过的数量)
+    """
+    rows = []
+    skipped = 0
+    for word, explanation, example, difficulty, frequency in records:
+        word = word.strip() if word else ""
+        if not word or (word_length and len(word) != word_length):
+            skipped += 1
+            continue
+        rows.append(idiom_row(build_idiom(word, explanation, example,
+                                          difficulty, frequency)))
+    return rows, skipped
+
+
+class StreamingImporter:
+    """流式多进程导入器类"""
+
+    def __init__(self, database: IdiomDatabase, workers: Optional[int] = None,
+                 chunk_size: int = 2000, max_pending: Optional[int] = None,
+                 progress: Optional[Callable[[ImportResult], None]] = None):
+        """
+        初始化导入器
+
+        Args:
+            database: 数据库实例
+            workers: 工作进程数，None表示CPU核数，0或1表示在当前进程内计算
+            chunk_size: 每块记录数（也是每个写事务的行数）
+            max_pending: 同时在途的块数上限，None表示工作进程数的2倍
+            progress: 每写完一块后的回调，参数为累计结果
+        """
+        self.database = database
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.chunk_size = max(int(chunk_size), 1)
+        self.max_pending = max_pending or max(self.workers, 1) * 2
+        self.progress = progress
+
+    def _chunks(self, records: Iterable[IdiomRecord]) -> Iterator[List[IdiomRecord]]:
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _write(self, result: ImportResult, rows: List[tuple], skipped: int) -> None:
+        """单线程写入一块并更新统计"""
+        inserted = self.database.insert_rows(rows)
+        result.inserted += inserted
+        result.duplicates += len(rows) - inserted
+        result.skipped += skipped
+        if self.progress:
+            self.progress(result)
+
+    def _run_pool(self, executor: Executor, chunks: Iterator[List[IdiomRecord]],
+                  word_length: Optional[int], result: ImportResult) -> None:
+        """按顺序提交块，在途块数不超过 max_pending，保证内存有界"""
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(derive_rows, chunk, word_length))
+            if len(pending) >= self.max_pending:
+                self._write(result, *pending.popleft().result())
+        while pending:
+            self._write(result, *pending.popleft().result())
+
+    def run(self, records: Iterable[IdiomRecord], word_length: Optional[int] = None,
+            result: Optional[ImportResult] = None) -> ImportResult:
+        """
+        导入记录流
+
+        Args:
+            records: 导入记录（可以是生成器）
+            word_length: 限定成语字数，None表示不限制
+            result: 累加统计的导入结果（读取阶段跳过的行已计入），None表示新建
+
+        Returns:
+            导入结果统计（含耗时）
+        """
+        if result is None:
+            result = ImportResult()
+        start = time.perf_counter()
+        chunks = self._chunks(records)
+
+        if self.workers <= 1:
+            for chunk in chunks:
+                self._write(result, *derive_rows(chunk, word_length))
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                self._run_pool(executor, chunks, word_length, result)
+
+        result.elapsed = time.perf_counter() - start
+        self.database.refresh_after_import(result)
+        logger.info(f"流式导入完成: 新增 {result.inserted}，跳过 {result.skipped}，"
+                    f"重复 {result.duplicates}，{result.rows_per_second:.0f} 行/秒")
+        return result
+
+    def import_file(self, path: Union[str, Path], fmt: Optional[str] = None,
+                    word_length: Optional[int] = None) -> ImportResult:
+        """
+        流式导入文件
+
+        Args:
+            path: 文件路径
+            fmt: 文件格式（csv、tsv、jsonl），None表示按后缀判断
+            word_length: 限定成语字数，None表示不限制
+
+        Returns:
+            导入结果统计
+        """
+        result = ImportResult()
+        return self.run(read_records(path, fmt, result), word_length, result)
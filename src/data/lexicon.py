@@ -0,0 +1,181 @@
+"""
+紧凑词库存储
+按列（struct-of-arrays）保存整个词库，解释和例句按需从数据库加载
+"""
+
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+from src.data.models import Idiom
+
+
+# 根据成语行id加载 (解释, 例句)
+DetailsLoader = Callable[[int], Tuple[Optional[str], Optional[str]]]
+
+
+class LexiconStore:
+    """紧凑词库存储类"""
+
+    def __init__(self, details_loader: Optional[DetailsLoader] = None):
+        """
+        初始化空存储
+
+        Args:
+            details_loader: 解释/例句加载函数，None表示不可加载
+        """
+        self.details_loader = details_loader
+        self.row_ids = array('q')
+        self.words: List[str] = []
+        self.pinyins: List[str] = []
+        self.first_chars: List[str] = []
+        self.last_chars: List[str] = []
+        self.first_pinyins: List[str] = []
+        self.last_pinyins: List[str] = []
+        self.difficulties = array('b')
+        self.frequencies = array('d')
+        # 单字与单字拼音重复度很高，统一复用同一个字符串对象
+        self._interned: Dict[str, str] = {}
+        # 成语 -> 存储内下标
+        self._positions: Dict[str, int] = {}
+
+    def _intern(self, text: str) -> str:
+        return self._interned.setdefault(text, text)
+
+    def append(self, row_id: int, word: str, pinyin: str,
+               first_char: str, last_char: str,
+               first_pinyin: str, last_pinyin: str,
+               difficulty: int, frequency: float) -> 'IdiomView':
+        """
+        追加一个成语
+
+        Returns:
+            新成语的视图
+        """
+        self._positions[word] = len(self.words)
+        self.row_ids.append(row_id)
+        self.words.append(word)
+        self.pinyins.append(pinyin)
+        self.first_chars.append(self._intern(first_char))
+        self.last_chars.append(self._intern(last_char))
+        self.first_pinyins.append(self._intern(first_pinyin))
+        self.last_pinyins.append(self._intern(last_pinyin))
+        self.difficulties.append(difficulty)
+        self.frequencies.append(frequency)
+        return IdiomView(self, len(self.words) - 1)
+
+    def index_of(self, word: str) -> Optional[int]:
+        """
+        查找成语在存储内的下标
+
+        Args:
+            word: 成语
+
+        Returns:
+            下标，不存在返回None
+        """
+        return self._positions.get(word)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._positions
+
+    def load_details(self, index: int) -> Tuple[Optional[str], Optional[str]]:
+        """
+        加载指定成语的解释和例句
+
+        Args:
+            index: 存储内下标
+
+        Returns:
+            (解释, 例句)
+        """
+        if self.details_loader is None:
+            return None, None
+        return self.details_loader(self.row_ids[index])
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+
+class IdiomView:
+    """
+    词库中单个成语的只读视图
+
+    与 Idiom 拥有相同的属性，可在只读取成语字段的地方直接替代 Idiom。
+    """
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: LexiconStore, index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def word(self) -> str:
+        return self._store.words[self._index]
+
+    @property
+    def pinyin(self) -> str:
+        return self._store.pinyins[self._index]
+
+    @property
+    def first_char(self) -> str:
+        return self._store.first_chars[self._index]
+
+    @property
+    def last_char(self) -> str:
+        return self._store.last_chars[self._index]
+
+    @property
+    def first_pinyin(self) -> str:
+        return self._store.first_pinyins[self._index]
+
+    @property
+    def last_pinyin(self) -> str:
+        return self._store.last_pinyins[self._index]
+
+    @property
+    def difficulty(self) -> int:
+        return self._store.difficulties[self._index]
+
+    @property
+    def frequency(self) -> float:
+        return self._store.frequencies[self._index]
+
+    @property
+    def explanation(self) -> Optional[str]:
+        return self._store.load_details(self._index)[0]
+
+    @property
+    def example(self) -> Optional[str]:
+        return self._store.load_details(self._index)[1]
+
+    def to_idiom(self) -> Idiom:
+        """
+        转换为完整的成语对象（会加载解释和例句）
+
+        Returns:
+            成语对象
+        """
+        explanation, example = self._store.load_details(self._index)
+        return Idiom(
+            word=self.word,
+            pinyin=self.pinyin,
+            first_char=self.first_char,
+            last_char=self.last_char,
+            first_pinyin=self.first_pinyin,
+            last_pinyin=self.last_pinyin,
+            explanation=explanation,
+            example=example,
+            difficulty=self.difficulty,
+            frequency=self.frequency
+        )
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, IdiomView):
+            return self._store is other._store and self._index == other._index
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.word)
+
+    def __repr__(self) -> str:
+        return f"IdiomView(word='{self.word}', pinyin='{self.pinyin}')"
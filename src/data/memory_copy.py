@@ -0,0 +1,157 @@
+"""
+内存词库副本
+启动时用 sqlite3 备份接口把词库文件整体复制到内存数据库，查询不再访问磁盘；
+可选把写入在同一事务内同步回磁盘文件（write-through）
+"""
+
+import time
+import sqlite3
+import logging
+from pathlib import Path
+from typing import Union
+from urllib.parse import quote
+from src.data.migrations import migrate
+from src.data.models import MemoryLoadResult
+from src.utils.exceptions import DatabaseException
+
+
+logger = logging.getLogger(__name__)
+
+# write-through 时磁盘库的附加名
+DISK_SCHEMA = 'disk'
+
+# 同步到磁盘的成语列（与 INSERT_IDIOM_SQL 一致）
+_IDIOM_COLUMNS = (
+    'word', 'pinyin', 'first_char', 'last_char', 'first_pinyin', 'last_pinyin',
+    'first_pinyin_plain', 'last_pinyin_plain', 'explanation', 'example',
+    'difficulty', 'frequency', 'content_hash',
+)
+_SOURCE_COLUMNS = ('source', 'checksum', 'row_count', 'imported_at')
+
+
+def load_into_memory(source_path: Union[str, Path], memory: sqlite3.Connection,
+                     immutable: bool = False) -> MemoryLoadResult:
+    """
+    将词库文件复制到内存数据库连接
+
+    Args:
+        source_path: 词库文件路径
+        memory: 空的内存数据库连接
+        immutable: 是否以不可变方式打开源文件（只读发布的词库）
+
+    Returns:
+        复制结果
+
+    Raises:
+        DatabaseException: 复制失败
+    """
+    path = Path(source_path)
+    uri = f"file:{quote(path.resolve().as_posix())}?mode=ro"
+    if immutable:
+        uri += "&immutable=1"
+
+    start = time.perf_counter()
+    try:
+        source = sqlite3.connect(uri, uri=True)
+        try:
+            # 内存库的页大小必须与源库一致才能接收备份
+            page_size = source.execute("PRAGMA page_size").fetchone()[0]
+            memory.execute(f"PRAGMA page_size = {int(page_size):d}")
+            source.backup(memory)
+        finally:
+            source.close()
+        pages = memory.execute("PRAGMA page_count").fetchone()[0]
+    except sqlite3.Error as e:
+        logger.error(f"加载内存词库失败: {str(e)}")
+        raise DatabaseException(f"加载内存词库失败: {str(e)}")
+
+    result = MemoryLoadResult(
+        source=str(path),
+        pages=pages,
+        bytes=pages * page_size,
+        duration=time.perf_counter() - start
+    )
+    logger.info(f"词库已复制到内存: {path}（{result.bytes / 1024 / 1024:.1f} MB，"
+                f"耗时 {result.duration * 1000:.1f} ms）")
+    return result
+
+
+def prepare_disk(path: Union[str, Path]) -> None:
+    """
+    将磁盘词库迁移到最新结构（write-through 要求两边的列一致），文件不存在时创建
+
+    Args:
+        path: 词库文件路径
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        migrate(conn)
+    finally:
+        conn.close()
+
+
+def attach_write_through(memory: sqlite3.Connection, path: Union[str, Path]) -> None:
+    """
+    附加磁盘词库，并用临时触发器记录内存库中变化的成语和导入来源
+
+    触发器体内不能写其他库的表，所以只记录变化的键，
+    由 flush_write_through 在同一事务提交前同步到磁盘库。
+
+    Args:
+        memory: 内存数据库连接（已迁移到最新结构）
+        path: 磁盘词库文件路径（已由 prepare_disk 迁移）
+    """
+    memory.execute(f"ATTACH DATABASE ? AS {DISK_SCHEMA}", (str(path),))
+    memory.execute("""
+        CREATE TEMP TABLE write_through_log (
+            tbl TEXT NOT NULL,
+            key TEXT NOT NULL,
+            PRIMARY KEY (tbl, key)
+        ) WITHOUT ROWID
+    """)
+    for table, key in (('idioms', 'word'), ('import_sources', 'source')):
+        for event, row in (('INSERT', 'new'), ('UPDATE', 'new'), ('DELETE', 'old')):
+            memory.execute(f"""
+                CREATE TEMP TRIGGER write_through_{table}_{event.lower()}
+                AFTER {event} ON main.{table} BEGIN
+                    INSERT OR IGNORE INTO write_through_log (tbl, key)
+                    VALUES ('{table}', {row}.{key});
+                END
+            """)
+    memory.commit()
+    logger.info(f"内存词库的写入将同步到: {path}")
+
+
+def flush_write_through(conn: sqlite3.Connection) -> None:
+    """
+    把记录的变化同步到磁盘库（在写事务提交前调用，与内存写入一同提交或回滚）
+
+    在内存库中已不存在的键从磁盘删除，其余按当前内容插入或更新；
+    磁盘库上已有的触发器（接龙数量、全文索引）照常维护。
+
+    Args:
+        conn: 已附加磁盘库的内存数据库连接
+    """
+    if conn.execute("SELECT 1 FROM temp.write_through_log LIMIT 1").fetchone() is None:
+        return
+
+    for table, key, columns in (('idioms', 'word', _IDIOM_COLUMNS),
+                                ('import_sources', 'source', _SOURCE_COLUMNS)):
+        changed = f"SELECT key FROM temp.write_through_log WHERE tbl = '{table}'"
+        conn.execute(f"""
+            DELETE FROM {DISK_SCHEMA}.{table}
+            WHERE {key} IN ({changed})
+              AND {key} NOT IN (SELECT {key} FROM main.{table})
+        """)
+        names = ", ".join(columns)
+        updates = ", ".join(f"{column} = excluded.{column}"
+                            for column in columns if column != key)
+        conn.execute(f"""
+            INSERT INTO {DISK_SCHEMA}.{table} ({names})
+            SELECT {names} FROM main.{table} WHERE {key} IN ({changed})
+            ON CONFLICT({key}) DO UPDATE SET {updates}
+        """)
+    conn.execute("DELETE FROM temp.write_through_log")
@@ -0,0 +1,416 @@
+"""
+数据库结构迁移
+按 PRAGMA user_version 记录的版本依次执行迁移；
+无声调拼音是同音查询正确性的前提，打开数据库时同步补齐；
+耗时的派生数据（接龙数量、全文索引）在首次使用时于后台构建
+"""
+
+import sqlite3
+import logging
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Set
+from src.data.connection import ConnectionManager
+
+
+logger = logging.getLogger(__name__)
+
+
+class Migration(NamedTuple):
+    """单个迁移：目标版本、说明、执行函数"""
+
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Cursor], None]
+
+
+def _columns(cursor: sqlite3.Cursor, table: str) -> Set[str]:
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in cursor.fetchall()}
+
+
+def _v1_base_schema(cursor: sqlite3.Cursor) -> None:
+    """成语表及基础索引"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS idioms (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word TEXT NOT NULL UNIQUE,
+            pinyin TEXT NOT NULL,
+            first_char TEXT NOT NULL,
+            last_char TEXT NOT NULL,
+            first_pinyin TEXT NOT NULL,
+            last_pinyin TEXT NOT NULL,
+            explanation TEXT,
+            example TEXT,
+            difficulty INTEGER DEFAULT 1,
+            frequency REAL DEFAULT 0.0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    for column in ('first_char', 'last_char', 'first_pinyin',
+                   'last_pinyin', 'difficulty'):
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_{column} ON idioms({column})
+        """)
+
+
+def _v2_plain_pinyin(cursor: sqlite3.Cursor) -> None:
+    """无声调拼音列（同音接龙），旧行的值由派生构建补齐"""
+    columns = _columns(cursor, 'idioms')
+    for column in ('first_pinyin_plain', 'last_pinyin_plain'):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE idioms ADD COLUMN {column} TEXT")
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_{column} ON idioms({column})
+        """)
+
+
+def _v3_char_stats(cursor: sqlite3.Cursor) -> None:
+    """按首字统计的接龙数量表，由触发器增量维护，初始值由派生构建填充"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS char_stats (
+            first_char TEXT PRIMARY KEY,
+            follower_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS char_stats_insert
+        AFTER INSERT ON idioms BEGIN
+            INSERT INTO char_stats(first_char, follower_count)
+            VALUES (new.first_char, 1)
+            ON CONFLICT(first_char)
+            DO UPDATE SET follower_count = follower_count + 1;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS char_stats_delete
+        AFTER DELETE ON idioms BEGIN
+            UPDATE char_stats SET follower_count = follower_count - 1
+            WHERE first_char = old.first_char;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS char_stats_update
+        AFTER UPDATE OF first_char ON idioms BEGIN
+            UPDATE char_stats SET follower_count = follower_count - 1
+            WHERE first_char = old.first_char;
+            INSERT INTO char_stats(first_char, follower_count)
+            VALUES (new.first_char, 1)
+            ON CONFLICT(first_char)
+            DO UPDATE SET follower_count = follower_count + 1;
+        END
+    """)
+
+
+def _v4_import_tracking(cursor: sqlite3.Cursor) -> None:
+    """增量导入用的内容哈希列和来源校验和表"""
+    if 'content_hash' not in _columns(cursor, 'idioms'):
+        cursor.execute("ALTER TABLE idioms ADD COLUMN content_hash TEXT")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS import_sources (
+            source TEXT PRIMARY KEY,
+            checksum TEXT NOT NULL,
+            row_count INTEGER NOT NULL DEFAULT 0,
+            imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def _v5_derived_state(cursor: sqlite3.Cursor) -> None:
+    """派生数据构建状态表"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS derived_state (
+            name TEXT PRIMARY KEY,
+            built_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def _v6_chain_indexes(cursor: sqlite3.Cursor) -> None:
+    """
+    接龙查询的覆盖索引
+
+    按 (键, frequency DESC, difficulty, word) 建索引后，接龙查询可直接按索引顺序
+    读取，不再需要临时B树排序；只取成语词语的查询无需回表。单列索引是其前缀，删除。
+    """
+    for column in ('first_char', 'first_pinyin_plain'):
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_chain_{column}
+            ON idioms({column}, frequency DESC, difficulty, word)
+        """)
+        cursor.execute(f"DROP INDEX IF EXISTS idx_{column}")
+
+
+# 迁移只追加不修改；每个迁移需要能在旧版本（user_version=0）的已有库上安全执行
+MIGRATIONS: List[Migration] = [
+    Migration(1, "成语表及基础索引", _v1_base_schema),
+    Migration(2, "无声调拼音列", _v2_plain_pinyin),
+    Migration(3, "接龙数量表", _v3_char_stats),
+    Migration(4, "增量导入记录", _v4_import_tracking),
+    Migration(5, "派生数据状态表", _v5_derived_state),
+    Migration(6, "接龙覆盖索引", _v6_chain_indexes),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """
+    读取数据库的结构版本
+
+    Args:
+        conn: 数据库连接
+
+    Returns:
+        PRAGMA user_version 的值
+    """
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection,
+            migrations: Optional[List[Migration]] = None) -> List[int]:
+    """
+    依次执行未应用的迁移，每个迁移与版本号更新在同一事务内提交
+
+    Args:
+        conn: 数据库连接（不能处于事务中）
+        migrations: 迁移列表，None表示 MIGRATIONS
+
+    Returns:
+        本次执行的迁移版本列表
+
+    Raises:
+        sqlite3.Error: 迁移失败（该迁移已回滚）
+    """
+    migrations = MIGRATIONS if migrations is None else migrations
+    current = get_schema_version(conn)
+    if current > migrations[-1].version:
+        logger.warning(f"数据库结构版本 {current} 高于程序支持的 "
+                       f"{migrations[-1].version}，跳过迁移")
+        return []
+
+    applied = []
+    for migration in migrations:
+        if migration.version <= current:
+            continue
+        cursor = conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            migration.apply(cursor)
+            cursor.execute(f"PRAGMA user_version = {migration.version:d}")
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        applied.append(migration.version)
+        logger.info(f"数据库迁移 v{migration.version}: {migration.description}")
+    return applied
+
+
+def build_plain_pinyin(connections: ConnectionManager, chunk_size: int = 2000) -> None:
+    """补齐旧行的无声调拼音，分块提交以免长时间持有写锁"""
+    from src.utils.pinyin import PinyinUtils
+
+    plain = PinyinUtils.get_first_char_pinyin_without_tone
+    total = 0
+    while True:
+        with connections.write() as conn:
+            rows = conn.execute("""
+                SELECT id, first_char, last_char FROM idioms
+                WHERE first_pinyin_plain IS NULL OR last_pinyin_plain IS NULL
+                LIMIT ?
+            """, (chunk_size,)).fetchall()
+            if not rows:
+                break
+            conn.executemany("""
+                UPDATE idioms SET first_pinyin_plain = ?, last_pinyin_plain = ?
+                WHERE id = ?
+            """, [(plain(row['first_char']), plain(row['last_char']), row['id'])
+                  for row in rows])
+        total += len(rows)
+    if total:
+        logger.info(f"已补齐 {total} 个成语的无声调拼音")
+
+
+def build_char_stats(connections: ConnectionManager) -> None:
+    """按成语表重新统计每个首字的接龙数量"""
+    with connections.write() as conn:
+        conn.execute("DELETE FROM char_stats")
+        conn.execute("""
+            INSERT INTO char_stats(first_char, follower_count)
+            SELECT first_char, COUNT(*) FROM idioms GROUP BY first_char
+        """)
+
+
+def build_fts(connections: ConnectionManager) -> None:
+    """创建全文索引虚表和同步触发器并从成语表重建（需要SQLite支持FTS5 trigram）"""
+    with connections.write() as conn:
+        conn.execute("BEGIN")
+        # trigram分词按3字切分，适用于不含空格的中文文本
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS idioms_fts USING fts5(
+                word, explanation, example,
+                content='idioms', content_rowid='id',
+                tokenize='trigram'
+            )
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS idioms_fts_insert
+            AFTER INSERT ON idioms BEGIN
+                INSERT INTO idioms_fts(rowid, word, explanation, example)
+                VALUES (new.id, new.word, new.explanation, new.example);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS idioms_fts_delete
+            AFTER DELETE ON idioms BEGIN
+                INSERT INTO idioms_fts(idioms_fts, rowid, word,
+                                       explanation, example)
+                VALUES ('delete', old.id, old.word,
+                        old.explanation, old.example);
+            END
+        """)
+        # 只在被索引的列变化时同步，避免维护派生列时重写全文索引
+        conn.execute("DROP TRIGGER IF EXISTS idioms_fts_update")
+        conn.execute("""
+            CREATE TRIGGER idioms_fts_update
+            AFTER UPDATE OF word, explanation, example ON idioms BEGIN
+                INSERT INTO idioms_fts(idioms_fts, rowid, word,
+                                       explanation, example)
+                VALUES ('delete', old.id, old.word,
+                        old.explanation, old.example);
+                INSERT INTO idioms_fts(rowid, word, explanation, example)
+                VALUES (new.id, new.word, new.explanation, new.example);
+            END
+        """)
+        conn.execute("INSERT INTO idioms_fts(idioms_fts) VALUES ('rebuild')")
+
+
+# 派生数据名 -> 构建函数
+DERIVED_BUILDERS: Dict[str, Callable[[ConnectionManager], None]] = {
+    'plain_pinyin': build_plain_pinyin,
+    'char_stats': build_char_stats,
+    'fts': build_fts,
+}
+
+
+# 查询结果依赖的派生数据：构建前基础表无法给出正确结果，补齐开销也很小，
+# 打开数据库时同步构建，不在后台构建
+REQUIRED_DERIVED = ('plain_pinyin',)
+
+
+class DerivedTables:
+    """派生数据管理类：首次使用时构建，构建完成前调用方退回基础表"""
+
+    def __init__(self, connections: ConnectionManager,
+                 builders: Optional[Dict[str, Callable[[ConnectionManager], None]]] = None,
+                 background: bool = True, read_only: bool = False,
+                 on_ready: Optional[Callable[[str], None]] = None):
+        """
+        初始化并读取已构建的派生数据
+
+        Args:
+            connections: 连接管理器
+            builders: 派生数据名 -> 构建函数，None表示 DERIVED_BUILDERS
+            background: 是否在后台线程中构建
+            read_only: 只读数据库：只使用已构建的派生数据，不再构建
+            on_ready: 派生数据构建完成后的回调，参数为派生数据名（可能在后台线程中调用）
+        """
+        self._connections = connections
+        self._builders = DERIVED_BUILDERS if builders is None else builders
+        self.background = background
+        self.read_only = read_only
+        self.on_ready = on_ready
+        self._lock = threading.Lock()
+        self._ready: Set[str] = set()
+        self._failed: Set[str] = set()
+        self._building: Set[str] = set()
+        self._threads: List[threading.Thread] = []
+
+        try:
+            cursor = connections.get().execute("SELECT name FROM derived_state")
+            self._ready.update(row[0] for row in cursor.fetchall())
+        except sqlite3.OperationalError:
+            # 未迁移到 v5 的只读库没有状态表，视为均未构建
+            if not read_only:
+                raise
+
+    def is_ready(self, name: str) -> bool:
+        """派生数据是否已构建"""
+        return name in self._ready
+
+    def ensure(self, name: str) -> bool:
+        """
+        确保派生数据可用：未构建时启动构建（后台模式下立即返回，REQUIRED_DERIVED 除外）
+
+        Args:
+            name: 派生数据名
+
+        Returns:
+            当前是否可用
+        """
+        if name in self._ready or self.read_only:
+            return name in self._ready
+        with self._lock:
+            if name in self._ready or name in self._failed or name in self._building:
+                return name in self._ready
+            self._building.add(name)
+            if self.background and name not in REQUIRED_DERIVED:
+                thread = threading.Thread(target=self.build, args=(name,),
+                                          name=f'derived-{name}', daemon=True)
+                self._threads.append(thread)
+                thread.start()
+                return False
+        self.build(name)
+        return name in self._ready
+
+    def build(self, name: str) -> None:
+        """
+        立即构建派生数据并记录状态
+
+        Args:
+            name: 派生数据名
+        """
+        try:
+            self._builders[name](self._connections)
+            with self._connections.write() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO derived_state (name) VALUES (?)", (name,)
+                )
+            self._ready.add(name)
+            logger.info(f"派生数据构建完成: {name}")
+            if self.on_ready:
+                self.on_ready(name)
+        except sqlite3.Error as e:
+            self._failed.add(name)
+            logger.warning(f"派生数据构建失败，继续使用基础表: {name}: {str(e)}")
+        finally:
+            self._building.discard(name)
+
+    def build_required(self) -> None:
+        """同步构建查询正确性依赖的派生数据（REQUIRED_DERIVED）"""
+        for name in REQUIRED_DERIVED:
+            if name in self._builders:
+                self.ensure(name)
+
+    def build_all(self) -> None:
+        """同步构建全部未构建的派生数据"""
+        if self.read_only:
+            return
+        for name in self._builders:
+            if name not in self._ready and name not in self._failed:
+                self.build(name)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待后台构建结束
+
+        Args:
+            timeout: 每个线程的等待超时（秒），None表示一直等待
+
+        Returns:
+            是否全部结束
+        """
+        threads = list(self._threads)
+        for thread in threads:
+            thread.join(timeout)
+        return not any(thread.is_alive() for thread in threads)
@@ -2,13 +2,15 @@
 数据模型定义
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Hashable, List, Optional
+from src.data.idiom_ids import IdiomIds, UsedIdioms
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Idiom:
-    """成语数据模型"""
+    """成语数据模型（不可变，可安全地在缓存中共享；使用__slots__更紧凑）"""
 
     word: str  # 成语
     pinyin: str  # 拼音
@@ -36,6 +38,91 @@ class ValidationResult:
         return f"ValidationResult(is_valid={self.is_valid}, message='{self.message}')"
 
 
+@dataclass
+class ImportResult:
+    """批量导入结果数据模型"""
+
+    inserted: int = 0  # 新增数量
+    skipped: int = 0  # 无效而跳过的数量
+    duplicates: int = 0  # 已存在或重复的数量
+    updated: int = 0  # 内容变化而原地更新的数量（增量导入）
+    unchanged: int = 0  # 内容未变化的数量（增量导入）
+    elapsed: float = 0.0  # 耗时（秒），流式导入时记录
+
+    @property
+    def total(self) -> int:
+        """处理的记录总数"""
+        return (self.inserted + self.skipped + self.duplicates +
+                self.updated + self.unchanged)
+
+    @property
+    def rows_per_second(self) -> float:
+        """处理速度（行/秒）"""
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self) -> str:
+        return (f"ImportResult(inserted={self.inserted}, "
+                f"updated={self.updated}, "
+                f"unchanged={self.unchanged}, "
+                f"skipped={self.skipped}, "
+                f"duplicates={self.duplicates})")
+
+
+@dataclass
+class BackupResult:
+    """数据库备份结果数据模型"""
+
+    path: str  # 备份文件路径
+    pages: int  # 复制的页数
+    steps: int  # 分步次数
+    duration: float  # 总耗时（秒）
+    max_lock_time: float  # 单步最长持锁时间（秒）
+
+    def __repr__(self) -> str:
+        return (f"BackupResult(path='{self.path}', pages={self.pages}, "
+                f"duration={self.duration:.3f}, "
+                f"max_lock_time={self.max_lock_time:.4f})")
+
+
+@dataclass
+class MemoryLoadResult:
+    """内存词库加载结果数据模型"""
+
+    source: str  # 源文件路径
+    pages: int  # 复制的页数
+    bytes: int  # 内存副本大小（字节）
+    duration: float  # 复制耗时（秒）
+
+
+@dataclass
+class SearchResult:
+    """搜索AI单步结果数据模型"""
+
+    word: Optional[str]  # 选出的成语，无子可走时为None
+    score: int  # 走子方视角的评分
+    depth: int  # 完成的搜索深度
+    nodes: int  # 搜索的节点数
+    duration: float  # 耗时（秒）
+    proven: bool = False  # 评分是否为已证明的胜负
+
+    @property
+    def nodes_per_second(self) -> float:
+        """每秒搜索的节点数"""
+        return self.nodes / self.duration if self.duration > 0 else 0.0
+
+
+@dataclass
+class IdiomPage:
+    """接龙分页查询结果数据模型"""
+
+    items: List = field(default_factory=list)  # 本页成语（或词语）
+    cursor: Optional[str] = None  # 下一页游标，None表示已是最后一页
+
+    @property
+    def has_more(self) -> bool:
+        return self.cursor is not None
+
+
 @dataclass
 class GameConfig:
     """游戏配置数据模型"""
@@ -44,12 +131,15 @@ class GameConfig:
     time_limit: int = 60  # 秒
     allow_homophone: bool = False  # 是否允许同音字
     max_hints: int = 3  # 最大提示次数
+    ai_strategy: str = "llm"  # llm（大模型出招）, search（本地博弈树搜索）
+    search_time: float = 1.0  # 搜索AI每步的时间预算（秒）
 
     def __repr__(self) -> str:
         return (f"GameConfig(difficulty='{self.difficulty}', "
                 f"time_limit={self.time_limit}, "
                 f"allow_homophone={self.allow_homophone}, "
-                f"max_hints={self.max_hints})")
+                f"max_hints={self.max_hints}, "
+                f"ai_strategy='{self.ai_strategy}')")
 
 
 @dataclass
@@ -75,16 +165,24 @@ class GameState:
 
     current_round: int  # 当前回合数
     last_idiom: Optional[str]  # 上一个成语
-    used_idioms: set  # 已使用的成语集合
+    used_idioms: UsedIdioms  # 已使用的成语集合（位集，可当作字符串集合使用）
+    used_first_chars: Counter  # 已使用成语按首字的计数
     player_hints_remaining: int  # 玩家剩余提示次数
     is_player_turn: bool  # 是否玩家回合
     game_started: bool  # 游戏是否已开始
     game_over: bool  # 游戏是否结束
 
-    def __init__(self):
+    def __init__(self, ids: Optional[IdiomIds] = None):
+        """
+        创建游戏状态
+
+        Args:
+            ids: 成语编号表，None表示已用成语全部按字符串记录
+        """
         self.current_round = 0
         self.last_idiom = None
-        self.used_idioms = set()
+        self.used_idioms = UsedIdioms(ids)
+        self.used_first_chars = Counter()
         self.player_hints_remaining = 3
         self.is_player_turn = True
         self.game_started = False
@@ -92,6 +190,8 @@ class GameState:
 
     def add_idiom(self, idiom: str) -> None:
         """添加已使用的成语"""
+        if idiom not in self.used_idioms:
+            self.used_first_chars[idiom[:1]] += 1
         self.used_idioms.add(idiom)
         self.last_idiom = idiom
 
@@ -106,7 +206,35 @@ class GameState:
         self.current_round = 0
         self.last_idiom = None
         self.used_idioms.clear()
+        self.used_first_chars.clear()
         self.player_hints_remaining = 3
         self.is_player_turn = True
         self.game_started = False
         self.game_over = False
+
+    def copy(self) -> 'GameState':
+        """
+        复制游戏状态（复制位集字节与出场顺序，不复制成语字符串，供搜索和模拟使用）
+
+        Returns:
+            新的游戏状态
+        """
+        other = GameState.__new__(GameState)
+        other.current_round = self.current_round
+        other.last_idiom = self.last_idiom
+        other.used_idioms = self.used_idioms.copy()
+        other.used_first_chars = Counter(self.used_first_chars)
+        other.player_hints_remaining = self.player_hints_remaining
+        other.is_player_turn = self.is_player_turn
+        other.game_started = self.game_started
+        other.game_over = self.game_over
+        return other
+
+    def key(self) -> Hashable:
+        """
+        局面的哈希键（尾成语、走子方和已用成语）
+
+        Returns:
+            可哈希的键
+        """
+        return self.last_idiom, self.is_player_turn, self.used_idioms.key()
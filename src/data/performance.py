@@ -0,0 +1,169 @@
+"""
+SQLite性能配置
+按命名预设（desktop、server、low-memory）在连接时设置 PRAGMA，可在配置中逐项覆盖
+"""
+
+import sqlite3
+import logging
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, Mapping, Optional, Union
+
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_MODES = ('wal', 'delete', 'truncate', 'persist', 'memory', 'off')
+SYNCHRONOUS_MODES = ('off', 'normal', 'full', 'extra')
+TEMP_STORES = ('default', 'file', 'memory')
+
+
+@dataclass(frozen=True)
+class PerformanceProfile:
+    """SQLite性能配置数据模型"""
+
+    mmap_size: int = 64 * 1024 * 1024  # 内存映射读取的字节数，0表示不使用
+    cache_size: int = -16000  # 页缓存，负数表示KiB，正数表示页数
+    journal_mode: str = 'wal'  # 日志模式（内存数据库忽略）
+    synchronous: str = 'normal'  # 同步级别，WAL模式下normal不会损坏数据库
+    temp_store: str = 'memory'  # 临时表和排序的存放位置
+    page_size: int = 4096  # 页大小，只对新建的数据库生效
+
+    def __post_init__(self):
+        if self.journal_mode not in JOURNAL_MODES:
+            raise ValueError(f"不支持的日志模式: {self.journal_mode}")
+        if self.synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"不支持的同步级别: {self.synchronous}")
+        if self.temp_store not in TEMP_STORES:
+            raise ValueError(f"不支持的临时存储: {self.temp_store}")
+        if self.mmap_size < 0:
+            raise ValueError(f"mmap_size不能为负数: {self.mmap_size}")
+        if self.page_size < 512 or self.page_size > 65536 or \
+                self.page_size & (self.page_size - 1):
+            raise ValueError(f"页大小必须是512到65536之间的2的幂: {self.page_size}")
+
+    @classmethod
+    def from_config(cls, config: Union[None, str, Mapping[str, Any]]) -> 'PerformanceProfile':
+        """
+        根据配置创建性能配置
+
+        Args:
+            config: 预设名，或形如 {'preset': 'desktop', 'cache_size': -32000}
+                    的字典（未给出的项取预设值），None表示 desktop 预设
+
+        Returns:
+            性能配置
+
+        Raises:
+            ValueError: 预设名、配置项或取值无效
+        """
+        if config is None:
+            return PRESETS['desktop']
+        if isinstance(config, str):
+            config = {'preset': config}
+
+        preset = config.get('preset') or 'desktop'
+        if preset not in PRESETS:
+            raise ValueError(f"未知的性能预设: {preset}（可选: {', '.join(PRESETS)}）")
+
+        names = {f.name: f.type for f in fields(cls)}
+        overrides = {}
+        for key, value in config.items():
+            if key == 'preset' or value is None:
+                continue
+            if key not in names:
+                raise ValueError(f"未知的性能配置项: {key}")
+            overrides[key] = str(value).lower() if names[key] is str else int(value)
+        return replace(PRESETS[preset], **overrides)
+
+    def apply(self, conn: sqlite3.Connection, is_memory: bool = False,
+              read_only: bool = False) -> Dict[str, Any]:
+        """
+        在连接上设置 PRAGMA，并读回实际生效的值
+
+        page_size 只在数据库尚无内容时设置（须在切换WAL之前）；
+        只读连接不设置 page_size 和 journal_mode（二者都会写文件）。
+        实际值可能受SQLite编译选项限制（如 mmap_size 的上限）。
+
+        Args:
+            conn: 数据库连接
+            is_memory: 是否为内存数据库
+            read_only: 是否为只读连接
+
+        Returns:
+            各项实际生效的值
+        """
+        writable_file = not is_memory and not read_only
+        if not read_only and conn.execute("PRAGMA page_count").fetchone()[0] == 0:
+            conn.execute(f"PRAGMA page_size = {self.page_size:d}")
+        if writable_file:
+            conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        conn.execute(f"PRAGMA mmap_size = {self.mmap_size:d}")
+        conn.execute(f"PRAGMA cache_size = {self.cache_size:d}")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        conn.execute(f"PRAGMA temp_store = {self.temp_store}")
+        settings = read_settings(conn)
+        if writable_file and settings['journal_mode'] != self.journal_mode:
+            logger.warning(f"日志模式设置未生效: 期望 {self.journal_mode}，"
+                           f"实际 {settings['journal_mode']}")
+        return settings
+
+
+def read_settings(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """
+    读取连接当前的性能相关 PRAGMA
+
+    Args:
+        conn: 数据库连接
+
+    Returns:
+        配置项 -> 当前值（同步级别和临时存储转换为名称）
+    """
+    def pragma(name: str):
+        row = conn.execute(f"PRAGMA {name}").fetchone()
+        return row[0] if row else None
+
+    synchronous = pragma('synchronous')
+    temp_store = pragma('temp_store')
+    return {
+        'mmap_size': pragma('mmap_size'),
+        'cache_size': pragma('cache_size'),
+        'journal_mode': pragma('journal_mode'),
+        'synchronous': (SYNCHRONOUS_MODES[synchronous]
+                        if synchronous in range(len(SYNCHRONOUS_MODES)) else synchronous),
+        'temp_store': (TEMP_STORES[temp_store]
+                       if temp_store in range(len(TEMP_STORES)) else temp_store),
+        'page_size': pragma('page_size'),
+    }
+
+
+# 命名预设
+PRESETS: Dict[str, PerformanceProfile] = {
+    # 桌面客户端：中等缓存，读取走内存映射
+    'desktop': PerformanceProfile(),
+    # 服务器：更大的缓存和内存映射，页更大以减少大分组查询的页数
+    'server': PerformanceProfile(
+        mmap_size=256 * 1024 * 1024,
+        cache_size=-65536,
+        page_size=8192,
+    ),
+    # 低内存设备：小缓存，不使用内存映射，临时数据写文件
+    'low-memory': PerformanceProfile(
+        mmap_size=0,
+        cache_size=-2000,
+        temp_store='file',
+    ),
+}
+
+
+def format_settings(settings: Optional[Dict[str, Any]]) -> str:
+    """
+    将生效的配置格式化为一行日志文本
+
+    Args:
+        settings: read_settings 的结果
+
+    Returns:
+        形如 "mmap_size=67108864, cache_size=-16000, ..." 的文本
+    """
+    if not settings:
+        return ""
+    return ", ".join(f"{key}={value}" for key, value in settings.items())
@@ -0,0 +1,392 @@
+"""
+二进制词库快照
+将词库导出为带版本号和校验和的二进制文件，加载时通过mmap零拷贝访问
+
+文件布局（小端序）：
+    头部    魔数、版本、成语数、首字数、载荷CRC32
+    段表    每段的 (偏移, 长度)
+    各段    首字表、首字偏移、字符串表（偏移+数据）、尾字、难度、频率、按词排序的下标
+成语按 (首字, 频率降序, 难度升序, 成语) 排列，每个首字的成语在文件中连续存放。
+"""
+
+import sys
+import mmap
+import zlib
+import struct
+import logging
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+from src.utils.binary import array_to_bytes
+from src.utils.exceptions import DatabaseException
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b'CYLX'
+SNAPSHOT_VERSION = 1
+
+# 魔数, 版本, 保留, 成语数, 首字数, 载荷CRC32
+_HEADER = struct.Struct('<4sHHIII')
+_SECTION = struct.Struct('<QQ')
+
+_SECTIONS = (
+    'chars',               # u32 首字码点（升序）
+    'char_offsets',        # u32 每个首字的起始下标，末尾为总数
+    'word_offsets', 'word_blob',
+    'pinyin_offsets', 'pinyin_blob',
+    'first_pinyin_offsets', 'first_pinyin_blob',
+    'last_pinyin_offsets', 'last_pinyin_blob',
+    'last_chars',          # u32 尾字码点
+    'difficulties',        # u8
+    'frequencies',         # f64
+    'word_order',          # u32 按成语UTF-8字节序排列的下标
+    'row_ids',             # i64 数据库行id
+)
+_ALIGN = 8
+
+
+def snapshot_path_for(db_path: Union[str, Path]) -> Path:
+    """
+    获取数据库对应的默认快照路径（与数据库同目录）
+
+    Args:
+        db_path: 数据库文件路径
+
+    Returns:
+        快照文件路径
+    """
+    return Path(db_path).with_suffix('.lexicon')
+
+
+def _string_table(values: List[str]):
+    """将字符串列表编码为 (u32偏移数组, UTF-8数据)"""
+    offsets = array('I', [0])
+    blob = bytearray()
+    for value in values:
+        blob += value.encode('utf-8')
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+def export_snapshot(database, path: Union[str, Path]) -> int:
+    """
+    将数据库中的词库导出为二进制快照
+
+    Args:
+        database: IdiomDatabase 实例
+        path: 快照文件路径
+
+    Returns:
+        导出的成语数量
+    """
+    cursor = database.conn.cursor()
+    cursor.execute("""
+        SELECT id, word, pinyin, first_char, last_char,
+               first_pinyin, last_pinyin, difficulty, frequency
+        FROM idioms
+        ORDER BY first_char, frequency DESC, difficulty ASC, word ASC
+    """)
+    # TEXT默认按UTF-8字节排序，与码点顺序一致，首字表可直接二分查找
+    rows = cursor.fetchall()
+
+    chars = array('I')
+    char_offsets = array('I')
+    for index, row in enumerate(rows):
+        code = ord(row['first_char'])
+        if not chars or chars[-1] != code:
+            chars.append(code)
+            char_offsets.append(index)
+    char_offsets.append(len(rows))
+
+    words = [row['word'] for row in rows]
+    sections = {'chars': chars, 'char_offsets': char_offsets}
+    for name, values in (
+        ('word', words),
+        ('pinyin', [row['pinyin'] for row in rows]),
+        ('first_pinyin', [row['first_pinyin'] for row in rows]),
+        ('last_pinyin', [row['last_pinyin'] for row in rows]),
+    ):
+        sections[f'{name}_offsets'], sections[f'{name}_blob'] = _string_table(values)
+    sections['last_chars'] = array('I', (ord(row['last_char']) for row in rows))
+    sections['difficulties'] = array('B', (row['difficulty'] for row in rows))
+    sections['frequencies'] = array('d', (row['frequency'] for row in rows))
+    sections['word_order'] = array('I', sorted(
+        range(len(words)), key=lambda i: words[i].encode('utf-8')
+    ))
+    sections['row_ids'] = array('q', (row['id'] for row in rows))
+
+    header_size = _HEADER.size + _SECTION.size * len(_SECTIONS)
+    payload = bytearray()
+    table = []
+    for name in _SECTIONS:
+        data = array_to_bytes(sections[name])
+        payload += b'\0' * (-(header_size + len(payload)) % _ALIGN)
+        table.append((header_size + len(payload), len(data)))
+        payload += data
+
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0,
+                          len(rows), len(chars), zlib.crc32(payload))
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        for offset, length in table:
+            f.write(_SECTION.pack(offset, length))
+        f.write(payload)
+    tmp_path.replace(path)
+
+    logger.info(f"词库快照已导出: {path}（{len(rows)} 个成语）")
+    return len(rows)
+
+
+class SnapshotIdiom:
+    """快照中单个成语的只读视图，属性与 Idiom 一致（不含解释和例句）"""
+
+    __slots__ = ('_snapshot', '_index')
+
+    def __init__(self, snapshot: 'LexiconSnapshot', index: int):
+        self._snapshot = snapshot
+        self._index = index
+
+    @property
+    def word(self) -> str:
+        return self._snapshot._string('word', self._index)
+
+    @property
+    def pinyin(self) -> str:
+        return self._snapshot._string('pinyin', self._index)
+
+    @property
+    def first_char(self) -> str:
+        return self.word[0]
+
+    @property
+    def last_char(self) -> str:
+        return chr(self._snapshot._arrays['last_chars'][self._index])
+
+    @property
+    def first_pinyin(self) -> str:
+        return self._snapshot._string('first_pinyin', self._index)
+
+    @property
+    def last_pinyin(self) -> str:
+        return self._snapshot._string('last_pinyin', self._index)
+
+    @property
+    def difficulty(self) -> int:
+        return self._snapshot._arrays['difficulties'][self._index]
+
+    @property
+    def frequency(self) -> float:
+        return self._snapshot._arrays['frequencies'][self._index]
+
+    @property
+    def row_id(self) -> int:
+        return self._snapshot._arrays['row_ids'][self._index]
+
+    def __repr__(self) -> str:
+        return f"SnapshotIdiom(word='{self.word}', pinyin='{self.pinyin}')"
+
+
+class SnapshotBucket(Sequence):
+    """快照中一个首字的成语区间，按需生成视图"""
+
+    def __init__(self, snapshot: 'LexiconSnapshot', start: int, stop: int):
+        self._snapshot = snapshot
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return SnapshotIdiom(self._snapshot, self._start + index)
+
+    @property
+    def words(self) -> List[str]:
+        """区间内所有成语文本"""
+        return [self._snapshot._string('word', i)
+                for i in range(self._start, self._stop)]
+
+
+class LexiconSnapshot:
+    """mmap词库快照类"""
+
+    def __init__(self, path: Union[str, Path], verify: bool = False):
+        """
+        打开快照文件
+
+        默认只检查头部和段表，不读取整个载荷，打开耗时与文件大小无关；
+        完整的CRC32校验留给导出工具（或调用 verify）。
+
+        Args:
+            path: 快照文件路径
+            verify: 是否在打开时校验载荷CRC32
+
+        Raises:
+            DatabaseException: 文件不存在、格式或版本不符、校验失败
+        """
+        if sys.byteorder != 'little':
+            raise DatabaseException("词库快照仅支持小端序平台")
+
+        self.path = Path(path)
+        try:
+            self._file = open(self.path, 'rb')
+        except OSError as e:
+            raise DatabaseException(f"打开词库快照失败: {str(e)}")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            self._file.close()
+            raise DatabaseException(f"打开词库快照失败: {str(e)}")
+
+        self._view = memoryview(self._mmap)
+        try:
+            self._parse_header(verify)
+        except Exception:
+            self.close()
+            raise
+
+    def _parse_header(self, verify: bool) -> None:
+        """解析头部和段表，把各段映射为零拷贝数组"""
+        if len(self._mmap) < _HEADER.size:
+            raise DatabaseException("词库快照文件已损坏")
+
+        magic, version, _, count, char_count, crc = _HEADER.unpack_from(self._mmap)
+        if magic != SNAPSHOT_MAGIC:
+            raise DatabaseException("不是有效的词库快照文件")
+        if version != SNAPSHOT_VERSION:
+            raise DatabaseException(
+                f"词库快照版本不兼容: {version}（需要 {SNAPSHOT_VERSION}）"
+            )
+
+        self._crc = crc
+        self._payload_offset = _HEADER.size + _SECTION.size * len(_SECTIONS)
+        if len(self._mmap) < self._payload_offset:
+            raise DatabaseException("词库快照文件已损坏")
+        if verify:
+            self.verify()
+
+        typecodes = {
+            'chars': 'I', 'char_offsets': 'I', 'last_chars': 'I',
+            'difficulties': 'B', 'frequencies': 'd', 'word_order': 'I',
+            'row_ids': 'q',
+        }
+        self._arrays = {}
+        self._blobs = {}
+        for i, name in enumerate(_SECTIONS):
+            offset, length = _SECTION.unpack_from(
+                self._mmap, _HEADER.size + i * _SECTION.size
+            )
+            if offset + length > len(self._mmap):
+                raise DatabaseException("词库快照文件已损坏")
+            section = self._view[offset:offset + length]
+            if name.endswith('_blob'):
+                self._blobs[name[:-5]] = section
+            else:
+                self._arrays[name] = section.cast(typecodes.get(name, 'I'))
+
+        self.count = count
+        self.char_count = char_count
+
+    def verify(self) -> None:
+        """
+        校验整个载荷的CRC32（读取全部数据）
+
+        Raises:
+            DatabaseException: 校验失败
+        """
+        if zlib.crc32(self._view[self._payload_offset:]) != self._crc:
+            raise DatabaseException("词库快照校验失败")
+
+    def _string(self, name: str, index: int) -> str:
+        """读取字符串表中的第index项"""
+        offsets = self._arrays[f'{name}_offsets']
+        return str(self._blobs[name][offsets[index]:offsets[index + 1]], 'utf-8')
+
+    def _word_bytes(self, index: int) -> bytes:
+        offsets = self._arrays['word_offsets']
+        return bytes(self._blobs['word'][offsets[index]:offsets[index + 1]])
+
+    def find_by_starting_char(self, char: str) -> SnapshotBucket:
+        """
+        根据首字查找成语
+
+        Args:
+            char: 首字
+
+        Returns:
+            已按接龙顺序排列的成语区间
+        """
+        if not char:
+            return SnapshotBucket(self, 0, 0)
+        chars = self._arrays['chars']
+        code = ord(char[0])
+        pos = bisect_left(chars, code)
+        if pos == len(chars) or chars[pos] != code:
+            return SnapshotBucket(self, 0, 0)
+        offsets = self._arrays['char_offsets']
+        return SnapshotBucket(self, offsets[pos], offsets[pos + 1])
+
+    def _find_index(self, word: str) -> Optional[int]:
+        """二分查找成语在快照中的下标"""
+        target = word.encode('utf-8')
+        order = self._arrays['word_order']
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._word_bytes(order[mid]) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(order) and self._word_bytes(order[lo]) == target:
+            return order[lo]
+        return None
+
+    def exists(self, word: str) -> bool:
+        """
+        检查成语是否存在
+
+        Args:
+            word: 成语词语
+
+        Returns:
+            是否存在
+        """
+        return bool(word) and self._find_index(word) is not None
+
+    def find_by_word(self, word: str) -> Optional[SnapshotIdiom]:
+        """
+        根据词语查找成语
+
+        Args:
+            word: 成语词语
+
+        Returns:
+            成语视图或None
+        """
+        index = self._find_index(word) if word else None
+        return SnapshotIdiom(self, index) if index is not None else None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        """关闭快照文件"""
+        arrays = getattr(self, '_arrays', {})
+        for section in list(arrays.values()) + list(getattr(self, '_blobs', {}).values()):
+            section.release()
+        self._arrays = {}
+        self._blobs = {}
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
@@ -12,6 +12,7 @@ from PyQt6.QtGui import QFont, QKeyEvent
 
 from src.config.config_manager import ConfigManager
 from src.data.database import IdiomDatabase
+from src.data.idiom_repository import IdiomRepository
 from src.data.models import GameConfig, GameResult
 from src.ai.lmstudio_client import LMStudioClient
 from src.core.game_manager import GameManager
@@ -48,6 +49,13 @@ class GameScreen(QWidget):
         self.config_manager = config_manager
         self.database = database
         self.ai_client = ai_client
+        # 跨局共享的成语仓库（带查询缓存）
+        ttl = self.config_manager.get('database.query_cache.ttl', 0)
+        self.repository = IdiomRepository(
+            database,
+            cache_size=self.config_manager.get('database.query_cache.size', 1024),
+            cache_ttl=ttl or None
+        )
 
         # 初始化音效管理器
         self.sound_manager = SoundManager(parent=self)
@@ -167,7 +175,9 @@ class GameScreen(QWidget):
             difficulty=self.config_manager.get('game.difficulty', 'normal'),
             time_limit=self.config_manager.get('game.time_limit', 60),
             allow_homophone=self.config_manager.get('game.allow_homophone', False),
-            max_hints=self.config_manager.get('game.max_hints', 3)
+            max_hints=self.config_manager.get('game.max_hints', 3),
+            ai_strategy=self.config_manager.get('game.ai_strategy', 'llm'),
+            search_time=self.config_manager.get('game.search_time', 1.0)
         )
 
         # 保存游戏配置
@@ -178,7 +188,8 @@ class GameScreen(QWidget):
             game_config,
             self.database,
             self.ai_client,
-            use_llm_validator=True  # 使用LLM验证器，支持任意成语
+            use_llm_validator=True,  # 使用LLM验证器，支持任意成语
+            repository=self.repository
         )
 
         # 设置回调
@@ -254,7 +265,7 @@ class GameScreen(QWidget):
 
         # 尝试从数据库获取成语解释
         try:
-            idiom_data = self.database.get_idiom_by_word(idiom)
+            idiom_data = self.repository.find_by_word(idiom)
             if idiom_data:
                 card.set_explanation(
                     idiom_data.explanation,
@@ -0,0 +1,44 @@
+"""
+二进制文件工具
+词库快照、接龙图缓存等二进制文件中的数组统一按小端序存储
+"""
+
+import sys
+from array import array
+from typing import Union
+
+
+def array_to_bytes(data: Union[array, bytes]) -> bytes:
+    """
+    将数组按小端序转换为字节（字节串原样返回）
+
+    Args:
+        data: 数组或字节串
+
+    Returns:
+        小端序字节
+    """
+    if isinstance(data, array):
+        if sys.byteorder != 'little':
+            data = array(data.typecode, data)
+            data.byteswap()
+        return data.tobytes()
+    return data
+
+
+def array_from_bytes(typecode: str, data: bytes) -> array:
+    """
+    从小端序字节读取数组
+
+    Args:
+        typecode: 数组类型码
+        data: 小端序字节
+
+    Returns:
+        数组
+    """
+    result = array(typecode)
+    result.frombytes(data)
+    if sys.byteorder != 'little':
+        result.byteswap()
+    return result
@@ -3,6 +3,7 @@
 使用pypinyin库进行拼音转换
 """
 
+from functools import lru_cache
 from pypinyin import lazy_pinyin, Style
 
 
@@ -32,6 +33,7 @@ class PinyinUtils:
         return ''.join(pys)
 
     @staticmethod
+    @lru_cache(maxsize=8192)
     def get_first_char_pinyin(char: str) -> str:
         """
         获取首字拼音
@@ -48,6 +50,7 @@ class PinyinUtils:
         return pys[0] if pys else ""
 
     @staticmethod
+    @lru_cache(maxsize=8192)
     def get_first_char_pinyin_without_tone(char: str) -> str:
         """
         获取首字拼音（不带声调）
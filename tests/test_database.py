@@ -0,0 +1,1273 @@
+"""
+数据层单元测试
+"""
+
+import unittest
+import sys
+import time
+import dataclasses
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.models import Idiom
+from src.data.database import IdiomDatabase, build_idiom, follower_sql
+from src.data.migrations import SCHEMA_VERSION, get_schema_version, migrate
+from src.data.idiom_repository import IdiomRepository
+from src.data.snapshot import export_snapshot, LexiconSnapshot
+from src.data.bloom_filter import BloomFilter
+from src.data.chain_graph import ChainGraph, graph_path_for
+from src.data.backup import BackupManager
+from src.data.importer import StreamingImporter, read_records
+from src.data.query_cache import QueryCache
+from src.data.performance import PRESETS, PerformanceProfile
+from src.utils.exceptions import DatabaseException
+
+
+TEST_IDIOMS = [
+    Idiom("车水马龙", "chē shuǐ mǎ lóng", "车", "龙",
+          "chē", "lóng", "形容车马往来繁华热闹的景象", difficulty=1, frequency=4.0),
+    Idiom("龙马精神", "lóng mǎ jīng shén", "龙", "神",
+          "lóng", "shén", "比喻人精神旺盛", difficulty=1, frequency=4.0),
+    Idiom("龙潭虎穴", "lóng tán hǔ xué", "龙", "穴",
+          "lóng", "xué", "比喻极险恶的地方", difficulty=2, frequency=3.0),
+    Idiom("龙飞凤舞", "lóng fēi fèng wǔ", "龙", "舞",
+          "lóng", "wǔ", "形容山势蜿蜒雄壮，也形容书法笔势有力",
+          difficulty=3, frequency=4.0),
+]
+
+
+class TestChainIndex(unittest.TestCase):
+    """内存首字接龙索引测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.db = IdiomDatabase(":memory:")
+        for idiom in TEST_IDIOMS:
+            self.db.add_idiom(idiom)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_index_matches_sql_order(self):
+        """测试索引结果与SQL排序一致"""
+        expected = [idiom.word for idiom in self.db.get_idioms_by_starting_char("龙")]
+        self.db.enable_chain_index()
+        actual = [idiom.word for idiom in self.db.get_idioms_by_starting_char("龙")]
+        self.assertEqual(actual, expected)
+        self.assertEqual(actual, ["龙马精神", "龙飞凤舞", "龙潭虎穴"])
+
+    def test_index_refreshed_on_add(self):
+        """测试新增成语后索引同步更新"""
+        self.db.enable_chain_index()
+        self.db.add_idiom(Idiom("龙争虎斗", "lóng zhēng hǔ dòu", "龙", "斗",
+                                "lóng", "dòu", difficulty=2, frequency=4.0))
+        words = [idiom.word for idiom in self.db.get_idioms_by_starting_char("龙")]
+        self.assertEqual(words, ["龙马精神", "龙争虎斗", "龙飞凤舞", "龙潭虎穴"])
+
+    def test_index_views_load_details_lazily(self):
+        """测试索引中的成语视图按需加载解释"""
+        self.db.enable_chain_index()
+        view = self.db.get_idioms_by_starting_char("龙")[0]
+        self.assertEqual(view.word, "龙马精神")
+        self.assertEqual(view.explanation, "比喻人精神旺盛")
+        self.assertEqual(view.to_idiom(), TEST_IDIOMS[1])
+        with self.assertRaises(AttributeError):
+            view.word = "龙争虎斗"
+
+    def test_idiom_uses_slots(self):
+        """测试成语模型不带实例字典"""
+        self.assertFalse(hasattr(TEST_IDIOMS[0], '__dict__'))
+
+    def test_repository_uses_index(self):
+        """测试仓库接龙查询走索引且不访问SQL"""
+        self.db.enable_chain_index()
+        repository = IdiomRepository(self.db)
+        self.db.conn.close()
+        self.assertTrue(repository.has_possible_following("龙", {"龙马精神"}))
+        self.assertEqual(repository.get_hints("龙", count=1, exclude={"龙马精神"}),
+                         ["龙飞凤舞"])
+        self.assertFalse(repository.has_possible_following("虎"))
+
+
+class TestBulkImport(unittest.TestCase):
+    """批量导入测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.db = IdiomDatabase(":memory:", use_chain_index=True)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_bulk_import_counts(self):
+        """测试批量导入统计新增/跳过/重复"""
+        self.db.add_idiom(TEST_IDIOMS[0])
+        records = [
+            ("车水马龙", "重复", None, 1, 4.0),
+            ("龙马精神", "比喻人精神旺盛", None, 1, 4.0),
+            ("龙马精神", "同批重复", None, 1, 4.0),
+            ("", None, None, 1, 0.0),
+            ("神采飞扬", "形容精神饱满", "例句", 1, 3.0),
+        ]
+        result = self.db.bulk_import(records, chunk_size=2)
+        self.assertEqual(result.inserted, 2)
+        self.assertEqual(result.skipped, 1)
+        self.assertEqual(result.duplicates, 2)
+        self.assertEqual(self.db.get_total_count(), 3)
+
+        idiom = self.db.get_idiom_by_name("神采飞扬")
+        self.assertEqual(idiom.first_char, "神")
+        self.assertEqual(idiom.last_pinyin, "yáng")
+        self.assertEqual(idiom.example, "例句")
+        self.assertEqual([i.word for i in self.db.get_idioms_by_starting_char("龙")],
+                         ["龙马精神"])
+
+    def test_load_from_file(self):
+        """测试从文件导入"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "idioms.txt"
+            path.write_text("车水马龙,chē shuǐ mǎ lóng,形容繁华热闹\n"
+                            "\n"
+                            "嗔拳不打笑面\n"
+                            "龙马精神\n", encoding='utf-8')
+            self.assertEqual(self.db.load_from_file(str(path)), 2)
+        self.assertEqual(self.db.get_idiom_by_name("车水马龙").explanation,
+                         "形容繁华热闹")
+
+
+class TestIncrementalImport(unittest.TestCase):
+    """增量导入测试"""
+
+    RECORDS = [
+        ("车水马龙", "形容车马往来繁华热闹的景象", None, 1, 4.0),
+        ("龙马精神", "比喻人精神旺盛", None, 1, 4.0),
+    ]
+
+    def setUp(self):
+        """设置测试环境"""
+        self.db = IdiomDatabase(":memory:")
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_only_changed_rows_processed(self):
+        """测试只插入新成语、原地更新变化的成语"""
+        self.db.bulk_import(self.RECORDS)
+        records = [
+            ("车水马龙", "形容车马往来不绝", None, 1, 4.0),
+            ("龙马精神", "比喻人精神旺盛", None, 1, 4.0),
+            ("神采飞扬", "形容精神饱满", None, 2, 3.0),
+            ("神采飞扬", "重复记录", None, 2, 3.0),
+        ]
+        result = self.db.bulk_import(records, incremental=True)
+        self.assertEqual((result.inserted, result.updated, result.unchanged,
+                          result.duplicates), (1, 1, 1, 1))
+        self.assertEqual(self.db.get_idiom_by_name("车水马龙").explanation,
+                         "形容车马往来不绝")
+        self.assertEqual(self.db.get_idiom_by_name("神采飞扬").explanation,
+                         "形容精神饱满")
+        self.assertEqual(self.db.get_total_count(), 3)
+
+    def test_update_reorders_chain_index(self):
+        """测试更新频率后接龙索引重新排序"""
+        self.db.enable_chain_index()
+        self.db.bulk_import([("龙马精神", None, None, 1, 4.0),
+                             ("龙飞凤舞", None, None, 1, 3.0)])
+        self.db.bulk_import([("龙飞凤舞", None, None, 1, 5.0)], incremental=True)
+        words = [idiom.word for idiom in self.db.get_idioms_by_starting_char("龙")]
+        self.assertEqual(words, ["龙飞凤舞", "龙马精神"])
+
+    def test_unchanged_file_skipped(self):
+        """测试文件未变化时整体跳过，变化后只处理差异"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "idioms.txt"
+            path.write_text("车水马龙,,车马往来\n龙马精神,,精神旺盛\n", encoding='utf-8')
+            first = self.db.import_file(str(path))
+            self.assertEqual(first.inserted, 2)
+
+            again = self.db.import_file(str(path))
+            self.assertEqual((again.inserted, again.updated, again.unchanged), (0, 0, 2))
+
+            path.write_text("车水马龙,,车马往来\n龙马精神,,精神十足\n", encoding='utf-8')
+            changed = self.db.import_file(str(path))
+            self.assertEqual((changed.inserted, changed.updated, changed.unchanged),
+                             (0, 1, 1))
+            self.assertEqual(self.db.load_from_file(str(path)), 0)
+
+
+class TestStreamingImport(unittest.TestCase):
+    """流式导入测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.db = IdiomDatabase(":memory:")
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def write(self, name: str, text: str) -> Path:
+        path = self.dir / name
+        path.write_text(text, encoding='utf-8')
+        return path
+
+    def test_read_formats(self):
+        """测试CSV（表头/位置）、TSV与JSONL读取"""
+        csv_path = self.write("a.csv", "word,explanation,difficulty,frequency\n"
+                                       "车水马龙,车马往来,2,3.5\n")
+        self.assertEqual(list(read_records(csv_path)),
+                         [("车水马龙", "车马往来", None, 2, 3.5)])
+
+        plain = self.write("b.csv", "龙马精神,lóng mǎ jīng shén,精神旺盛\n")
+        self.assertEqual(list(read_records(plain)),
+                         [("龙马精神", "精神旺盛", None, 1, 0.0)])
+
+        tsv = self.write("c.tsv", "word\texample\n龙飞凤舞\t例句\n")
+        self.assertEqual(list(read_records(tsv)),
+                         [("龙飞凤舞", None, "例句", 1, 0.0)])
+
+        jsonl = self.write("d.jsonl", '{"word": "龙潭虎穴", "frequency": 2}\n'
+                                      'not json\n\n')
+        self.assertEqual(list(read_records(jsonl)),
+                         [("龙潭虎穴", None, None, 1, 2.0)])
+
+        with self.assertRaises(DatabaseException):
+            list(read_records(self.dir / "e.txt"))
+
+    def test_import_with_process_pool(self):
+        """测试多进程导入结果与单进程一致"""
+        lines = ["word,explanation"] + [f"{idiom.word},{idiom.explanation}"
+                                        for idiom in TEST_IDIOMS]
+        path = self.write("idioms.csv", "\n".join(lines + ["龙马精神,重复", "短,无效"]))
+
+        result = StreamingImporter(self.db, workers=2, chunk_size=2).import_file(
+            path, word_length=4
+        )
+        self.assertEqual((result.inserted, result.duplicates, result.skipped),
+                         (len(TEST_IDIOMS), 1, 1))
+        self.assertGreater(result.rows_per_second, 0)
+        idiom = self.db.get_idiom_by_name("龙潭虎穴")
+        self.assertEqual(idiom.first_pinyin, "lóng")
+        self.assertEqual(self.db.get_follower_count("龙"), 3)
+
+        single = IdiomDatabase(":memory:")
+        StreamingImporter(single, workers=1).import_file(path, word_length=4)
+        self.assertEqual(single.get_idiom_by_name("龙潭虎穴"), idiom)
+        single.close()
+
+    def test_malformed_rows_skipped(self):
+        """测试难度、频率无法解析的行被跳过并计入统计"""
+        csv_path = self.write("bad.csv", "word,difficulty,frequency\n"
+                                         "车水马龙,2,3.5\n"
+                                         "龙马精神,难,1\n"
+                                         "龙飞凤舞,1,高\n")
+        self.assertEqual([record[0] for record in read_records(csv_path)], ["车水马龙"])
+
+        result = StreamingImporter(self.db, workers=1).import_file(csv_path)
+        self.assertEqual((result.inserted, result.skipped), (1, 2))
+        self.assertIsNone(self.db.get_idiom_by_name("龙马精神"))
+
+        jsonl = self.write("bad.jsonl", '{"word": "龙潭虎穴"}\nnot json\n[1]\n')
+        result = StreamingImporter(self.db, workers=1).import_file(jsonl)
+        self.assertEqual((result.inserted, result.skipped), (1, 2))
+
+
+class TestRandomIdiom(unittest.TestCase):
+    """随机成语抽样测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.db = IdiomDatabase(":memory:")
+        for idiom in TEST_IDIOMS:
+            self.db.add_idiom(idiom)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_difficulty_filter(self):
+        """测试按难度抽样"""
+        for _ in range(20):
+            self.assertEqual(self.db.get_random_idiom(2).word, "龙潭虎穴")
+        self.assertIsNone(self.db.get_random_idiom(5))
+
+    def test_sampler_covers_all_and_tracks_inserts(self):
+        """测试抽样覆盖全部成语并包含新插入的成语"""
+        self.db.get_random_idiom()
+        self.db.add_idiom(Idiom("神采飞扬", "shén cǎi fēi yáng", "神", "扬",
+                                "shén", "yáng", difficulty=5))
+        self.db.bulk_import([("扬眉吐气", None, None, 5, 1.0)])
+        seen = {self.db.get_random_idiom().word for _ in range(500)}
+        self.assertEqual(len(seen), len(TEST_IDIOMS) + 2)
+        seen = {self.db.get_random_idiom(5).word for _ in range(100)}
+        self.assertEqual(seen, {"神采飞扬", "扬眉吐气"})
+
+
+class TestSearch(unittest.TestCase):
+    """成语搜索测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.db = IdiomDatabase(":memory:")
+        for idiom in TEST_IDIOMS:
+            self.db.add_idiom(idiom)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_search_word(self):
+        """测试按成语本身搜索"""
+        self.assertEqual([i.word for i in self.db.search_idioms("龙马精")],
+                         ["龙马精神"])
+        self.assertEqual(len(self.db.search_idioms("龙")), 4)
+        self.assertEqual(self.db.search_idioms("精神旺盛"), [])
+
+    def test_full_text_ranking(self):
+        """测试全文搜索覆盖解释并按相关度排序"""
+        words = [i.word for i in self.db.search_full_text("精神旺盛")]
+        self.assertEqual(words, ["龙马精神"])
+        words = [i.word for i in self.db.search_full_text("精神")]
+        self.assertEqual(words[0], "龙马精神")
+
+    def test_full_text_synced_by_triggers(self):
+        """测试全文索引随新增和修改同步"""
+        self.db.add_idiom(Idiom("神采飞扬", "shén cǎi fēi yáng", "神", "扬",
+                                "shén", "yáng", "形容精神饱满，神情昂扬"))
+        self.assertEqual([i.word for i in self.db.search_full_text("神情昂扬")],
+                         ["神采飞扬"])
+        self.db.conn.execute("UPDATE idioms SET explanation = '新的解释内容' "
+                             "WHERE word = '神采飞扬'")
+        self.assertEqual(self.db.search_full_text("神情昂扬"), [])
+        self.assertEqual(len(self.db.search_full_text("新的解释")), 1)
+
+
+class TestConnections(unittest.TestCase):
+    """线程连接管理测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = IdiomDatabase(str(Path(self.tmp.name) / "idioms.db"))
+        for idiom in TEST_IDIOMS:
+            self.db.add_idiom(idiom)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_wal_and_per_thread_connections(self):
+        """测试每个线程使用独立的WAL连接"""
+        mode = self.db.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+        connections = []
+        thread = threading.Thread(target=lambda: connections.append(self.db.conn))
+        thread.start()
+        thread.join()
+        self.assertIsNot(connections[0], self.db.conn)
+        # 线程退出后其连接被关闭
+        stats = self.db.get_connection_stats()
+        self.assertEqual(stats['connections_opened'], 2)
+        self.assertEqual(stats['open_connections'], 1)
+
+    def test_thread_connections_released(self):
+        """测试短生命周期线程的连接不会累积"""
+        def query():
+            self.assertTrue(self.db.is_valid_idiom("车水马龙"))
+
+        for _ in range(50):
+            thread = threading.Thread(target=query)
+            thread.start()
+            thread.join()
+        stats = self.db.get_connection_stats()
+        self.assertLessEqual(stats['open_connections'], 2)
+        self.assertGreaterEqual(stats['connections_closed'], 49)
+
+    def test_concurrent_reads_and_writes(self):
+        """测试并发读写互不干扰，写操作被串行化"""
+        errors = []
+
+        def reader():
+            try:
+                for _ in range(50):
+                    self.assertTrue(self.db.is_valid_idiom("车水马龙"))
+                    self.db.get_idioms_by_starting_char("龙")
+            except Exception as e:
+                errors.append(e)
+
+        def writer(offset):
+            try:
+                for i in range(20):
+                    word = chr(0x4E00 + offset + i) + "试成语"
+                    self.db.add_idiom(Idiom(word, "", word[0], word[-1], "", ""))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        threads += [threading.Thread(target=writer, args=(n * 100,))
+                    for n in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.db.get_total_count(), len(TEST_IDIOMS) + 60)
+        stats = self.db.get_connection_stats()
+        self.assertGreaterEqual(stats['write_acquisitions'], 60)
+        self.assertLessEqual(stats['write_contentions'], stats['write_acquisitions'])
+
+
+class TestBatchLookup(unittest.TestCase):
+    """批量查询测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.db = IdiomDatabase(":memory:")
+        for idiom in TEST_IDIOMS:
+            self.db.add_idiom(idiom)
+        # 超过单次 IN (...) 的参数数量，覆盖分块逻辑
+        self.words = ["龙飞凤舞", "不存在"] * 400 + ["车水马龙"]
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_exists_many_keeps_order(self):
+        """测试批量验证按输入顺序返回"""
+        expected = [word != "不存在" for word in self.words]
+        self.assertEqual(self.db.exists_many(self.words), expected)
+        self.db.enable_chain_index()
+        self.assertEqual(self.db.exists_many(self.words), expected)
+
+    def test_get_many_keeps_order(self):
+        """测试批量获取按输入顺序返回"""
+        idioms = self.db.get_many(self.words)
+        self.assertEqual(len(idioms), len(self.words))
+        self.assertEqual(idioms[0].explanation, TEST_IDIOMS[3].explanation)
+        self.assertIsNone(idioms[1])
+        self.assertEqual(idioms[-1].word, "车水马龙")
+        self.assertEqual(self.db.get_many([]), [])
+
+
+class TestFollowerCount(unittest.TestCase):
+    """物化接龙数量测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.db = IdiomDatabase(":memory:")
+        for idiom in TEST_IDIOMS:
+            self.db.add_idiom(idiom)
+        self.repository = IdiomRepository(self.db)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_counts_maintained_by_insert(self):
+        """测试单条与批量插入后计数同步"""
+        self.assertEqual(self.db.get_follower_count("龙"), 3)
+        self.assertEqual(self.db.get_follower_count("车"), 1)
+        self.assertEqual(self.db.get_follower_count("虎"), 0)
+        self.db.bulk_import([("龙争虎斗", None, None, 2, 4.0),
+                             ("龙马精神", None, None, 1, 4.0)])
+        self.assertEqual(self.db.get_follower_count("龙"), 4)
+        self.db.enable_chain_index()
+        self.assertEqual(self.db.get_follower_count("龙"), 4)
+
+    def test_counts_backfilled_for_existing_db(self):
+        """测试旧数据库打开时回填统计表"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "idioms.db")
+            db = IdiomDatabase(path)
+            for idiom in TEST_IDIOMS:
+                db.add_idiom(idiom)
+            with db._connections.write() as conn:
+                conn.execute("DELETE FROM char_stats")
+                conn.execute("DELETE FROM derived_state WHERE name = 'char_stats'")
+            db.close()
+
+            db = IdiomDatabase(path)
+            try:
+                version = db.data_version
+                # 统计表尚未重建时回退到 COUNT(*)
+                self.assertEqual(db.get_follower_count("龙"), 3)
+                db.derived.wait()
+                self.assertTrue(db.derived.is_ready('char_stats'))
+                self.assertEqual(db.get_follower_count("龙"), 3)
+                # 构建完成后数据版本递增，上层缓存随之失效
+                self.assertGreater(db.data_version, version)
+            finally:
+                db.close()
+
+    def test_has_possible_following_by_count(self):
+        """测试按数量判断是否还有可接龙成语"""
+        self.assertTrue(self.repository.has_possible_following("龙"))
+        used = {"龙马精神", "龙飞凤舞"}
+        self.assertTrue(self.repository.has_possible_following("龙", used))
+        used.add("龙潭虎穴")
+        self.assertFalse(self.repository.has_possible_following("龙", used))
+        # 不在词库中的已用词不计入
+        self.assertTrue(self.repository.has_possible_following(
+            "龙", {"龙马精神", "龙飞凤舞", "龙腾虎跃"}
+        ))
+        self.assertFalse(self.repository.has_possible_following(
+            "龙", {"车水马龙", "龙马精神", "龙飞凤舞"}, used_count=3
+        ))
+
+
+class TestUnusedFollowers(unittest.TestCase):
+    """排除已用成语的限量接龙查询测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.db = IdiomDatabase(":memory:")
+        for idiom in TEST_IDIOMS:
+            self.db.add_idiom(idiom)
+        self.repository = IdiomRepository(self.db)
+
+    def tearDown(self):
+        self.db.close()
+
+    def check_paths(self):
+        used = {"龙马精神", "车水马龙"}
+
+        def words(idioms):
+            return [idiom.word for idiom in idioms]
+        self.assertEqual(words(self.db.get_unused_followers("龙", used, limit=1)),
+                         ["龙飞凤舞"])
+        self.assertEqual(words(self.db.get_unused_followers("龙", used)),
+                         ["龙飞凤舞", "龙潭虎穴"])
+        self.assertEqual(self.db.get_unused_followers("龙", used, limit=0), [])
+        self.assertEqual(self.repository.get_hints("龙", count=5, exclude=used),
+                         ["龙飞凤舞", "龙潭虎穴"])
+        self.assertEqual(self.db.get_unused_follower_words("龙", used, limit=1),
+                         ["龙飞凤舞"])
+
+    def test_sql_path(self):
+        """测试SQL路径"""
+        self.check_paths()
+
+    def test_index_path(self):
+        """测试内存索引路径"""
+        self.db.enable_chain_index()
+        self.check_paths()
+
+    def test_homophone(self):
+        """测试同音接龙时的限量查询"""
+        used = {"龙马精神", "龙飞凤舞", "龙潭虎穴"}
+        # 珑与龙同音
+        self.assertFalse(self.repository.has_possible_following(
+            "珑", used, allow_homophone=True
+        ))
+        self.assertEqual(self.repository.get_hints(
+            "珑", count=1, exclude={"龙马精神"}, allow_homophone=True
+        ), ["龙飞凤舞"])
+
+
+class TestIdiomIds(unittest.TestCase):
+    """成语稠密编号测试"""
+
+    def test_ids_dense_and_stable(self):
+        """测试编号从0连续分配，写入后只追加"""
+        db = IdiomDatabase(":memory:")
+        for idiom in TEST_IDIOMS:
+            db.add_idiom(idiom)
+        ids = db.get_idiom_ids()
+        self.assertEqual(ids.words, [idiom.word for idiom in TEST_IDIOMS])
+        self.assertEqual(ids.id_of("龙潭虎穴"), 2)
+        self.assertIsNone(ids.id_of("龙争虎斗"))
+
+        db.add_idiom(Idiom("龙争虎斗", "lóng zhēng hǔ dòu", "龙", "斗", "lóng", "dòu"))
+        self.assertIs(db.get_idiom_ids(), ids)
+        self.assertEqual(ids.id_of("龙争虎斗"), len(TEST_IDIOMS))
+        self.assertEqual(ids.id_of("车水马龙"), 0)
+        db.close()
+
+
+class TestChainQueryPlan(unittest.TestCase):
+    """接龙查询覆盖索引测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.db = IdiomDatabase(":memory:")
+        for idiom in TEST_IDIOMS:
+            self.db.add_idiom(idiom)
+
+    def tearDown(self):
+        self.db.close()
+
+    def plan(self, sql, params):
+        rows = self.db.conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+        return " | ".join(row[3] for row in rows)
+
+    def test_no_temp_sort(self):
+        """测试接龙查询按索引顺序读取，不使用临时B树排序"""
+        for column in ('first_char', 'first_pinyin_plain'):
+            for words_only in (False, True):
+                for limited in (False, True):
+                    params = ("龙", 2) if limited else ("龙",)
+                    plan = self.plan(follower_sql(column, words_only, limited), params)
+                    self.assertIn(f"idx_chain_{column}", plan)
+                    self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_words_only_is_covering(self):
+        """测试只取词语的查询不回表"""
+        plan = self.plan(follower_sql('first_char', words_only=True), ("龙",))
+        self.assertIn("COVERING INDEX", plan)
+
+    def test_order_matches_full_query(self):
+        """测试词语查询与完整查询顺序一致"""
+        words = self.db.get_unused_follower_words("龙")
+        self.assertEqual(words, [i.word for i in self.db.get_idioms_by_starting_char("龙")])
+        self.assertEqual(words, ["龙马精神", "龙飞凤舞", "龙潭虎穴"])
+
+    def test_ties_broken_by_word(self):
+        """测试频率和难度相同时，SQL、内存索引和快照都按词语排序"""
+        for word in ("一心一意", "一帆风顺"):
+            self.db.add_idiom(build_idiom(word, frequency=5.0, difficulty=1))
+        expected = ["一帆风顺", "一心一意"]
+        self.assertEqual(self.db.get_unused_follower_words("一", limit=2), expected)
+        self.assertEqual([i.word for i in self.db.get_followers_page("一").items], expected)
+        self.db.enable_chain_index()
+        self.assertEqual(self.db.get_unused_follower_words("一", limit=2), expected)
+        self.assertEqual(IdiomRepository(self.db).get_hints("一", count=2), expected)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "idioms.lexicon"
+            export_snapshot(self.db, path)
+            snapshot = LexiconSnapshot(path)
+            try:
+                self.assertEqual(snapshot.find_by_starting_char("一").words, expected)
+            finally:
+                snapshot.close()
+
+
+class TestFollowerPages(unittest.TestCase):
+    """接龙键集分页测试"""
+
+    def setUp(self):
+        """设置测试环境：一个含大量并列排序键的首字分组"""
+        self.db = IdiomDatabase(":memory:")
+        self.words = []
+        for i in range(23):
+            word = f"一{i:02d}成语"
+            self.db.add_idiom(build_idiom(word, difficulty=1 + i % 2,
+                                          frequency=float(i % 3)))
+            self.words.append(word)
+        self.expected = [i.word for i in sorted(
+            (self.db.get_idiom_by_name(w) for w in self.words),
+            key=lambda i: (-i.frequency, i.difficulty, i.word)
+        )]
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_pages_cover_bucket_in_order(self):
+        """测试逐页读取与整组顺序一致且不重不漏"""
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = self.db.get_followers_page("一", cursor, page_size=5)
+            seen += [idiom.word for idiom in page.items]
+            pages += 1
+            if not page.has_more:
+                break
+            cursor = page.cursor
+        self.assertEqual(pages, 5)
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(seen, [i.word for i in self.db.get_idioms_by_starting_char("一")])
+
+    def test_iterator_and_words_only(self):
+        """测试迭代器和只取词语"""
+        self.assertEqual(list(self.db.iter_followers("一", page_size=4, words_only=True)),
+                         self.expected)
+        self.assertEqual([i.word for i in self.db.iter_followers("一", page_size=23)],
+                         self.expected)
+        self.assertEqual(list(self.db.iter_followers("无")), [])
+
+    def test_by_sound(self):
+        """测试同音分页"""
+        repository = IdiomRepository(self.db)
+        page = repository.find_followers_page("壹", page_size=3, allow_homophone=True,
+                                              words_only=True)
+        self.assertEqual(page.items, self.expected[:3])
+        self.assertTrue(page.has_more)
+
+    def test_insert_between_pages(self):
+        """测试翻页期间写入不影响已翻过的位置"""
+        page = self.db.get_followers_page("一", page_size=10, words_only=True)
+        self.db.add_idiom(build_idiom("一马当先", frequency=9.0))
+        rest = []
+        cursor = page.cursor
+        while cursor:
+            next_page = self.db.get_followers_page("一", cursor, page_size=10,
+                                                   words_only=True)
+            rest += next_page.items
+            cursor = next_page.cursor
+        self.assertEqual(page.items + rest, self.expected)
+
+    def test_invalid_cursor(self):
+        """测试无效游标"""
+        with self.assertRaises(DatabaseException):
+            self.db.get_followers_page("一", "not-a-cursor")
+
+    def test_page_query_uses_index(self):
+        """测试翻页查询从索引中游标位置开始读取，不排序"""
+        sql = follower_sql('first_char', words_only=True, limited=True, after=True)
+        rows = self.db.conn.execute("EXPLAIN QUERY PLAN " + sql,
+                                    ("一", 1.0, 1.0, 1, 1, "一", 5)).fetchall()
+        plan = " | ".join(row[3] for row in rows)
+        self.assertIn("COVERING INDEX idx_chain_first_char", plan)
+        self.assertIn("frequency<", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+
+class TestPerformanceProfile(unittest.TestCase):
+    """SQLite性能配置测试"""
+
+    def test_from_config(self):
+        """测试预设与逐项覆盖"""
+        self.assertEqual(PerformanceProfile.from_config(None), PRESETS['desktop'])
+        self.assertEqual(PerformanceProfile.from_config('server'), PRESETS['server'])
+        profile = PerformanceProfile.from_config(
+            {'preset': 'low-memory', 'cache_size': '-4000', 'synchronous': 'FULL',
+             'mmap_size': None}
+        )
+        self.assertEqual(profile.cache_size, -4000)
+        self.assertEqual(profile.synchronous, 'full')
+        self.assertEqual(profile.mmap_size, 0)
+        for bad in ('laptop', {'preset': 'desktop', 'cache': 1},
+                    {'synchronous': 'sometimes'}, {'page_size': 1000}):
+            with self.assertRaises(ValueError):
+                PerformanceProfile.from_config(bad)
+
+    def test_applied_settings_reported(self):
+        """测试新建数据库应用预设并读回生效值"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "idioms.db")
+            db = IdiomDatabase(path, performance={'preset': 'server',
+                                                  'cache_size': -8000})
+            try:
+                settings = db.get_performance_settings()
+                self.assertEqual(settings['journal_mode'], 'wal')
+                self.assertEqual(settings['synchronous'], 'normal')
+                self.assertEqual(settings['temp_store'], 'memory')
+                self.assertEqual(settings['cache_size'], -8000)
+                self.assertEqual(settings['page_size'], 8192)
+                db.add_idiom(TEST_IDIOMS[0])
+            finally:
+                db.close()
+
+            # page_size 只对新库生效，已有数据库保持原页大小
+            db = IdiomDatabase(path, performance='low-memory')
+            try:
+                settings = db.get_performance_settings()
+                self.assertEqual(settings['page_size'], 8192)
+                self.assertEqual(settings['mmap_size'], 0)
+                self.assertEqual(settings['temp_store'], 'file')
+                self.assertTrue(db.is_valid_idiom(TEST_IDIOMS[0].word))
+            finally:
+                db.close()
+
+    def test_invalid_config(self):
+        """测试无效配置在连接时报错"""
+        with self.assertRaises(DatabaseException):
+            IdiomDatabase(":memory:", performance='turbo')
+
+
+class TestReadOnly(unittest.TestCase):
+    """只读不可变模式测试"""
+
+    def setUp(self):
+        """设置测试环境：整理好的发布词库"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "idioms.db")
+        db = IdiomDatabase(self.path)
+        for idiom in TEST_IDIOMS:
+            db.add_idiom(idiom)
+        db.freeze()
+        db.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_freeze_makes_single_file(self):
+        """测试整理后只剩单个文件且派生数据已构建"""
+        self.assertEqual(sorted(p.name for p in Path(self.tmp.name).iterdir()),
+                         ["idioms.db"])
+        db = IdiomDatabase(self.path, read_only=True)
+        try:
+            self.assertEqual(db.get_performance_settings()['journal_mode'], 'delete')
+            for name in ('plain_pinyin', 'char_stats', 'fts'):
+                self.assertTrue(db.derived.is_ready(name))
+        finally:
+            db.close()
+
+    def test_reads(self):
+        """测试只读模式下的查询"""
+        db = IdiomDatabase(self.path, read_only=True, use_chain_index=True)
+        try:
+            self.assertEqual(db.get_total_count(), len(TEST_IDIOMS))
+            self.assertEqual(db.get_follower_count("龙"), 3)
+            self.assertTrue(db.is_valid_idiom("车水马龙"))
+            self.assertEqual([i.word for i in db.get_idioms_by_starting_sound("long")],
+                             ["龙马精神", "龙飞凤舞", "龙潭虎穴"])
+        finally:
+            db.close()
+
+    def test_writes_raise(self):
+        """测试只读模式下写入接口抛出异常且不改动文件"""
+        before = Path(self.path).read_bytes()
+        db = IdiomDatabase(self.path, read_only=True)
+        try:
+            with self.assertRaises(DatabaseException):
+                db.add_idiom(TEST_IDIOMS[0])
+            with self.assertRaises(DatabaseException):
+                db.bulk_import([("一帆风顺", None, None, 1, 0.0)])
+            with self.assertRaises(DatabaseException):
+                db.load_from_file(self.path)
+            with self.assertRaises(DatabaseException):
+                db.start_backup()
+            with self.assertRaises(DatabaseException):
+                with db._connections.write():
+                    pass
+        finally:
+            db.close()
+        self.assertEqual(Path(self.path).read_bytes(), before)
+
+    def test_missing_file(self):
+        """测试只读模式不创建新文件"""
+        missing = Path(self.tmp.name) / "missing.db"
+        with self.assertRaises(DatabaseException):
+            IdiomDatabase(str(missing), read_only=True)
+        self.assertFalse(missing.exists())
+
+
+class TestInMemoryCopy(unittest.TestCase):
+    """内存词库副本测试"""
+
+    def setUp(self):
+        """设置测试环境：磁盘词库"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "idioms.db")
+        db = IdiomDatabase(self.path)
+        for idiom in TEST_IDIOMS:
+            db.add_idiom(idiom)
+        db.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def disk_words(self):
+        db = IdiomDatabase(self.path)
+        try:
+            return {row[0] for row in db.conn.execute("SELECT word FROM idioms")}
+        finally:
+            db.close()
+
+    def test_copy_and_query(self):
+        """测试启动时复制到内存并报告加载结果"""
+        db = IdiomDatabase(self.path, in_memory=True)
+        try:
+            self.assertTrue(db._connections.is_memory)
+            self.assertIsNotNone(db.memory_load)
+            self.assertGreater(db.memory_load.pages, 0)
+            self.assertEqual(db.get_total_count(), len(TEST_IDIOMS))
+            self.assertEqual(db.get_follower_count("龙"), 3)
+            self.assertEqual(db.search_full_text("龙马精", 5)[0].word, "龙马精神")
+        finally:
+            db.close()
+
+    def test_without_write_through(self):
+        """测试不写回时写入只保留在内存中"""
+        db = IdiomDatabase(self.path, in_memory=True)
+        try:
+            self.assertTrue(db.add_idiom(build_idiom("一帆风顺")))
+            self.assertTrue(db.is_valid_idiom("一帆风顺"))
+        finally:
+            db.close()
+        self.assertNotIn("一帆风顺", self.disk_words())
+
+    def test_write_through(self):
+        """测试写回：新增与更新同步到磁盘（含磁盘上的派生数据）"""
+        db = IdiomDatabase(self.path, in_memory=True, write_through=True)
+        try:
+            self.assertTrue(db.add_idiom(build_idiom("神采飞扬")))
+            result = db.bulk_import([("龙马精神", "新的解释", None, 1, 0.9)],
+                                    incremental=True)
+            self.assertEqual(result.updated, 1)
+        finally:
+            db.close()
+
+        self.assertIn("神采飞扬", self.disk_words())
+        db = IdiomDatabase(self.path)
+        try:
+            self.assertEqual(db.get_idiom_by_name("龙马精神").explanation, "新的解释")
+            self.assertEqual(db.get_follower_count("神"), 1)
+        finally:
+            db.close()
+
+    def test_read_only_copy(self):
+        """测试只读词库的内存副本拒绝写入"""
+        db = IdiomDatabase(self.path, in_memory=True, read_only=True)
+        try:
+            self.assertEqual(db.get_total_count(), len(TEST_IDIOMS))
+            with self.assertRaises(DatabaseException):
+                db.add_idiom(build_idiom("一帆风顺"))
+        finally:
+            db.close()
+        with self.assertRaises(DatabaseException):
+            IdiomDatabase(self.path, write_through=True)
+
+
+class TestQueryCache(unittest.TestCase):
+    """仓库查询缓存测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.db = IdiomDatabase(":memory:")
+        for idiom in TEST_IDIOMS:
+            self.db.add_idiom(idiom)
+        self.repository = IdiomRepository(self.db, cache_size=8)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_hits_and_misses(self):
+        """测试重复查询命中缓存（含不存在的结果）"""
+        first = self.repository.find_by_word("龙马精神")
+        self.assertIs(self.repository.find_by_word("龙马精神"), first)
+        self.assertIsNone(self.repository.find_by_word("不存在"))
+        self.assertIsNone(self.repository.find_by_word("不存在"))
+        stats = self.repository.get_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 2))
+
+    def test_invalidated_by_writes(self):
+        """测试新增与批量导入后缓存失效"""
+        self.assertEqual(len(self.repository.find_by_starting_char("龙")), 3)
+        self.assertFalse(self.repository.exists("龙争虎斗"))
+        self.db.add_idiom(Idiom("龙争虎斗", "lóng zhēng hǔ dòu", "龙", "斗",
+                                "lóng", "dòu"))
+        self.assertEqual(len(self.repository.find_by_starting_char("龙")), 4)
+        self.assertTrue(self.repository.exists("龙争虎斗"))
+
+        self.db.bulk_import([("龙凤呈祥", None, None, 1, 0.0)])
+        self.assertEqual(len(self.repository.find_by_starting_char("龙")), 5)
+        self.assertEqual(self.repository.get_cache_stats()['invalidations'], 2)
+
+    def test_cached_results_immutable(self):
+        """测试调用方无法修改缓存中的结果"""
+        idioms = self.repository.find_by_starting_char("龙")
+        idioms.clear()
+        self.assertEqual(len(self.repository.find_by_starting_char("龙")), 3)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            self.repository.find_by_word("车水马龙").explanation = "篡改"
+
+    def test_eviction_and_ttl(self):
+        """测试容量淘汰与过期"""
+        cache = QueryCache(max_size=2, ttl=0.05)
+        for key in ("a", "b", "c"):
+            cache.get_or_load(key, lambda: key)
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(cache.get_or_load("a", lambda: "reloaded"), "reloaded")
+        time.sleep(0.06)
+        self.assertEqual(cache.get_or_load("a", lambda: "expired"), "expired")
+        self.assertEqual(cache.stats()['expirations'], 1)
+
+
+class TestBloomFilter(unittest.TestCase):
+    """布隆过滤器测试"""
+
+    def test_no_false_negatives_and_fp_rate(self):
+        """测试无漏判且误判率接近目标"""
+        bloom = BloomFilter(2000, fp_rate=0.01)
+        words = [f"成语{i}" for i in range(2000)]
+        bloom.update(words)
+        self.assertTrue(all(word in bloom for word in words))
+        false_positives = sum(f"其他{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives / 10000, 0.03)
+        self.assertAlmostEqual(bloom.expected_fp_rate, 0.01, delta=0.005)
+
+    def test_database_rejects_misses(self):
+        """测试数据库用布隆过滤器排除不存在的成语并随插入更新"""
+        db = IdiomDatabase(":memory:", bloom_fp_rate=0.001)
+        try:
+            for idiom in TEST_IDIOMS:
+                db.add_idiom(idiom)
+            self.assertTrue(db.is_valid_idiom("龙马精神"))
+            self.assertFalse(db.is_valid_idiom("测试测试"))
+            self.assertIsNone(db.get_idiom_by_name("测试测试"))
+            self.assertEqual(db.exists_many(["车水马龙", "测试测试"]), [True, False])
+            stats = db.get_bloom_filter_stats()
+            self.assertEqual(stats['count'], len(TEST_IDIOMS))
+            self.assertEqual(stats['rejected'], 3)
+            self.assertEqual(stats['passed'], 2)
+        finally:
+            db.close()
+
+    def test_database_capacity(self):
+        """测试布隆过滤器预留容量可配置，超出后重建时沿用配置"""
+        db = IdiomDatabase(":memory:", bloom_fp_rate=0.01, bloom_capacity=5000)
+        try:
+            self.assertEqual(db.get_bloom_filter_stats()['capacity'], 5000)
+            db.bulk_import([(f"成语{i:04d}", None, None, 1, 0.0) for i in range(6000)])
+            self.assertEqual(db.get_bloom_filter_stats()['capacity'], 12000)
+            db.enable_bloom_filter(0.01)
+            self.assertEqual(db.get_bloom_filter_stats()['capacity'], 12000)
+            db.enable_bloom_filter(0.01, 20000)
+            for idiom in TEST_IDIOMS:
+                db.add_idiom(idiom)
+            self.assertEqual(db.get_bloom_filter_stats()['capacity'], 20000)
+        finally:
+            db.close()
+
+
+class TestSnapshot(unittest.TestCase):
+    """二进制词库快照测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "idioms.lexicon"
+        self.db = IdiomDatabase(":memory:", use_chain_index=True)
+        for idiom in TEST_IDIOMS:
+            self.db.add_idiom(idiom)
+        export_snapshot(self.db, self.path)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_roundtrip(self):
+        """测试快照查询与数据库一致"""
+        snapshot = LexiconSnapshot(self.path)
+        try:
+            self.assertEqual(len(snapshot), len(TEST_IDIOMS))
+            self.assertTrue(snapshot.exists("龙潭虎穴"))
+            self.assertFalse(snapshot.exists("龙争虎斗"))
+            bucket = snapshot.find_by_starting_char("龙")
+            self.assertEqual(bucket.words, [i.word for i in
+                                            self.db.get_idioms_by_starting_char("龙")])
+            self.assertEqual(bucket[0].last_pinyin, "shén")
+            self.assertEqual(bucket[-1].difficulty, 2)
+            self.assertEqual(len(snapshot.find_by_starting_char("虎")), 0)
+        finally:
+            snapshot.close()
+
+    def test_corruption_detected(self):
+        """测试损坏的快照被拒绝"""
+        data = bytearray(self.path.read_bytes())
+        data[-1] ^= 0xFF
+        self.path.write_bytes(bytes(data))
+        with self.assertRaises(DatabaseException):
+            LexiconSnapshot(self.path, verify=True)
+        # 默认打开不读取整个载荷，需要时显式校验
+        snapshot = LexiconSnapshot(self.path)
+        try:
+            with self.assertRaises(DatabaseException):
+                snapshot.verify()
+        finally:
+            snapshot.close()
+
+
+class TestChainGraph(unittest.TestCase):
+    """字级接龙图测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = IdiomDatabase(str(Path(self.tmp.name) / "idioms.db"))
+        for idiom in TEST_IDIOMS:
+            self.db.add_idiom(idiom)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_structure(self):
+        """测试邻接、死路字和k步接龙数"""
+        graph = ChainGraph.from_database(self.db)
+        self.assertEqual(len(graph), 5)
+        self.assertEqual(graph.idiom_count, len(TEST_IDIOMS))
+        self.assertEqual(graph.out_count("龙"), 3)
+        self.assertEqual(graph.successors("车"), [("龙", 1)])
+        self.assertEqual(sorted(graph.sinks()), sorted("神穴舞"))
+        self.assertTrue(graph.is_sink("虎"))
+        self.assertFalse(graph.is_sink("车"))
+        self.assertEqual(graph.step_count("车", 1), 1)
+        self.assertEqual(graph.step_count("车", 2), 3)
+        self.assertEqual(graph.step_count("车", 3), 0)
+        self.assertTrue(graph.can_reach("车", "神"))
+        self.assertFalse(graph.can_reach("龙", "车"))
+        self.assertEqual(graph.reachable("车"), set("龙神穴舞"))
+
+    def test_strongly_connected(self):
+        """测试强连通分量与环上的自身可达"""
+        graph = ChainGraph.from_edges([("甲", "乙"), ("乙", "丙"), ("丙", "甲"),
+                                       ("丙", "丁"), ("丁", "丁"), ("戊", "甲")])
+        self.assertEqual(graph.component_size("甲"), 3)
+        self.assertEqual(graph.component_id("甲"), graph.component_id("丙"))
+        self.assertNotEqual(graph.component_id("甲"), graph.component_id("丁"))
+        self.assertEqual(sorted(graph.largest_component()), sorted("甲乙丙"))
+        self.assertTrue(graph.can_reach("甲", "甲"))
+        self.assertTrue(graph.can_reach("丁", "丁"))
+        self.assertFalse(graph.can_reach("戊", "戊"))
+        self.assertEqual(graph.reachable_count("戊"), 4)
+        self.assertEqual(graph.sinks(), [])
+
+    def test_disk_cache(self):
+        """测试缓存写入、复用和写入后失效"""
+        path = graph_path_for(self.db.db_path)
+        graph = ChainGraph.load_or_build(self.db)
+        self.assertTrue(path.exists())
+        cached = ChainGraph.load(path)
+        self.assertEqual(cached.fingerprint, graph.fingerprint)
+        self.assertEqual(list(cached.targets), list(graph.targets))
+        self.assertEqual(list(cached.steps[1]), list(graph.steps[1]))
+
+        self.db.add_idiom(Idiom("穴居野处", "xué jū yě chǔ", "穴", "处",
+                                "xué", "chǔ"))
+        rebuilt = ChainGraph.load_or_build(self.db)
+        self.assertFalse(rebuilt.is_sink("穴"))
+        self.assertEqual(ChainGraph.load(path).fingerprint, rebuilt.fingerprint)
+
+    def test_corruption_detected(self):
+        """测试损坏的缓存被拒绝并重新构建"""
+        path = graph_path_for(self.db.db_path)
+        ChainGraph.load_or_build(self.db)
+        data = bytearray(path.read_bytes())
+        data[-1] ^= 0xFF
+        path.write_bytes(bytes(data))
+        with self.assertRaises(DatabaseException):
+            ChainGraph.load(path)
+        self.assertEqual(ChainGraph.load_or_build(self.db).out_count("龙"), 3)
+
+    def test_repository_start(self):
+        """测试仓库随机起始成语避开死路字"""
+        repository = IdiomRepository(self.db)
+        for _ in range(5):
+            self.assertEqual(repository.find_random_start(attempts=50).word, "车水马龙")
+        self.assertIs(repository.get_chain_graph(), repository.get_chain_graph())
+
+
+class TestBackup(unittest.TestCase):
+    """在线备份测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = IdiomDatabase(str(Path(self.tmp.name) / "idioms.db"))
+        for idiom in TEST_IDIOMS:
+            self.db.add_idiom(idiom)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_backup_copies_and_rotates(self):
+        """测试分步备份内容完整并按数量轮换"""
+        manager = BackupManager(self.db.db_path, keep=2,
+                                pages_per_step=1, step_sleep=0)
+        results = [manager.backup_now() for _ in range(3)]
+        self.assertGreater(results[-1].steps, 1)
+        self.assertGreaterEqual(results[-1].duration, results[-1].max_lock_time)
+        self.assertEqual([str(path) for path in manager.list_backups()],
+                         [result.path for result in results[1:]])
+
+        backup = IdiomDatabase(results[-1].path)
+        self.assertEqual(backup.get_total_count(), len(TEST_IDIOMS))
+        backup.close()
+
+    def test_background_backup(self):
+        """测试后台线程备份期间仍可读写"""
+        manager = self.db.start_backup(step_sleep=0.001)
+        self.db.add_idiom(Idiom("龙争虎斗", "lóng zhēng hǔ dòu", "龙", "斗",
+                                "lóng", "dòu"))
+        self.assertTrue(manager.wait(timeout=10))
+        self.assertIsNotNone(manager.last_result)
+        self.assertEqual(len(manager.list_backups()), 1)
+
+    def test_memory_database_rejected(self):
+        """测试内存数据库不支持备份"""
+        with self.assertRaises(DatabaseException):
+            BackupManager(":memory:")
+
+
+class TestHomophone(unittest.TestCase):
+    """无声调拼音与同音接龙测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.db = IdiomDatabase(":memory:")
+        for idiom in TEST_IDIOMS:
+            self.db.add_idiom(idiom)
+        self.db.add_idiom(Idiom("隆冬腊月", "lóng dōng là yuè", "隆", "月",
+                                "lóng", "yuè", difficulty=2, frequency=1.0))
+        self.repository = IdiomRepository(self.db)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_find_by_starting_sound(self):
+        """测试按首字读音查找"""
+        words = [i.word for i in self.repository.find_by_starting_sound("long")]
+        self.assertEqual(words, ["龙马精神", "龙飞凤舞", "龙潭虎穴", "隆冬腊月"])
+
+    def test_homophone_followers(self):
+        """测试同音模式下的接龙查询"""
+        exclude = {"龙马精神", "龙飞凤舞", "龙潭虎穴"}
+        self.assertFalse(self.repository.has_possible_following("龙", exclude))
+        self.assertTrue(self.repository.has_possible_following(
+            "龙", exclude, allow_homophone=True))
+        self.assertEqual(self.repository.get_hints(
+            "笼", count=1, exclude=exclude, allow_homophone=True), ["隆冬腊月"])
+
+    def test_migration_fills_plain_pinyin(self):
+        """测试旧库迁移时补齐无声调拼音"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "old.db")
+            conn = sqlite3.connect(path)
+            conn.execute("""
+                CREATE TABLE idioms (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    word TEXT NOT NULL UNIQUE, pinyin TEXT NOT NULL,
+                    first_char TEXT NOT NULL, last_char TEXT NOT NULL,
+                    first_pinyin TEXT NOT NULL, last_pinyin TEXT NOT NULL,
+                    explanation TEXT, example TEXT,
+                    difficulty INTEGER DEFAULT 1, frequency REAL DEFAULT 0.0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.execute("INSERT INTO idioms (word, pinyin, first_char, last_char, "
+                         "first_pinyin, last_pinyin) VALUES "
+                         "('绿水青山', 'lǜ shuǐ qīng shān', '绿', '山', 'lǜ', 'shān')")
+            conn.commit()
+            conn.close()
+
+            db = IdiomDatabase(path)
+            try:
+                self.assertEqual(get_schema_version(db._connections.get()),
+                                 SCHEMA_VERSION)
+                # 无声调拼音在打开时同步补齐，同音查询无需等待后台构建
+                self.assertTrue(db.derived.is_ready('plain_pinyin'))
+                words = [i.word for i in db.get_idioms_by_starting_sound("lv")]
+                self.assertEqual(words, ["绿水青山"])
+                self.assertEqual(db.get_unused_follower_words("lv", by_sound=True),
+                                 ["绿水青山"])
+            finally:
+                db.close()
+
+            db = IdiomDatabase(path)
+            try:
+                # 已是最新版本，重复打开不再执行迁移
+                self.assertEqual(migrate(db._connections.get()), [])
+            finally:
+                db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,7 +10,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.data.models import GameConfig, GameState
+from src.data.idiom_ids import IdiomIds, UsedIdioms
 from src.data.database import IdiomDatabase
+from src.core.chain_search import ChainSearch
+from src.core.game_manager import GameManager
 from src.core.idiom_validator import IdiomValidator
 from src.data.idiom_repository import IdiomRepository
 
@@ -34,6 +37,8 @@ class TestGameState(unittest.TestCase):
         state.add_idiom("车水马龙")
         self.assertEqual(state.last_idiom, "车水马龙")
         self.assertIn("车水马龙", state.used_idioms)
+        state.add_idiom("车水马龙")
+        self.assertEqual(state.used_first_chars["车"], 1)
 
     def test_switch_turn(self):
         """测试切换回合"""
@@ -55,6 +60,53 @@ class TestGameState(unittest.TestCase):
         self.assertIsNone(state.last_idiom)
         self.assertEqual(len(state.used_idioms), 0)
 
+    def test_bitset_tracking(self):
+        """测试已用成语以位集记录，表外成语按字符串记录"""
+        ids = IdiomIds(["车水马龙", "龙马精神", "神采飞扬"])
+        state = GameState(ids)
+        state.add_idiom("龙马精神")
+        state.add_idiom("表外成语")
+        used = state.used_idioms
+        self.assertEqual(used.bits, bytearray(b'\x02'))
+        self.assertEqual(used.extra, {"表外成语"})
+        self.assertIn("龙马精神", used)
+        self.assertNotIn("车水马龙", used)
+        self.assertTrue(used.contains_id(1))
+        self.assertEqual(list(used), ["龙马精神", "表外成语"])
+        state.add_idiom("神采飞扬")
+        self.assertEqual(list(used)[-2:], ["表外成语", "神采飞扬"])
+        used.discard("神采飞扬")
+        self.assertEqual(used, {"龙马精神", "表外成语"})
+        self.assertEqual(len(used), 2)
+
+        # 加入集合后才编号的成语仍能查到
+        ids.extend(["表外成语"])
+        self.assertIn("表外成语", used)
+        used.discard("表外成语")
+        self.assertEqual(len(used), 1)
+
+    def test_copy_and_key(self):
+        """测试复制互不影响且局面键可哈希"""
+        ids = IdiomIds(["车水马龙", "龙马精神"])
+        state = GameState(ids)
+        state.add_idiom("车水马龙")
+        other = state.copy()
+        self.assertEqual(other.key(), state.key())
+        other.add_idiom("龙马精神")
+        other.switch_turn()
+        self.assertNotIn("龙马精神", state.used_idioms)
+        self.assertEqual(state.used_first_chars["龙"], 0)
+        self.assertEqual(len({state.key(), other.key(), state.copy().key()}), 2)
+        self.assertEqual(UsedIdioms(ids, ["车水马龙"]), state.used_idioms)
+
+        # 编号表追加后创建的集合位集更长，内容相同时键仍相等
+        before = UsedIdioms(ids, ["车水马龙"])
+        ids.extend(f"成语{i}" for i in range(64))
+        after = UsedIdioms(ids, ["车水马龙"])
+        self.assertNotEqual(len(before.bits), len(after.bits))
+        self.assertEqual(before.key(), after.key())
+        self.assertEqual(hash(before.key()), hash(after.key()))
+
 
 class TestIdiomValidator(unittest.TestCase):
     """成语验证器测试"""
@@ -159,5 +211,114 @@ class TestIdiomRepository(unittest.TestCase):
         self.assertEqual(len(idioms), 1)
 
 
+class TestChainSearch(unittest.TestCase):
+    """接龙博弈树搜索测试"""
+
+    def setUp(self):
+        """设置测试环境：甲→乙 后对方可接到死路字，甲→丙 三步后对方无法接龙"""
+        self.search = ChainSearch([
+            ("甲一二乙", "甲", "乙"),
+            ("甲三四丙", "甲", "丙"),
+            ("乙五六丁", "乙", "丁"),
+            ("丙七八戊", "丙", "戊"),
+            ("戊九十己", "戊", "己"),
+        ])
+
+    def test_finds_forced_win(self):
+        """测试向前看找到必胜走法"""
+        result = self.search.search("甲", time_budget=5)
+        self.assertEqual(result.word, "甲三四丙")
+        self.assertTrue(result.proven)
+        self.assertGreater(result.score, 0)
+        self.assertEqual(result.depth, 3)
+        self.assertGreater(result.nodes, 0)
+
+    def test_used_idioms_excluded(self):
+        """测试已用成语不再走，且会改变结论"""
+        result = self.search.search("甲", {"戊九十己"}, time_budget=5)
+        self.assertTrue(result.proven)
+        self.assertLess(result.score, 0)
+        result = self.search.search("甲", {"甲三四丙"}, time_budget=5)
+        self.assertEqual(result.word, "甲一二乙")
+
+    def test_immediate_win_and_no_move(self):
+        """测试直接接到死路字与无子可走"""
+        search = ChainSearch([("甲一二乙", "甲", "乙"), ("乙三四甲", "乙", "甲"),
+                              ("甲五六丙", "甲", "丙")])
+        result = search.search("甲", time_budget=5)
+        self.assertEqual(result.word, "甲五六丙")
+        self.assertEqual(result.depth, 1)
+        self.assertIsNone(search.search("丁").word)
+
+    def test_depth_and_time_limits(self):
+        """测试深度上限与零时间预算仍返回合法走法"""
+        result = self.search.search("甲", max_depth=1)
+        self.assertEqual(result.depth, 1)
+        self.assertFalse(result.proven)
+        result = self.search.search("甲", time_budget=0)
+        self.assertIn(result.word, ("甲一二乙", "甲三四丙"))
+
+    def test_long_cycle_within_recursion_limit(self):
+        """测试不限深度时搜索深度受递归上限约束，不抛出RecursionError"""
+        size = 700
+        chars = [chr(0x4E00 + i) for i in range(size)]
+        search = ChainSearch([(f"{chars[i]}甲乙{chars[(i + 1) % size]}", chars[i],
+                               chars[(i + 1) % size]) for i in range(size)])
+        result = search.search(chars[0], time_budget=5)
+        self.assertEqual(result.word, f"{chars[0]}甲乙{chars[1]}")
+        self.assertLessEqual(result.depth, ChainSearch.depth_limit())
+        self.assertLess(ChainSearch.depth_limit(), sys.getrecursionlimit() // 2)
+
+    def test_table_keeps_storing_when_full(self):
+        """测试置换表写满后新局面仍能替换写入"""
+        search = ChainSearch([("甲一二乙", "甲", "乙"), ("乙三四甲", "乙", "甲"),
+                              ("甲五六乙", "甲", "乙"), ("乙七八甲", "乙", "甲")],
+                             table_size=2)
+        self.assertEqual(search.table_size, 2)
+        search.search("甲", time_budget=5)
+        generation = [entry[5] for entry in search.table if entry is not None]
+        search.search("乙", time_budget=5)
+        latest = [entry[5] for entry in search.table if entry is not None]
+        self.assertTrue(generation)
+        self.assertIn(search._generation, latest)
+
+    def test_game_manager_strategy(self):
+        """测试搜索AI作为游戏管理器的出招策略"""
+        db = IdiomDatabase(":memory:")
+        from src.data.models import Idiom
+        for idiom in [
+            Idiom("车水马龙", "chē shuǐ mǎ lóng", "车", "龙", "chē", "lóng"),
+            Idiom("龙马精神", "lóng mǎ jīng shén", "龙", "神", "lóng", "shén"),
+            Idiom("神采飞扬", "shén cǎi fēi yáng", "神", "扬", "shén", "yáng"),
+            Idiom("龙飞凤舞", "lóng fēi fèng wǔ", "龙", "舞", "lóng", "wǔ"),
+        ]:
+            db.add_idiom(idiom)
+        manager = GameManager(GameConfig(difficulty="hard", ai_strategy="search"),
+                              db, None, use_llm_validator=False)
+        manager.start_game("车水马龙")
+        manager.game_state.switch_turn()
+        self.assertEqual(manager.get_ai_response(), "龙飞凤舞")
+        self.assertTrue(manager.last_search.proven)
+        self.assertEqual(manager.check_game_over(), 'ai')
+        db.close()
+
+    def test_homophone_keys_are_sounds(self):
+        """测试同音接龙的接入键都是读音，缺无声调拼音的行也不退回首字"""
+        db = IdiomDatabase(":memory:")
+        from src.data.models import Idiom
+        db.add_idiom(Idiom("车水马龙", "chē shuǐ mǎ lóng", "车", "龙", "chē", "lóng"))
+        db.add_idiom(Idiom("隆冬腊月", "lóng dōng là yuè", "隆", "月", "lóng", "yuè"))
+        with db._connections.write() as conn:
+            conn.execute("UPDATE idioms SET first_pinyin_plain = NULL "
+                         "WHERE word = '隆冬腊月'")
+        try:
+            search = ChainSearch.from_database(db, allow_homophone=True)
+            self.assertNotIn("隆", search.keys)
+            result = search.search(search.key_for("龙", True), time_budget=5)
+            self.assertEqual(result.word, "隆冬腊月")
+        finally:
+            db.close()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,869 @@
+#!/usr/bin/env python3
+"""
+成语数据层性能基准工具
+使用合成词库对比不同数据访问路径的耗时
+
+用法:
+    python tools/benchmark.py chain --size 30000 --turns 2000
+    python tools/benchmark.py import --size 30000
+    python tools/benchmark.py reimport --size 30000
+    python tools/benchmark.py stream --size 100000 --workers 4
+    python tools/benchmark.py random --size 30000 --turns 2000
+    python tools/benchmark.py search --size 30000 --turns 2000
+    python tools/benchmark.py memory --size 30000
+    python tools/benchmark.py snapshot --size 30000 --turns 2000
+    python tools/benchmark.py batch --size 30000 --turns 10000
+    python tools/benchmark.py bloom --size 30000 --turns 10000
+    python tools/benchmark.py deadend --size 30000 --turns 2000
+    python tools/benchmark.py backup --size 30000
+    python tools/benchmark.py cache --size 30000 --turns 10000
+    python tools/benchmark.py hints --size 30000 --turns 2000
+    python tools/benchmark.py covering --size 30000 --turns 2000
+    python tools/benchmark.py pages --size 100000 --turns 200
+    python tools/benchmark.py readonly --size 30000 --turns 2000
+    python tools/benchmark.py inmemory --size 30000 --turns 2000
+    python tools/benchmark.py graph --size 30000 --turns 10000
+    python tools/benchmark.py gametree --size 3000 --turns 20 --budget 0.05
+    python tools/benchmark.py usedset --size 30000 --turns 200
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import List, Optional
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.chain_search import ChainSearch
+from src.data.database import IdiomDatabase, build_idiom, follower_sql
+from src.data.backup import BackupManager
+from src.data.chain_graph import ChainGraph
+from src.data.idiom_ids import IdiomIds
+from src.data.importer import StreamingImporter
+from src.data.idiom_repository import IdiomRepository
+from src.data.models import GameState, Idiom
+from src.data.snapshot import export_snapshot, LexiconSnapshot
+
+
+# 合成词库使用的汉字范围（CJK统一汉字常用区）
+CHAR_POOL_START = 0x4E00
+CHAR_POOL_SIZE = 2500
+
+
+def make_synthetic_idioms(size: int, seed: int = 42) -> List[Idiom]:
+    """
+    生成合成成语数据
+
+    首尾字服从长尾分布，模拟真实词库中"一、不、无"等大桶。
+
+    Args:
+        size: 成语数量
+        seed: 随机种子
+
+    Returns:
+        成语列表
+    """
+    rng = random.Random(seed)
+    chars = [chr(CHAR_POOL_START + i) for i in range(CHAR_POOL_SIZE)]
+    weights = [1.0 / (rank + 1) ** 0.8 for rank in range(CHAR_POOL_SIZE)]
+
+    idioms = []
+    seen = set()
+    while len(idioms) < size:
+        first, last = rng.choices(chars, weights, k=2)
+        middle = ''.join(rng.choices(chars, k=2))
+        word = first + middle + last
+        if word in seen:
+            continue
+        seen.add(word)
+        difficulty = rng.randint(1, 5)
+        idioms.append(Idiom(
+            word=word,
+            pinyin=' '.join(f"p{ord(c):x}" for c in word),
+            first_char=first,
+            last_char=last,
+            first_pinyin=f"p{ord(first):x}",
+            last_pinyin=f"p{ord(last):x}",
+            explanation=f"{word}的解释" * 4,
+            example=f"{word}的例句" * 4,
+            difficulty=difficulty,
+            frequency=float(5 - difficulty)
+        ))
+    return idioms
+
+
+def build_database(idioms: List[Idiom], **kwargs) -> IdiomDatabase:
+    """
+    构建内存基准数据库
+
+    Args:
+        idioms: 成语列表
+        **kwargs: 传递给 IdiomDatabase 的参数
+
+    Returns:
+        数据库实例
+    """
+    db = IdiomDatabase(":memory:", **kwargs)
+    for idiom in idioms:
+        db.add_idiom(idiom)
+    return db
+
+
+def _simulate_turns(repository: IdiomRepository, chars: List[str],
+                    used: set) -> float:
+    """
+    模拟接龙回合中的查询，返回平均每回合耗时（微秒）
+    """
+    start = time.perf_counter()
+    for char in chars:
+        repository.get_possible_following_idioms(char, used)
+        repository.has_possible_following(char, used)
+        repository.get_hints(char, count=1, exclude=used)
+    elapsed = time.perf_counter() - start
+    return elapsed / len(chars) * 1e6
+
+
+def bench_chain(args: argparse.Namespace) -> None:
+    """接龙查询：SQL路径 vs 内存首字索引"""
+    size, turns = args.size, args.turns
+    idioms = make_synthetic_idioms(size)
+    rng = random.Random(7)
+    chars = [rng.choice(idioms).last_char for _ in range(turns)]
+    used = {idiom.word for idiom in rng.sample(idioms, 50)}
+
+    db = build_database(idioms)
+    sql_us = _simulate_turns(IdiomRepository(db), chars, used)
+
+    start = time.perf_counter()
+    db.enable_chain_index()
+    load_ms = (time.perf_counter() - start) * 1000
+    index_us = _simulate_turns(IdiomRepository(db), chars, used)
+    db.close()
+
+    print(f"词库规模: {size}，回合数: {turns}")
+    print(f"  SQL查询     : {sql_us:10.1f} us/回合")
+    print(f"  首字索引    : {index_us:10.1f} us/回合"
+          f"（加载 {load_ms:.1f} ms）")
+    print(f"  加速比      : {sql_us / index_us:10.1f}x")
+
+
+def bench_import(args: argparse.Namespace) -> None:
+    """导入：逐条 add_idiom vs 分块单事务 bulk_import（磁盘数据库）"""
+    idioms = make_synthetic_idioms(args.size)
+    records = [(idiom.word, idiom.explanation, idiom.example,
+                idiom.difficulty, idiom.frequency) for idiom in idioms]
+    # 逐条提交每行一次fsync，只取样本测速
+    sample = records[:min(len(records), 2000)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = IdiomDatabase(str(Path(tmp) / "per_row.db"))
+        start = time.perf_counter()
+        for record in sample:
+            db.add_idiom(build_idiom(*record))
+        per_row_rate = len(sample) / (time.perf_counter() - start)
+        db.close()
+
+        db = IdiomDatabase(str(Path(tmp) / "bulk.db"))
+        start = time.perf_counter()
+        result = db.bulk_import(records)
+        bulk_elapsed = time.perf_counter() - start
+        db.close()
+
+    print(f"词库规模: {args.size}")
+    print(f"  逐条提交    : {per_row_rate:10.0f} 行/秒"
+          f"（预计全量 {args.size / per_row_rate:.1f} 秒）")
+    print(f"  批量导入    : {len(records) / bulk_elapsed:10.0f} 行/秒"
+          f"（全量 {bulk_elapsed:.1f} 秒，{result}）")
+
+
+def bench_reimport(args: argparse.Namespace) -> None:
+    """重复导入（1%记录变化）：INSERT OR IGNORE 全量重跑 vs 内容哈希增量导入"""
+    idioms = make_synthetic_idioms(args.size)
+    records = [(idiom.word, idiom.explanation, idiom.example,
+                idiom.difficulty, idiom.frequency) for idiom in idioms]
+    changed = [(word, f"{explanation}（修订）", example, difficulty, frequency)
+               if i % 100 == 0 else (word, explanation, example, difficulty, frequency)
+               for i, (word, explanation, example, difficulty, frequency)
+               in enumerate(records)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = IdiomDatabase(str(Path(tmp) / "idioms.db"))
+        db.bulk_import(records)
+
+        start = time.perf_counter()
+        db.bulk_import(changed)
+        full_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = db.bulk_import(changed, incremental=True)
+        incremental_elapsed = time.perf_counter() - start
+        db.close()
+
+    print(f"词库规模: {args.size}，变化记录: {result.updated}")
+    print(f"  全量重跑    : {full_elapsed:8.2f} 秒（变化未写入）")
+    print(f"  增量导入    : {incremental_elapsed:8.2f} 秒（{result}）")
+
+
+def bench_stream(args: argparse.Namespace) -> None:
+    """大文件导入：单线程 bulk_import vs 多进程流式导入（磁盘数据库）"""
+    idioms = make_synthetic_idioms(args.size)
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "idioms.jsonl"
+        with open(source, 'w', encoding='utf-8') as f:
+            for idiom in idioms:
+                f.write(json.dumps({'word': idiom.word,
+                                    'explanation': idiom.explanation,
+                                    'difficulty': idiom.difficulty,
+                                    'frequency': idiom.frequency},
+                                   ensure_ascii=False) + '\n')
+
+        db = IdiomDatabase(str(Path(tmp) / "bulk.db"))
+        start = time.perf_counter()
+        with open(source, encoding='utf-8') as f:
+            db.bulk_import((record['word'], record['explanation'], None,
+                            record['difficulty'], record['frequency'])
+                           for record in map(json.loads, f))
+        bulk_elapsed = time.perf_counter() - start
+        db.close()
+
+        db = IdiomDatabase(str(Path(tmp) / "stream.db"))
+        result = StreamingImporter(db, workers=args.workers).import_file(source)
+        db.close()
+
+    print(f"词库规模: {args.size}，工作进程: {args.workers or '同进程'}")
+    print(f"  bulk_import : {args.size / bulk_elapsed:10.0f} 行/秒")
+    print(f"  流式导入    : {result.rows_per_second:10.0f} 行/秒")
+
+
+def bench_random(args: argparse.Namespace) -> None:
+    """随机起始成语：ORDER BY RANDOM() vs 预加载id数组抽样"""
+    db = build_database(make_synthetic_idioms(args.size))
+    cursor = db.conn.cursor()
+
+    start = time.perf_counter()
+    for _ in range(args.turns):
+        cursor.execute("SELECT word FROM idioms WHERE difficulty = ? "
+                       "ORDER BY RANDOM() LIMIT 1", (3,))
+        cursor.fetchone()
+    order_by_us = (time.perf_counter() - start) / args.turns * 1e6
+
+    start = time.perf_counter()
+    for _ in range(args.turns):
+        db.get_random_idiom(3)
+    sampler_us = (time.perf_counter() - start) / args.turns * 1e6
+    db.close()
+
+    print(f"词库规模: {args.size}，抽样次数: {args.turns}")
+    print(f"  ORDER BY RANDOM(): {order_by_us:10.1f} us/次")
+    print(f"  id数组抽样       : {sampler_us:10.1f} us/次")
+
+
+def bench_search(args: argparse.Namespace) -> None:
+    """关键词搜索：LIKE全表扫描 vs FTS5 trigram全文索引"""
+    idioms = make_synthetic_idioms(args.size)
+    db = build_database(idioms)
+    rng = random.Random(7)
+    keywords = [rng.choice(idioms).word[:3] for _ in range(args.turns)]
+    cursor = db.conn.cursor()
+
+    start = time.perf_counter()
+    for keyword in keywords:
+        pattern = f'%{keyword}%'
+        cursor.execute("SELECT word FROM idioms WHERE word LIKE ? "
+                       "OR explanation LIKE ? OR example LIKE ? LIMIT 10",
+                       (pattern, pattern, pattern))
+        cursor.fetchall()
+    like_us = (time.perf_counter() - start) / args.turns * 1e6
+
+    start = time.perf_counter()
+    for keyword in keywords:
+        db.search_full_text(keyword)
+    fts_us = (time.perf_counter() - start) / args.turns * 1e6
+    db.close()
+
+    print(f"词库规模: {args.size}，查询次数: {args.turns}")
+    print(f"  LIKE扫描    : {like_us:10.1f} us/次")
+    print(f"  FTS5全文索引: {fts_us:10.1f} us/次")
+
+
+@dataclass
+class _DictIdiom:
+    """旧版成语模型：普通dataclass，每个实例带 __dict__"""
+
+    word: str
+    pinyin: str
+    first_char: str
+    last_char: str
+    first_pinyin: str
+    last_pinyin: str
+    explanation: Optional[str] = None
+    example: Optional[str] = None
+    difficulty: int = 1
+    frequency: float = 0.0
+
+
+def _measure(build) -> float:
+    """测量构建对象的常驻内存（MB），构建结果在测量期间保持存活"""
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return size / 1024 / 1024
+
+
+def bench_memory(args: argparse.Namespace) -> None:
+    """整个词库常驻内存：旧dataclass vs slots Idiom vs 紧凑词库"""
+    db = build_database(make_synthetic_idioms(args.size))
+    columns = ', '.join(field.name for field in fields(Idiom))
+
+    def load_all(model):
+        cursor = db.conn.cursor()
+        cursor.execute(f"SELECT {columns} FROM idioms ORDER BY id")
+        return [model(*row) for row in cursor]
+
+    dict_mb = _measure(lambda: load_all(_DictIdiom))
+    slots_mb = _measure(lambda: load_all(Idiom))
+    index_mb = _measure(lambda: db.enable_chain_index())
+    db.close()
+
+    print(f"词库规模: {args.size}")
+    print(f"  dataclass(__dict__)    : {dict_mb:8.1f} MB")
+    print(f"  dataclass(slots=True)  : {slots_mb:8.1f} MB")
+    print(f"  紧凑词库+首字索引      : {index_mb:8.1f} MB（解释/例句按需加载）")
+
+
+def bench_snapshot(args: argparse.Namespace) -> None:
+    """启动：打开SQLite并构建首字索引 vs mmap加载二进制快照"""
+    idioms = make_synthetic_idioms(args.size)
+    rng = random.Random(7)
+    chars = [rng.choice(idioms).last_char for _ in range(args.turns)]
+    words = [rng.choice(idioms).word for _ in range(args.turns)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "idioms.db")
+        snapshot_path = Path(tmp) / "idioms.lexicon"
+        db = IdiomDatabase(db_path)
+        db.bulk_import((idiom.word, idiom.explanation, idiom.example,
+                        idiom.difficulty, idiom.frequency) for idiom in idioms)
+        export_snapshot(db, snapshot_path)
+        db.close()
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        db = IdiomDatabase(db_path, use_chain_index=True)
+        sql_start_ms = (time.perf_counter() - start) * 1000
+        sql_mb = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+        tracemalloc.stop()
+        start = time.perf_counter()
+        for char, word in zip(chars, words):
+            db.get_idioms_by_starting_char(char)
+            db.is_valid_idiom(word)
+        sql_us = (time.perf_counter() - start) / args.turns * 1e6
+        db.close()
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        snapshot = LexiconSnapshot(snapshot_path)
+        snap_start_ms = (time.perf_counter() - start) * 1000
+        snap_mb = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+        tracemalloc.stop()
+        start = time.perf_counter()
+        for char, word in zip(chars, words):
+            snapshot.find_by_starting_char(char)
+            snapshot.exists(word)
+        snap_us = (time.perf_counter() - start) / args.turns * 1e6
+        snapshot.close()
+
+    print(f"词库规模: {args.size}，查询次数: {args.turns}")
+    print(f"  SQLite+首字索引: 启动 {sql_start_ms:8.1f} ms，"
+          f"堆内存 {sql_mb:6.2f} MB，查询 {sql_us:6.1f} us/次")
+    print(f"  mmap快照       : 启动 {snap_start_ms:8.1f} ms，"
+          f"堆内存 {snap_mb:6.2f} MB，查询 {snap_us:6.1f} us/次")
+
+
+def bench_batch(args: argparse.Namespace) -> None:
+    """批量查询：逐个 is_valid_idiom/get_idiom_by_name vs exists_many/get_many"""
+    idioms = make_synthetic_idioms(args.size)
+    rng = random.Random(7)
+    # 一半命中、一半未命中
+    words = [rng.choice(idioms).word if i % 2 else f"不存在{i}"
+             for i in range(args.turns)]
+    db = build_database(idioms)
+
+    def timed(func) -> float:
+        start = time.perf_counter()
+        func()
+        return (time.perf_counter() - start) * 1000
+
+    single_exists = timed(lambda: [db.is_valid_idiom(word) for word in words])
+    batch_exists = timed(lambda: db.exists_many(words))
+    single_get = timed(lambda: [db.get_idiom_by_name(word) for word in words])
+    batch_get = timed(lambda: db.get_many(words))
+    db.enable_chain_index()
+    index_exists = timed(lambda: db.exists_many(words))
+    db.close()
+
+    print(f"词库规模: {args.size}，批量大小: {args.turns}")
+    print(f"  逐个 is_valid_idiom : {single_exists:8.1f} ms")
+    print(f"  exists_many (SQL)   : {batch_exists:8.1f} ms")
+    print(f"  exists_many (索引)  : {index_exists:8.1f} ms")
+    print(f"  逐个 get_idiom_by_name: {single_get:6.1f} ms")
+    print(f"  get_many            : {batch_get:8.1f} ms")
+
+
+def bench_bloom(args: argparse.Namespace) -> None:
+    """成语验证（90%为不存在的输入，磁盘数据库）：直接查SQL vs 布隆过滤器前置"""
+    idioms = make_synthetic_idioms(args.size)
+    rng = random.Random(7)
+    words = [rng.choice(idioms).word if i % 10 == 0 else f"幻觉成语{i}"
+             for i in range(args.turns)]
+    tmp = tempfile.TemporaryDirectory()
+    db = IdiomDatabase(str(Path(tmp.name) / "idioms.db"))
+    db.bulk_import((idiom.word, idiom.explanation, idiom.example,
+                    idiom.difficulty, idiom.frequency) for idiom in idioms)
+
+    start = time.perf_counter()
+    for word in words:
+        db.is_valid_idiom(word)
+    sql_us = (time.perf_counter() - start) / len(words) * 1e6
+
+    db.enable_bloom_filter(args.fp_rate, args.bloom_capacity)
+    start = time.perf_counter()
+    for word in words:
+        db.is_valid_idiom(word)
+    bloom_us = (time.perf_counter() - start) / len(words) * 1e6
+    stats = db.get_bloom_filter_stats()
+    db.close()
+    tmp.cleanup()
+
+    misses = sum(1 for word in words if word.startswith("幻觉"))
+    print(f"词库规模: {args.size}，验证次数: {args.turns}（不存在 {misses}）")
+    print(f"  直接查SQL   : {sql_us:8.2f} us/次")
+    print(f"  布隆过滤器  : {bloom_us:8.2f} us/次")
+    print(f"  过滤器 {stats['memory_bytes'] / 1024:.1f} KB，"
+          f"{stats['num_hashes']} 个哈希，目标误判率 {stats['target_fp_rate']:.2%}，"
+          f"预计 {stats['expected_fp_rate']:.3%}，"
+          f"实测 {(misses - stats['rejected']) / misses:.3%}")
+
+
+def bench_deadend(args: argparse.Namespace) -> None:
+    """死局检测：加载接龙列表逐个比对 vs 物化接龙数量"""
+    idioms = make_synthetic_idioms(args.size)
+    rng = random.Random(7)
+    chars = [rng.choice(idioms).last_char for _ in range(args.turns)]
+    used = {idiom.word for idiom in rng.sample(idioms, 50)}
+    db = build_database(idioms)
+    repository = IdiomRepository(db)
+
+    def per_turn(check) -> float:
+        start = time.perf_counter()
+        for char in chars:
+            check(char)
+        return (time.perf_counter() - start) / len(chars) * 1e6
+
+    def scan(char):
+        return any(idiom.word not in used
+                   for idiom in repository.find_by_starting_char(char))
+
+    def counted(char):
+        return repository.has_possible_following(char, used)
+
+    sql_scan = per_turn(scan)
+    sql_count = per_turn(counted)
+    db.enable_chain_index()
+    index_scan = per_turn(scan)
+    index_count = per_turn(counted)
+    db.close()
+
+    print(f"词库规模: {args.size}，回合数: {args.turns}，已用 {len(used)} 个")
+    print(f"  SQL  列表比对 : {sql_scan:8.2f} us/次")
+    print(f"  SQL  统计表   : {sql_count:8.2f} us/次")
+    print(f"  索引 列表比对 : {index_scan:8.2f} us/次")
+    print(f"  索引 桶计数   : {index_count:8.2f} us/次")
+
+
+def bench_backup(args: argparse.Namespace) -> None:
+    """在线备份：一次性复制 vs 分步复制，并测量备份期间的写入延迟"""
+    idioms = make_synthetic_idioms(args.size)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = IdiomDatabase(str(Path(tmp) / "idioms.db"))
+        db.bulk_import((idiom.word, idiom.explanation, idiom.example,
+                        idiom.difficulty, idiom.frequency) for idiom in idioms)
+
+        for label, pages, sleep in (("一次性复制", -1, 0), ("分步复制", 64, 0.002)):
+            manager = BackupManager(db.db_path, Path(tmp) / "backups",
+                                    pages_per_step=pages, step_sleep=sleep)
+            manager.start()
+            latencies = []
+            i = 0
+            while not manager.wait(0):
+                start = time.perf_counter()
+                db.add_idiom(build_idiom(f"测试写入{label}{i}"))
+                latencies.append((time.perf_counter() - start) * 1000)
+                i += 1
+            manager.wait()
+            result = manager.last_result
+            latencies.sort()
+            worst = latencies[-1] if latencies else 0.0
+            print(f"  {label}: 耗时 {result.duration * 1000:7.1f} ms，"
+                  f"{result.steps} 步，最长持锁 {result.max_lock_time * 1000:6.2f} ms，"
+                  f"期间写入 {len(latencies)} 次，最慢 {worst:6.2f} ms")
+        db.close()
+
+
+def bench_cache(args: argparse.Namespace) -> None:
+    """重复查询（300个热点成语）：直连数据库 vs 仓库LRU缓存"""
+    idioms = make_synthetic_idioms(args.size)
+    rng = random.Random(7)
+    hot = [idiom.word for idiom in rng.sample(idioms, 300)]
+    words = [rng.choice(hot) for _ in range(args.turns)]
+    db = build_database(idioms)
+
+    def per_lookup(repository: IdiomRepository) -> float:
+        start = time.perf_counter()
+        for word in words:
+            repository.find_by_word(word)
+            repository.find_by_starting_char(word[-1])
+        return (time.perf_counter() - start) / len(words) * 1e6
+
+    plain_us = per_lookup(IdiomRepository(db, cache_size=0))
+    cached = IdiomRepository(db, cache_size=1024)
+    cached_us = per_lookup(cached)
+    stats = cached.get_cache_stats()
+    db.close()
+
+    print(f"词库规模: {args.size}，查询次数: {args.turns}")
+    print(f"  直连数据库  : {plain_us:8.2f} us/次")
+    print(f"  LRU缓存     : {cached_us:8.2f} us/次"
+          f"（命中率 {stats['hit_rate']:.1%}，淘汰 {stats['evictions']}）")
+
+
+def bench_hints(args: argparse.Namespace) -> None:
+    """取1个提示（SQL路径）：取出整组后过滤 vs 排除感知的限量查询"""
+    idioms = make_synthetic_idioms(args.size)
+    rng = random.Random(7)
+    chars = [rng.choice(idioms).last_char for _ in range(args.turns)]
+    used = {idiom.word for idiom in rng.sample(idioms, 50)}
+    db = build_database(idioms)
+
+    def per_turn(func) -> float:
+        start = time.perf_counter()
+        for char in chars:
+            func(char)
+        return (time.perf_counter() - start) / len(chars) * 1e6
+
+    full_us = per_turn(lambda char: [
+        idiom.word for idiom in db.get_idioms_by_starting_char(char)
+        if idiom.word not in used
+    ][:1])
+    limited_us = per_turn(lambda char: db.get_unused_followers(char, used, limit=1))
+    db.close()
+
+    print(f"词库规模: {args.size}，回合数: {args.turns}")
+    print(f"  整组过滤    : {full_us:8.2f} us/次")
+    print(f"  限量查询    : {limited_us:8.2f} us/次")
+
+
+def bench_covering(args: argparse.Namespace) -> None:
+    """按首字取接龙组（SQL路径）：单列索引+排序 vs 覆盖索引完整行 vs 覆盖索引只取词语"""
+    idioms = make_synthetic_idioms(args.size)
+    rng = random.Random(7)
+    chars = [rng.choice(idioms).last_char for _ in range(args.turns)]
+    db = build_database(idioms)
+    conn = db.conn
+    conn.execute("CREATE INDEX idx_first_char ON idioms(first_char)")
+    legacy_sql = follower_sql('first_char').replace(
+        "FROM idioms", "FROM idioms INDEXED BY idx_first_char")
+    full_sql = follower_sql('first_char')
+    words_sql = follower_sql('first_char', words_only=True)
+
+    def per_turn(sql: str) -> float:
+        start = time.perf_counter()
+        for char in chars:
+            conn.execute(sql, (char,)).fetchall()
+        return (time.perf_counter() - start) / len(chars) * 1e6
+
+    def plan(sql: str) -> str:
+        rows = conn.execute("EXPLAIN QUERY PLAN " + sql, ("龙",)).fetchall()
+        return " | ".join(row[3] for row in rows)
+
+    results = [(name, per_turn(sql), plan(sql)) for name, sql in (
+        ("单列索引+排序", legacy_sql),
+        ("覆盖索引完整行", full_sql),
+        ("覆盖索引词语", words_sql),
+    )]
+    db.close()
+
+    print(f"词库规模: {args.size}，回合数: {args.turns}")
+    for name, us, query_plan in results:
+        print(f"  {name:<8}: {us:8.2f} us/次  {query_plan}")
+
+
+def bench_pages(args: argparse.Namespace) -> None:
+    """最大首字分组：整组列表 vs 分页首页 vs 分页遍历全部"""
+    idioms = make_synthetic_idioms(args.size)
+    db = build_database(idioms)
+    char = max({i.first_char for i in idioms}, key=db.get_follower_count)
+    bucket = db.get_follower_count(char)
+
+    def per_call(func) -> float:
+        start = time.perf_counter()
+        for _ in range(args.turns):
+            func()
+        return (time.perf_counter() - start) / args.turns * 1e3
+
+    full_ms = per_call(lambda: db.get_idioms_by_starting_char(char))
+    first_ms = per_call(lambda: db.get_followers_page(char, page_size=20))
+    walk_ms = per_call(lambda: sum(1 for _ in db.iter_followers(char, page_size=100)))
+    db.close()
+
+    print(f"词库规模: {args.size}，分组 '{char}' 大小: {bucket}，重复: {args.turns}")
+    print(f"  整组列表    : {full_ms:8.3f} ms/次")
+    print(f"  分页首页(20): {first_ms:8.3f} ms/次")
+    print(f"  分页遍历全部: {walk_ms:8.3f} ms/次")
+
+
+def bench_readonly(args: argparse.Namespace) -> None:
+    """发布词库：读写模式 vs 只读不可变模式的打开耗时与查询耗时"""
+    idioms = make_synthetic_idioms(args.size)
+    rng = random.Random(7)
+    words = [rng.choice(idioms).word for _ in range(args.turns)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "idioms.db")
+        db = IdiomDatabase(path)
+        db.bulk_import((idiom.word, idiom.explanation, idiom.example,
+                        idiom.difficulty, idiom.frequency) for idiom in idioms)
+        db.freeze()
+        db.close()
+
+        print(f"词库规模: {args.size}，查询次数: {args.turns}")
+        for label, read_only in (("读写模式", False), ("只读模式", True)):
+            start = time.perf_counter()
+            db = IdiomDatabase(path, read_only=read_only)
+            open_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            for word in words:
+                db.get_idiom_by_name(word)
+                db.get_unused_follower_words(word[-1], limit=3)
+            query_us = (time.perf_counter() - start) / len(words) * 1e6
+            db.close()
+            print(f"  {label}: 打开 {open_ms:7.2f} ms，查询 {query_us:8.2f} us/次")
+
+
+def bench_inmemory(args: argparse.Namespace) -> None:
+    """磁盘模式 vs 内存副本：冷启动耗时（含复制）与查询/写入延迟"""
+    idioms = make_synthetic_idioms(args.size)
+    rng = random.Random(7)
+    words = [rng.choice(idioms).word for _ in range(args.turns)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "idioms.db")
+        db = IdiomDatabase(path)
+        db.bulk_import((idiom.word, idiom.explanation, idiom.example,
+                        idiom.difficulty, idiom.frequency) for idiom in idioms)
+        db.derived.wait()
+        db.close()
+
+        print(f"词库规模: {args.size}，查询次数: {args.turns}")
+        for label, options in (("磁盘模式", {}),
+                               ("内存副本", {'in_memory': True}),
+                               ("内存+写回", {'in_memory': True, 'write_through': True})):
+            start = time.perf_counter()
+            db = IdiomDatabase(path, **options)
+            open_ms = (time.perf_counter() - start) * 1000
+            copy_ms = db.memory_load.duration * 1000 if db.memory_load else 0.0
+
+            start = time.perf_counter()
+            for word in words:
+                db.get_idiom_by_name(word)
+                db.get_unused_follower_words(word[-1], limit=3)
+            query_us = (time.perf_counter() - start) / len(words) * 1e6
+
+            start = time.perf_counter()
+            for i in range(100):
+                db.add_idiom(build_idiom(f"基准写入{label}{i}"))
+            write_us = (time.perf_counter() - start) / 100 * 1e6
+            db.close()
+            print(f"  {label}: 启动 {open_ms:7.2f} ms（复制 {copy_ms:6.2f} ms），"
+                  f"查询 {query_us:8.2f} us/次，写入 {write_us:8.2f} us/次")
+
+
+def bench_graph(args: argparse.Namespace) -> None:
+    """接龙图：构建与缓存加载耗时，以及结构查询与SQL死路判断的延迟"""
+    idioms = make_synthetic_idioms(args.size)
+    rng = random.Random(7)
+    chars = [rng.choice(idioms).last_char for _ in range(args.turns)]
+    with tempfile.TemporaryDirectory() as tmp:
+        db = build_database(idioms)
+        path = Path(tmp) / "idioms.chaingraph"
+
+        start = time.perf_counter()
+        graph = ChainGraph.load_or_build(db, path)
+        build_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        ChainGraph.load_or_build(db, path)
+        load_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        graph.can_reach(chars[0], chars[1])
+        reach_ms = (time.perf_counter() - start) * 1000
+
+        print(f"词库规模: {args.size}，{len(graph)} 个字，{graph.edge_count} 条边，"
+              f"{graph.component_count} 个强连通分量（最大 "
+              f"{len(graph.largest_component())} 个字），{len(graph.sinks())} 个死路字")
+        print(f"  构建并写缓存 {build_ms:7.2f} ms，读取缓存 {load_ms:7.2f} ms，"
+              f"可达位集 {reach_ms:7.2f} ms")
+
+        def timed(label, query):
+            start = time.perf_counter()
+            for i, char in enumerate(chars):
+                query(char, chars[i - 1])
+            per_call = (time.perf_counter() - start) / len(chars) * 1e6
+            print(f"  {label}: {per_call:8.2f} us/次")
+
+        timed("SQL死路判断", lambda char, _: db.get_follower_count(char) == 0)
+        timed("图死路判断", lambda char, _: graph.is_sink(char))
+        timed("3步接龙数", lambda char, _: graph.step_count(char, 3))
+        timed("可达判断", graph.can_reach)
+        db.close()
+
+
+def bench_gametree(args: argparse.Namespace) -> None:
+    """搜索AI对局：博弈树搜索 vs 原困难备选（取最不常用的接龙成语），统计胜负与搜索速度"""
+    idioms = make_synthetic_idioms(args.size)
+    db = build_database(idioms)
+    repository = IdiomRepository(db)
+    search = ChainSearch.from_database(db)
+    rng = random.Random(7)
+    max_moves = 300
+
+    wins = {'search': 0, 'baseline': 0, 'undecided': 0}
+    depths, speeds = [], []
+    for game in range(args.turns):
+        used = set()
+        word = rng.choice(idioms).word
+        used.add(word)
+        mover = 'search' if game % 2 == 0 else 'baseline'
+        for _ in range(max_moves):
+            if mover == 'search':
+                result = search.search(word[-1], used, time_budget=args.budget)
+                word = result.word
+                if word:
+                    depths.append(result.depth)
+                    speeds.append(result.nodes_per_second)
+            else:
+                words = repository.find_unused_follower_words(word[-1], used)
+                word = words[-1] if words else None
+            if word is None:
+                wins['baseline' if mover == 'search' else 'search'] += 1
+                break
+            used.add(word)
+            mover = 'baseline' if mover == 'search' else 'search'
+        else:
+            wins['undecided'] += 1
+
+    print(f"词库规模: {args.size}，对局数: {args.turns}，每步预算 {args.budget * 1000:.0f} ms")
+    print(f"  搜索AI胜 {wins['search']}，原备选胜 {wins['baseline']}，"
+          f"{max_moves}步未分胜负 {wins['undecided']}")
+    if depths:
+        print(f"  平均深度 {sum(depths) / len(depths):.1f}（最深 {max(depths)}），"
+              f"平均 {sum(speeds) / len(speeds):,.0f} 节点/秒，共 {len(depths)} 步")
+    db.close()
+
+
+def bench_usedset(args: argparse.Namespace) -> None:
+    """已用成语：字符串集合 vs 编号位集的成员判断、复制局面和局面哈希"""
+    words = [idiom.word for idiom in make_synthetic_idioms(args.size)]
+    ids = IdiomIds(words)
+    rng = random.Random(7)
+    played = rng.sample(words, args.turns)
+    probes = [rng.choice(words) for _ in range(10000)]
+    repeat = 10000
+
+    def timed(label, func, count):
+        start = time.perf_counter()
+        func()
+        per_call = (time.perf_counter() - start) / count * 1e6
+        print(f"    {label}: {per_call:8.3f} us/次")
+
+    print(f"词库规模: {args.size}，已用成语: {args.turns}")
+    baseline = GameState()
+    baseline.used_idioms = set()
+    state = GameState(ids)
+    for word in played:
+        baseline.add_idiom(word)
+        state.add_idiom(word)
+
+    def copy_baseline():
+        # 原先的做法：字符串集合整体复制
+        other = GameState.__new__(GameState)
+        other.__dict__.update(baseline.__dict__)
+        other.used_idioms = set(baseline.used_idioms)
+        other.used_first_chars = baseline.used_first_chars.copy()
+        return other
+
+    for label, target, copy, key in (
+            ("字符串集合", baseline, copy_baseline,
+             lambda: (baseline.last_idiom, baseline.is_player_turn,
+                      frozenset(baseline.used_idioms))),
+            ("编号位集", state, state.copy, state.key)):
+        used = target.used_idioms
+        print(f"  {label}:")
+        timed("成员判断", lambda: [word in used for word in probes], len(probes))
+        timed("复制局面", lambda: [copy() for _ in range(repeat)], repeat)
+        timed("局面哈希", lambda: [hash(key()) for _ in range(repeat)], repeat)
+
+
+BENCHMARKS = {
+    'chain': bench_chain,
+    'import': bench_import,
+    'reimport': bench_reimport,
+    'stream': bench_stream,
+    'random': bench_random,
+    'search': bench_search,
+    'memory': bench_memory,
+    'snapshot': bench_snapshot,
+    'batch': bench_batch,
+    'bloom': bench_bloom,
+    'deadend': bench_deadend,
+    'backup': bench_backup,
+    'cache': bench_cache,
+    'hints': bench_hints,
+    'covering': bench_covering,
+    'pages': bench_pages,
+    'readonly': bench_readonly,
+    'inmemory': bench_inmemory,
+    'graph': bench_graph,
+    'gametree': bench_gametree,
+    'usedset': bench_usedset,
+}
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="成语数据层性能基准")
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS),
+                        help="要运行的基准")
+    parser.add_argument('--size', type=int, default=30000, help="合成词库规模")
+    parser.add_argument('--turns', type=int, default=2000, help="模拟回合数")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="流式导入的工作进程数，默认CPU核数")
+    parser.add_argument('--fp-rate', type=float, default=0.01,
+                        help="布隆过滤器目标误判率")
+    parser.add_argument('--bloom-capacity', type=int, default=None,
+                        help="布隆过滤器预留容量，默认成语数的两倍")
+    parser.add_argument('--budget', type=float, default=0.05,
+                        help="搜索AI每步的时间预算（秒）")
+    args = parser.parse_args()
+
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == '__main__':
+    main()
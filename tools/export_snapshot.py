@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+词库快照导出工具
+将SQLite词库导出为可mmap加载的二进制快照
+
+用法:
+    python tools/export_snapshot.py [数据库路径] [快照路径]
+"""
+
+import sys
+import time
+import logging
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.database import IdiomDatabase
+from src.data.snapshot import export_snapshot, snapshot_path_for, LexiconSnapshot
+
+
+def main():
+    """主函数"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "resources/idioms.db"
+    snapshot_path = sys.argv[2] if len(sys.argv) > 2 else snapshot_path_for(db_path)
+
+    db = IdiomDatabase(db_path)
+    start = time.perf_counter()
+    count = export_snapshot(db, snapshot_path)
+    db.close()
+    logging.info(f"导出 {count} 个成语，用时 {time.perf_counter() - start:.2f} 秒")
+
+    # 校验导出结果
+    snapshot = LexiconSnapshot(snapshot_path, verify=True)
+    logging.info(f"快照校验通过: {snapshot_path}"
+                 f"（{len(snapshot)} 个成语，{snapshot.char_count} 个首字）")
+    snapshot.close()
+
+
+if __name__ == '__main__':
+    main()
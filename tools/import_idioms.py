@@ -1,9 +1,13 @@
 """
 成语数据导入工具
-用于将成语数据导入到数据库中
+用于将成语数据导入到数据库中，重复运行时只处理新增或变化的成语
+
+用法:
+    python tools/import_idioms.py [成语文件 ...]
 """
 
 import sys
+import hashlib
 import logging
 from pathlib import Path
 
@@ -11,7 +15,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.data.database import IdiomDatabase
-from src.utils.pinyin import PinyinUtils
+from src.data.models import ImportResult
 
 
 # 常用成语数据（包含拼音和解释）
@@ -358,71 +362,58 @@ IDIOM_CHAINS = {
 }
 
 
+def records_checksum(records) -> str:
+    """计算内置成语数据的校验和，数据未改动时重复导入可直接跳过"""
+    return hashlib.sha256(repr(records).encode('utf-8')).hexdigest()
+
+
+def log_result(name: str, result: ImportResult) -> None:
+    """输出导入差异摘要"""
+    logging.info(f"{name}: 新增 {result.inserted}，更新 {result.updated}，"
+                 f"未变化 {result.unchanged}，跳过 {result.skipped}，"
+                 f"重复 {result.duplicates}")
+
+
 def import_common_idioms(db: IdiomDatabase):
     """导入常用成语"""
     logging.info("开始导入常用成语...")
-    count = 0
-
-    for word, explanation, difficulty in COMMON_IDIOMS:
-        # 生成拼音
-        pinyin = PinyinUtils.get_pinyin(word, style='tone')
-        first_char = word[0]
-        last_char = word[-1]
-        first_pinyin = PinyinUtils.get_first_char_pinyin(first_char)
-        last_pinyin = PinyinUtils.get_first_char_pinyin(last_char)
-
-        from src.data.models import Idiom
-        idiom = Idiom(
-            word=word,
-            pinyin=pinyin,
-            first_char=first_char,
-            last_char=last_char,
-            first_pinyin=first_pinyin,
-            last_pinyin=last_pinyin,
-            explanation=explanation,
-            difficulty=difficulty,
-            frequency=float(5 - difficulty)  # 简单的频率计算
-        )
-
-        if db.add_idiom(idiom):
-            count += 1
-
-    logging.info(f"成功导入 {count} 个常用成语")
-    return count
+
+    result = db.import_source(
+        "builtin:common",
+        ((word, explanation, None, difficulty, float(5 - difficulty))  # 简单的频率计算
+         for word, explanation, difficulty in COMMON_IDIOMS),
+        records_checksum(COMMON_IDIOMS)
+    )
+
+    log_result("常用成语", result)
+    return result.inserted
 
 
 def import_chain_idioms(db: IdiomDatabase):
     """导入接龙成语"""
     logging.info("开始导入接龙成语...")
-    count = 0
-
-    for starting_char, idiom_list in IDIOM_CHAINS.items():
-        for word, explanation, difficulty in idiom_list:
-            # 生成拼音
-            pinyin = PinyinUtils.get_pinyin(word, style='tone')
-            first_char = word[0]
-            last_char = word[-1]
-            first_pinyin = PinyinUtils.get_first_char_pinyin(first_char)
-            last_pinyin = PinyinUtils.get_first_char_pinyin(last_char)
-
-            from src.data.models import Idiom
-            idiom = Idiom(
-                word=word,
-                pinyin=pinyin,
-                first_char=first_char,
-                last_char=last_char,
-                first_pinyin=first_pinyin,
-                last_pinyin=last_pinyin,
-                explanation=explanation,
-                difficulty=difficulty,
-                frequency=float(5 - difficulty)
-            )
-
-            if db.add_idiom(idiom):
-                count += 1
-
-    logging.info(f"成功导入 {count} 个接龙成语")
-    return count
+
+    result = db.import_source(
+        "builtin:chains",
+        ((word, explanation, None, difficulty, float(5 - difficulty))
+         for idiom_list in IDIOM_CHAINS.values()
+         for word, explanation, difficulty in idiom_list),
+        records_checksum(IDIOM_CHAINS)
+    )
+
+    log_result("接龙成语", result)
+    return result.inserted
+
+
+def import_files(db: IdiomDatabase, paths):
+    """导入命令行指定的成语文件（格式：成语,拼音,解释,例句）"""
+    total = 0
+    for path in paths:
+        logging.info(f"开始导入文件: {path}")
+        result = db.import_file(path)
+        log_result(path, result)
+        total += result.inserted
+    return total
 
 
 def main():
@@ -444,15 +435,15 @@ def main():
     total_count = 0
     total_count += import_common_idioms(db)
     total_count += import_chain_idioms(db)
+    total_count += import_files(db, sys.argv[1:])
 
-    logging.info(f"总共导入 {total_count} 个成语")
+    logging.info(f"总共新增 {total_count} 个成语")
     logging.info(f"数据库现有 {db.get_total_count()} 个成语")
 
     # 测试查询
     logging.info("\n测试查询功能:")
     test_queries = ["车水马龙", "龙马精神", "马到成功"]
-    for query in test_queries:
-        idiom = db.get_idiom_by_name(query)
+    for query, idiom in zip(test_queries, db.get_many(test_queries)):
         if idiom:
             logging.info(f"  ✓ {query}: {idiom.explanation}")
         else:
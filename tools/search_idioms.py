@@ -12,6 +12,31 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.data.database import IdiomDatabase
 
 
+PAGE_SIZE = 20
+
+
+def show_by_starting_char(db: IdiomDatabase, char: str) -> None:
+    """按首字分页显示成语，每页读取后等待确认，大分组也无需一次全部加载"""
+    total = db.get_follower_count(char)
+    if not total:
+        print(f"\n没有找到以'{char}'字开头的成语")
+        return
+
+    print(f"\n以'{char}'字开头的成语 ({total}个):")
+    cursor = None
+    shown = 0
+    while True:
+        page = db.get_followers_page(char, cursor, page_size=PAGE_SIZE)
+        for idiom in page.items:
+            shown += 1
+            print(f"  {shown}. {idiom.word} - {idiom.explanation}")
+        if not page.has_more:
+            return
+        if input(f"-- 已显示 {shown}/{total}，回车继续，q 返回: ").strip().lower() == 'q':
+            return
+        cursor = page.cursor
+
+
 def search_idioms():
     """搜索成语"""
     db = IdiomDatabase('resources/idioms.db')
@@ -26,21 +51,16 @@ def search_idioms():
         print("1. 按首字搜索")
         print("2. 按尾字搜索")
         print("3. 搜索包含特定字的成语")
-        print("4. 显示所有可用的起始字")
-        print("5. 退出")
+        print("4. 全文搜索（成语/解释/例句）")
+        print("5. 显示所有可用的起始字")
+        print("6. 退出")
 
-        choice = input("\n请输入选项 (1-5): ").strip()
+        choice = input("\n请输入选项 (1-6): ").strip()
 
         if choice == '1':
             char = input("请输入首字: ").strip()
             if char:
-                idioms = db.get_idioms_by_starting_char(char)
-                if idioms:
-                    print(f"\n以'{char}'字开头的成语 ({len(idioms)}个):")
-                    for i, idiom in enumerate(idioms, 1):
-                        print(f"  {i}. {idiom.word} - {idiom.explanation}")
-                else:
-                    print(f"\n没有找到以'{char}'字开头的成语")
+                show_by_starting_char(db, char)
 
         elif choice == '2':
             # 按尾字搜索
@@ -75,6 +95,17 @@ def search_idioms():
                     print(f"\n没有找到包含'{keyword}'的成语")
 
         elif choice == '4':
+            keyword = input("请输入关键词: ").strip()
+            if keyword:
+                idioms = db.search_full_text(keyword, limit=20)
+                if idioms:
+                    print(f"\n与'{keyword}'相关的成语 (按相关度，最多显示20个):")
+                    for i, idiom in enumerate(idioms, 1):
+                        print(f"  {i}. {idiom.word} - {idiom.explanation}")
+                else:
+                    print(f"\n没有找到与'{keyword}'相关的成语")
+
+        elif choice == '5':
             # 显示所有可用的起始字
             import sqlite3
             from collections import Counter
@@ -94,7 +125,7 @@ def search_idioms():
             for char, count in char_count.most_common():
                 print(f"  {char}: {count}个")
 
-        elif choice == '5':
+        elif choice == '6':
             print("\n再见！")
             break
 
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+大规模成语流式导入工具
+逐行读取CSV/TSV/JSONL文件，多进程计算拼音，单线程批量写入
+
+用法:
+    python tools/stream_import.py 成语文件 [--db 数据库路径] [--workers N] [--chunk-size N]
+
+CSV/TSV首行含 word 列时按表头取值（word, explanation, example, difficulty, frequency），
+否则按 成语,拼音,解释,例句 的位置取值；JSONL每行一个同名字段的对象。
+"""
+
+import sys
+import logging
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.database import IdiomDatabase
+from src.data.importer import StreamingImporter, FORMATS
+
+
+def main():
+    """主函数"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description="成语流式导入")
+    parser.add_argument('file', help="成语文件")
+    parser.add_argument('--db', default="resources/idioms.db", help="数据库路径")
+    parser.add_argument('--format', choices=sorted(set(FORMATS.values())),
+                        help="文件格式，默认按后缀判断")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="工作进程数，默认CPU核数")
+    parser.add_argument('--chunk-size', type=int, default=2000, help="每块行数")
+    parser.add_argument('--word-length', type=int, default=None,
+                        help="只导入指定字数的成语")
+    args = parser.parse_args()
+
+    def report(result):
+        logging.info(f"已处理 {result.total} 行（新增 {result.inserted}）")
+
+    db = IdiomDatabase(args.db)
+    importer = StreamingImporter(db, workers=args.workers,
+                                 chunk_size=args.chunk_size, progress=report)
+    result = importer.import_file(args.file, args.format, args.word_length)
+    logging.info(f"导入完成: {result}，用时 {result.elapsed:.2f} 秒，"
+                 f"{result.rows_per_second:.0f} 行/秒")
+    logging.info(f"数据库现有 {db.get_total_count()} 个成语")
+    db.close()
+
+
+if __name__ == '__main__':
+    main()